@@ -2,18 +2,23 @@ from __future__ import annotations
 
 import json
 import logging
+import re
+from collections.abc import Mapping
 from dataclasses import dataclass
+from functools import cached_property
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
-from bs4 import BeautifulSoup
-from bs4 import Tag
-
 from discord_rss_bot.extensions import run_extensions
-from discord_rss_bot.html_format import format_entry_html_for_discord
+from discord_rss_bot.html_format import ParsedHtml
 from discord_rss_bot.is_url_valid import is_url_valid
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
     from collections.abc import Sequence
+    from datetime import datetime
 
     from reader import Content
     from reader import Entry
@@ -27,6 +32,24 @@ DISCORD_WEBHOOK_USERNAME_MAX_LENGTH: int = 80
 DISCORD_WEBHOOK_USERNAME_FORBIDDEN_CHARS: frozenset[str] = frozenset("@#:`")
 DISCORD_WEBHOOK_USERNAME_FORBIDDEN_SUBSTRINGS: tuple[str, ...] = ("clyde", "discord")
 
+# A ``{{tag}}`` in a custom message or embed; the capturing group keeps the tags when the template is split.
+TEMPLATE_TAG_PATTERN: re.Pattern[str] = re.compile(r"(\{\{[^{}]+\}\})")
+
+# Embed fields that may contain tags.
+EMBED_TEMPLATE_FIELDS: tuple[str, ...] = (
+    "title",
+    "description",
+    "author_name",
+    "author_url",
+    "author_icon_url",
+    "image_url",
+    "thumbnail_url",
+    "footer_text",
+    "footer_icon_url",
+    "avatar_url",
+    "username",
+)
+
 
 @dataclass(slots=True)
 class CustomEmbed:
@@ -45,104 +68,194 @@ class CustomEmbed:
     username: str = ""
 
 
-def try_to_replace(custom_message: str, template: str, replace_with: str) -> str:
-    """Try to replace a tag in custom_message.
+@dataclass(frozen=True, slots=True)
+class CompiledTemplate:
+    """A custom message or embed field split into its literal text and the tags between it.
 
-    Args:
-        custom_message: The custom_message to replace tags in.
-        template: The tag to replace.
-        replace_with: What to replace the tag with.
+    ``literals`` has one more item than ``tags``: the text before the first tag, between each pair of tags and
+    after the last one.
+    """
+
+    literals: tuple[str, ...]
+    tags: tuple[str, ...]
+
+    def render(self, values: Mapping[str, object]) -> str:
+        """Fill in the tags in one pass over the template.
+
+        Args:
+            values: Text per tag, e.g. ``{"{{entry_title}}": "Title"}``. Tags without a value are kept as they are.
+
+        Returns:
+            The filled in template.
+        """
+        if not self.tags:
+            return self.literals[0]
+
+        parts: list[str] = [self.literals[0]]
+        for tag, literal in zip(self.tags, self.literals[1:], strict=True):
+            value: object = values.get(tag, tag)
+            if not isinstance(value, str):
+                logger.error("replace_with is not a string: %s, it is a %s", value, type(value))
+                value = tag
+            parts.extend((value, literal))
+        return "".join(parts)
+
+
+@lru_cache(maxsize=4096)
+def compile_template(template: str) -> CompiledTemplate:
+    """Split a template into literal text and tags, once per distinct template.
+
+    The cache is keyed by the template text, so a feed's compiled templates are reused until its
+    ``custom_message`` or ``embed`` tag changes.
 
     Returns:
-        Returns the custom_message with the tag replaced.
+        CompiledTemplate: The compiled template.
     """
-    try:
-        return custom_message.replace(template, replace_with)
-    except (TypeError, AttributeError, ValueError):
-        logger.exception("Failed to replace %s with %s in %s", template, replace_with, custom_message)
-        return custom_message
+    parts: list[str] = TEMPLATE_TAG_PATTERN.split(template)
+    return CompiledTemplate(literals=tuple(parts[0::2]), tags=tuple(parts[1::2]))
+
 
+def _format_time(value: datetime | None) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S") if value else "Never"
 
-def replace_tags_in_text_message(entry: Entry, reader: Reader) -> str:
+
+class TemplateValues(Mapping[str, object]):
+    """The values of an entry's template tags, each computed the first time a template uses it.
+
+    Formatting the summary and content, finding the first image and running extensions are the slow parts of
+    filling in a template, and most templates only use a few tags, like the default message of
+    ``{{entry_title}}`` and ``{{entry_link}}``.
+    """
+
+    def __init__(
+        self,
+        feed: Feed,
+        entry: Entry,
+        reader: Reader,
+        *,
+        tags: Iterable[str] | None = None,
+        parsed_entry: ParsedEntry | None = None,
+    ) -> None:
+        """Prepare the values of an entry's tags without computing any of them.
+
+        Args:
+            feed: The feed to get the tags from.
+            entry: The entry to get the tags from.
+            reader: Custom Reader instance.
+            tags: Every tag the templates use. Only extensions that provide one of them are run; all enabled
+                extensions are run if this is None.
+            parsed_entry: The entry's parsed HTML, to share with the rest of the render.
+        """
+        self.feed: Feed = feed
+        self.entry: Entry = entry
+        self.reader: Reader = reader
+        self.parsed_entry: ParsedEntry = parsed_entry or ParsedEntry.from_entry(entry)
+        self._tags: frozenset[str] | None = None if tags is None else frozenset(tags)
+        self._values: dict[str, object] = {}
+        self._extension_values: dict[str, str] | None = None
+
+    def __getitem__(self, tag: str) -> object:
+        if tag not in self._values:
+            get_value: Callable[[TemplateValues], object] | None = _TAG_VALUE_GETTERS.get(tag)
+            if get_value is not None:
+                self._values[tag] = get_value(self)
+            else:
+                # Built-in tags take precedence over extension variables with the same name.
+                self._values[tag] = self.extension_values[tag[2:-2]]
+        return self._values[tag]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _TAG_VALUE_GETTERS
+        yield from (f"{{{{{name}}}}}" for name in self.extension_values if f"{{{{{name}}}}}" not in _TAG_VALUE_GETTERS)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    @property
+    def extension_values(self) -> dict[str, str]:
+        """Variables of the enabled extensions that provide a tag the templates use, computed once."""
+        if self._extension_values is None:
+            variables: list[str] | None = None
+            if self._tags is not None:
+                variables = [tag[2:-2] for tag in self._tags if tag not in _TAG_VALUE_GETTERS]
+            self._extension_values = (
+                run_extensions(self.entry, self.reader, variables=variables) if variables != [] else {}
+            )
+        return self._extension_values
+
+    @cached_property
+    def formatted_summary(self) -> str:
+        """The entry's summary as Discord markdown."""
+        return self.parsed_entry.html(self.parsed_entry.summary).markdown
+
+    @cached_property
+    def formatted_content(self) -> str:
+        """The entry's content as Discord markdown."""
+        return self.parsed_entry.html(self.parsed_entry.content).markdown
+
+    @cached_property
+    def first_image(self) -> str:
+        """The first image in the entry's content or summary."""
+        return self.parsed_entry.first_image
+
+
+_TAG_VALUE_GETTERS: dict[str, Callable[[TemplateValues], object]] = {
+    "{{feed_author}}": lambda values: values.feed.authors_str or "",
+    "{{feed_added}}": lambda values: _format_time(values.feed.added),
+    "{{feed_last_exception}}": lambda values: (
+        values.feed.last_exception.value_str if values.feed.last_exception else ""
+    ),
+    "{{feed_last_updated}}": lambda values: _format_time(values.feed.last_updated),
+    "{{feed_link}}": lambda values: values.feed.link or "",
+    "{{feed_subtitle}}": lambda values: values.feed.subtitle or "",
+    "{{feed_title}}": lambda values: values.feed.title or "",
+    "{{feed_updated}}": lambda values: _format_time(values.feed.updated),
+    "{{feed_updates_enabled}}": lambda values: "True" if values.feed.updates_enabled else "False",
+    "{{feed_url}}": lambda values: values.feed.url or "",
+    "{{feed_user_title}}": lambda values: values.feed.user_title or "",
+    "{{feed_version}}": lambda values: values.feed.version or "",
+    "{{entry_added}}": lambda values: _format_time(values.entry.added),
+    "{{entry_author}}": lambda values: values.entry.authors_str or "",
+    "{{entry_content}}": lambda values: values.formatted_content,
+    "{{entry_content_raw}}": lambda values: values.entry.content[0].value if values.entry.content else "",
+    "{{entry_id}}": lambda values: values.entry.id or "",
+    "{{entry_important}}": lambda values: "True" if values.entry.important else "False",
+    "{{entry_link}}": lambda values: values.entry.link or "",
+    "{{entry_published}}": lambda values: _format_time(values.entry.published),
+    "{{entry_read}}": lambda values: "True" if values.entry.read else "False",
+    "{{entry_read_modified}}": lambda values: _format_time(values.entry.read_modified),
+    "{{entry_summary}}": lambda values: values.formatted_summary,
+    "{{entry_summary_raw}}": lambda values: values.entry.summary or "",
+    "{{entry_text}}": lambda values: values.formatted_summary or values.formatted_content,
+    "{{entry_title}}": lambda values: values.entry.title or "",
+    "{{entry_updated}}": lambda values: _format_time(values.entry.updated),
+    "{{image_1}}": lambda values: values.first_image,
+}
+
+
+def replace_tags_in_text_message(
+    entry: Entry,
+    reader: Reader,
+    message_template: str | None = None,
+    *,
+    parsed_entry: ParsedEntry | None = None,
+) -> str:
     """Replace tags in custom_message.
 
     Args:
         entry: The entry to get the tags from.
         reader: Custom Reader instance.
+        message_template: Text to replace the tags in instead of the feed's custom_message, e.g. a digest line.
+        parsed_entry: The entry's parsed HTML, if the caller parsed it already.
 
     Returns:
         Returns the custom_message with the tags replaced.
     """
     feed: Feed = entry.feed
-    custom_message: str = get_custom_message(feed=feed, reader=reader)
-
-    content = ""
-    if entry.content:
-        for content_item in entry.content:
-            content: str = content_item.value
-
-    summary: str = entry.summary or ""
-
-    first_image: str = get_first_image(summary, content)
-
-    summary = format_entry_html_for_discord(summary)
-    content = format_entry_html_for_discord(content)
-
-    feed_added: str = feed.added.strftime("%Y-%m-%d %H:%M:%S") if feed.added else "Never"
-    feed_last_exception: str = feed.last_exception.value_str if feed.last_exception else ""
-    feed_last_updated: str = feed.last_updated.strftime("%Y-%m-%d %H:%M:%S") if feed.last_updated else "Never"
-    feed_updated: str = feed.updated.strftime("%Y-%m-%d %H:%M:%S") if feed.updated else "Never"
-    entry_added: str = entry.added.strftime("%Y-%m-%d %H:%M:%S") if entry.added else "Never"
-    entry_published: str = entry.published.strftime("%Y-%m-%d %H:%M:%S") if entry.published else "Never"
-    entry_read_modified: str = entry.read_modified.strftime("%Y-%m-%d %H:%M:%S") if entry.read_modified else "Never"
-    entry_updated: str = entry.updated.strftime("%Y-%m-%d %H:%M:%S") if entry.updated else "Never"
-
-    list_of_replacements: list[dict[str, str]] = [
-        {"{{feed_author}}": feed.authors_str or ""},
-        {"{{feed_added}}": feed_added},
-        {"{{feed_last_exception}}": feed_last_exception},
-        {"{{feed_last_updated}}": feed_last_updated},
-        {"{{feed_link}}": feed.link or ""},
-        {"{{feed_subtitle}}": feed.subtitle or ""},
-        {"{{feed_title}}": feed.title or ""},
-        {"{{feed_updated}}": feed_updated},
-        {"{{feed_updates_enabled}}": str(feed.updates_enabled) or ""},
-        {"{{feed_url}}": feed.url or ""},
-        {"{{feed_user_title}}": feed.user_title or ""},
-        {"{{feed_version}}": feed.version or ""},
-        {"{{entry_added}}": entry_added},
-        {"{{entry_author}}": entry.authors_str or ""},
-        {"{{entry_content}}": content},
-        {"{{entry_content_raw}}": entry.content[0].value if entry.content else ""},
-        {"{{entry_id}}": entry.id or ""},
-        {"{{entry_important}}": str(entry.important) or ""},
-        {"{{entry_link}}": entry.link or ""},
-        {"{{entry_published}}": entry_published},
-        {"{{entry_read}}": str(entry.read) or ""},
-        {"{{entry_read_modified}}": entry_read_modified},
-        {"{{entry_summary}}": summary},
-        {"{{entry_summary_raw}}": entry.summary or ""},
-        {"{{entry_text}}": summary or content},
-        {"{{entry_title}}": entry.title or ""},
-        {"{{entry_updated}}": entry_updated},
-        {"{{image_1}}": first_image},
-    ]
-
-    # Compute extension variables (handled separately so they can use
-    # the already-computed values above without ordering issues).
-    extension_vars: dict[str, str] = run_extensions(entry, reader)
-    for var_name, var_value in extension_vars.items():
-        list_of_replacements.append({f"{{{{{var_name}}}}}": var_value})
-
-    for replacement in list_of_replacements:
-        for template, replace_with in replacement.items():
-            if not isinstance(replace_with, str):
-                logger.error("replace_with is not a string: %s, it is a %s", replace_with, type(replace_with))
-                continue
-
-            custom_message = try_to_replace(custom_message, template, replace_with)
-
-    return custom_message.replace("\\n", "\n")
+    custom_message: str = get_custom_message(feed=feed, reader=reader) if message_template is None else message_template
+    template: CompiledTemplate = compile_template(custom_message)
+    values: TemplateValues = TemplateValues(feed, entry, reader, tags=template.tags, parsed_entry=parsed_entry)
+    return template.render(values).replace("\\n", "\n")
 
 
 def _extract_entry_text(data: str | list | tuple | Sequence[Content] | None) -> str | None:
@@ -168,6 +281,81 @@ def _extract_entry_text(data: str | list | tuple | Sequence[Content] | None) ->
     return str(data)
 
 
+class ParsedEntry:
+    """An entry's summary and content HTML, each distinct piece parsed at most once.
+
+    One render fills in the summary and content tags, finds the first image and collects the media gallery
+    images; sharing one of these between them parses the entry's HTML once instead of once per use.
+    """
+
+    def __init__(self, summary: str | None, content: str | Sequence[Content] | None) -> None:
+        """Prepare the entry's HTML without parsing any of it.
+
+        Args:
+            summary: The summary from the entry (string, or tuple/list of objects)
+            content: The content from the entry (string, or tuple/list of objects)
+        """
+        self.summary: str = _extract_entry_text(summary) or ""
+        self.content: str = _extract_entry_text(content) or ""
+        self._parsed: dict[str, ParsedHtml] = {}
+
+    @classmethod
+    def from_entry(cls, entry: Entry) -> ParsedEntry:
+        """Return the parsed HTML of *entry*'s summary and last content item.
+
+        Every render of an entry (text, embed, media gallery and the entry cards) reads its content from here,
+        so they all agree on which content item the tags and images come from.
+        """
+        return cls(entry.summary, entry.content[-1].value if entry.content else "")
+
+    def html(self, text: str) -> ParsedHtml:
+        """Return *text* parsed, reusing the tree when the same HTML was parsed before, e.g. a summary equal to the content."""  # ruff:ignore[line-too-long]
+        parsed: ParsedHtml | None = self._parsed.get(text)
+        if parsed is None:
+            parsed = self._parsed[text] = ParsedHtml(text)
+        return parsed
+
+    def image_urls(self, *, limit: int | None = None) -> list[str]:
+        """Get valid image URLs from content, then summary.
+
+        Args:
+            limit: Optional maximum number of URLs to return.
+
+        Returns:
+            Valid, de-duplicated image URLs.
+        """
+        image_urls: list[str] = []
+        seen_urls: set[str] = set()
+
+        for text in (self.content, self.summary):
+            if not text:
+                continue
+            for src in self.html(text).iter_image_sources():
+                if src is None:
+                    logger.debug("Skipping image without a src attribute.")
+                    continue
+
+                if not is_url_valid(src):
+                    logger.warning("Invalid URL: %s", src)
+                    continue
+
+                if src in seen_urls:
+                    continue
+
+                image_urls.append(src)
+                seen_urls.add(src)
+                if limit is not None and len(image_urls) >= limit:
+                    return image_urls
+
+        return image_urls
+
+    @property
+    def first_image(self) -> str:
+        """The first valid image URL in the content or summary, or an empty string."""
+        image_urls: list[str] = self.image_urls(limit=1)
+        return image_urls[0] if image_urls else ""
+
+
 def get_image_urls(
     summary: str | None,
     content: str | Sequence[Content] | None,
@@ -184,36 +372,7 @@ def get_image_urls(
     Returns:
         Valid, de-duplicated image URLs.
     """
-    image_urls: list[str] = []
-    seen_urls: set[str] = set()
-
-    def add_images_from_text(text: str | None) -> None:
-        if not text:
-            return
-        images = BeautifulSoup(text, features="lxml").find_all("img")
-        for image in images:
-            if not isinstance(image, Tag) or "src" not in image.attrs:
-                logger.error("Image is not a Tag or does not have a src attribute.")
-                continue
-
-            src = str(image.attrs["src"])
-            if not is_url_valid(src):
-                logger.warning("Invalid URL: %s", src)
-                continue
-
-            if src in seen_urls:
-                continue
-
-            image_urls.append(src)
-            seen_urls.add(src)
-            if limit is not None and len(image_urls) >= limit:
-                return
-
-    add_images_from_text(_extract_entry_text(content))
-    if limit is None or len(image_urls) < limit:
-        add_images_from_text(_extract_entry_text(summary))
-
-    return image_urls
+    return ParsedEntry(summary, content).image_urls(limit=limit)
 
 
 def get_first_image(summary: str | None, content: str | Sequence[Content] | None) -> str:
@@ -222,89 +381,47 @@ def get_first_image(summary: str | None, content: str | Sequence[Content] | None
     Returns:
         First valid image URL, or an empty string.
     """
-    image_urls: list[str] = get_image_urls(summary, content, limit=1)
-    return image_urls[0] if image_urls else ""
+    return ParsedEntry(summary, content).first_image
 
 
-def replace_tags_in_embed(feed: Feed, entry: Entry, reader: Reader) -> CustomEmbed:
+def replace_tags_in_embed(
+    feed: Feed,
+    entry: Entry,
+    reader: Reader,
+    *,
+    parsed_entry: ParsedEntry | None = None,
+) -> CustomEmbed:
     """Replace tags in embed.
 
     Args:
         feed: The feed to get the tags from.
         entry: The entry to get the tags from.
         reader: Custom Reader instance.
+        parsed_entry: The entry's parsed HTML, shared with the media gallery when the caller passes it.
 
     Returns:
         Returns the embed with the tags replaced.
     """
     embed: CustomEmbed = get_embed(feed=feed, reader=reader)
 
-    content = ""
-    if entry.content:
-        for content_item in entry.content:
-            content: str = content_item.value
-
-    summary: str = entry.summary or ""
-
-    first_image: str = get_first_image(summary, content)
-
-    summary = format_entry_html_for_discord(summary)
-    content = format_entry_html_for_discord(content)
-
-    feed_added: str = feed.added.strftime("%Y-%m-%d %H:%M:%S") if feed.added else "Never"
-    feed_last_exception: str = feed.last_exception.value_str if feed.last_exception else ""
-    feed_last_updated: str = feed.last_updated.strftime("%Y-%m-%d %H:%M:%S") if feed.last_updated else "Never"
-    feed_updated: str = feed.updated.strftime("%Y-%m-%d %H:%M:%S") if feed.updated else "Never"
-    entry_added: str = entry.added.strftime("%Y-%m-%d %H:%M:%S") if entry.added else "Never"
-    entry_published: str = entry.published.strftime("%Y-%m-%d %H:%M:%S") if entry.published else "Never"
-    entry_read_modified: str = entry.read_modified.strftime("%Y-%m-%d %H:%M:%S") if entry.read_modified else "Never"
-    entry_updated: str = entry.updated.strftime("%Y-%m-%d %H:%M:%S") if entry.updated else "Never"
-
     if embed.title and not embed.author_name and embed.author_url:
         msg = "You are using author_url without author_name, but has title set. We will use author_name instead of title when sending the embed to Discord."  # ruff:ignore[line-too-long]
         logger.info(msg)
         embed.author_name = embed.title
         embed.title = ""
 
-    list_of_replacements: list[dict[str, str]] = [
-        {"{{feed_author}}": feed.authors_str or ""},
-        {"{{feed_added}}": feed_added or ""},
-        {"{{feed_last_exception}}": feed_last_exception},
-        {"{{feed_last_updated}}": feed_last_updated or ""},
-        {"{{feed_link}}": feed.link or ""},
-        {"{{feed_subtitle}}": feed.subtitle or ""},
-        {"{{feed_title}}": feed.title or ""},
-        {"{{feed_updated}}": feed_updated or ""},
-        {"{{feed_updates_enabled}}": "True" if feed.updates_enabled else "False"},
-        {"{{feed_url}}": feed.url or ""},
-        {"{{feed_user_title}}": feed.user_title or ""},
-        {"{{feed_version}}": feed.version or ""},
-        {"{{entry_added}}": entry_added or ""},
-        {"{{entry_author}}": entry.authors_str or ""},
-        {"{{entry_content}}": content or ""},
-        {"{{entry_content_raw}}": entry.content[0].value if entry.content else ""},
-        {"{{entry_id}}": entry.id},
-        {"{{entry_important}}": "True" if entry.important else "False"},
-        {"{{entry_link}}": entry.link or ""},
-        {"{{entry_published}}": entry_published},
-        {"{{entry_read}}": "True" if entry.read else "False"},
-        {"{{entry_read_modified}}": entry_read_modified or ""},
-        {"{{entry_summary}}": summary or ""},
-        {"{{entry_summary_raw}}": entry.summary or ""},
-        {"{{entry_text}}": summary or content or ""},
-        {"{{entry_title}}": entry.title or ""},
-        {"{{entry_updated}}": entry_updated or ""},
-        {"{{image_1}}": first_image or ""},
-    ]
-    # Compute extension variables (handled separately so they can use
-    # the already-computed values above without ordering issues).
-    extension_vars: dict[str, str] = run_extensions(entry, reader)
-    for var_name, var_value in extension_vars.items():
-        list_of_replacements.append({f"{{{{{var_name}}}}}": var_value})
-
-    for replacement in list_of_replacements:
-        for template, replace_with in replacement.items():
-            _replace_embed_tags(embed, template, replace_with)
+    templates: dict[str, CompiledTemplate] = {
+        field: compile_template(getattr(embed, field)) for field in EMBED_TEMPLATE_FIELDS
+    }
+    values: TemplateValues = TemplateValues(
+        feed,
+        entry,
+        reader,
+        tags=[tag for template in templates.values() for tag in template.tags],
+        parsed_entry=parsed_entry,
+    )
+    for field, template in templates.items():
+        setattr(embed, field, template.render(values))
 
     embed.title = embed.title.replace("\\n", "\n")
     embed.description = embed.description.replace("\\n", "\n")
@@ -318,27 +435,6 @@ def replace_tags_in_embed(feed: Feed, entry: Entry, reader: Reader) -> CustomEmb
     return embed
 
 
-def _replace_embed_tags(embed: CustomEmbed, template: str, replace_with: str) -> None:
-    """Replace tags in embed.
-
-    Args:
-        embed: The embed to replace tags in.
-        template: The tag to replace.
-        replace_with: What to replace the tag with.
-    """
-    embed.title = try_to_replace(embed.title, template, replace_with)
-    embed.description = try_to_replace(embed.description, template, replace_with)
-    embed.author_name = try_to_replace(embed.author_name, template, replace_with)
-    embed.author_url = try_to_replace(embed.author_url, template, replace_with)
-    embed.author_icon_url = try_to_replace(embed.author_icon_url, template, replace_with)
-    embed.image_url = try_to_replace(embed.image_url, template, replace_with)
-    embed.thumbnail_url = try_to_replace(embed.thumbnail_url, template, replace_with)
-    embed.footer_text = try_to_replace(embed.footer_text, template, replace_with)
-    embed.footer_icon_url = try_to_replace(embed.footer_icon_url, template, replace_with)
-    embed.avatar_url = try_to_replace(embed.avatar_url, template, replace_with)
-    embed.username = try_to_replace(embed.username, template, replace_with)
-
-
 def get_custom_message(reader: Reader, feed: Feed) -> str:
     """Get custom_message tag from feed.
 
@@ -0,0 +1,144 @@
+"""Concurrent delivery of entries to Discord, one ordered lane per webhook.
+
+``send_to_discord`` used to send unread entries one at a time, so a slow
+screenshot or a rate-limited webhook held up every other channel. Jobs are
+now grouped by webhook URL into lanes. Lanes are drained in parallel on a
+thread pool, while the jobs inside a lane are still sent one after another in
+the order they were queued, so messages in a channel keep their publish order.
+
+Configure the pool with this environment variable:
+
+- ``DISCORD_DELIVERY_WORKERS``: Webhooks sent to at the same time (default 4).
+  Set to ``1`` to deliver everything on the calling thread.
+- ``DISCORD_RENDER_WORKERS``: Webhooks whose new entries are rendered into the
+  outbox at the same time (default 4). Rendering screenshots is the slow part.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from discord_rss_bot.rate_limits import mask_webhook_url
+from discord_rss_bot.settings import env_int
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_DELIVERY_WORKERS: int = 4
+DEFAULT_RENDER_WORKERS: int = 4
+
+
+def get_delivery_workers() -> int:
+    """Return how many webhook lanes may be drained at the same time."""
+    return env_int("DISCORD_DELIVERY_WORKERS", DEFAULT_DELIVERY_WORKERS)
+
+
+def get_render_workers() -> int:
+    """Return how many webhook lanes may be rendered into the outbox at the same time."""
+    return env_int("DISCORD_RENDER_WORKERS", DEFAULT_RENDER_WORKERS)
+
+
+@dataclass(slots=True)
+class DeliveryStats:
+    """Summary of one delivery run."""
+
+    lanes: int = 0
+    workers: int = 0
+    delivered: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        """Jobs finished per second of wall-clock time."""
+        finished: int = self.delivered + self.failed
+        return finished / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def partition_by_key[T](jobs: Iterable[tuple[str, T]]) -> dict[str, list[T]]:
+    """Group jobs by key, keeping the original order inside each group.
+
+    Returns:
+        dict[str, list[T]]: Jobs per key, with keys in first-seen order.
+    """
+    lanes: dict[str, list[T]] = {}
+    for key, job in jobs:
+        lanes.setdefault(key, []).append(job)
+    return lanes
+
+
+def _drain_lane[T](key: str, jobs: list[T], deliver: Callable[[str, T], bool | None]) -> tuple[int, int]:
+    """Deliver one lane's jobs in order; a failed job does not stop the lane.
+
+    Returns:
+        tuple[int, int]: Number of delivered and failed jobs.
+    """
+    delivered: int = 0
+    failed: int = 0
+    for job in jobs:
+        try:
+            ok: bool | None = deliver(key, job)
+        except Exception:
+            logger.exception("Failed to deliver job to %s", mask_webhook_url(key))
+            ok = False
+
+        if ok is False:
+            failed += 1
+        else:
+            delivered += 1
+    return delivered, failed
+
+
+def deliver_concurrently[T](
+    jobs: Iterable[tuple[str, T]],
+    deliver: Callable[[str, T], bool | None],
+    *,
+    max_workers: int | None = None,
+) -> DeliveryStats:
+    """Deliver ``(webhook_url, job)`` pairs with one ordered lane per webhook URL.
+
+    Args:
+        jobs: Jobs keyed by the webhook URL they are sent to, in publish order.
+        deliver: Called with ``(webhook_url, job)`` once per job. Returning False or raising counts the job as
+            failed; exceptions are logged.
+        max_workers: Lanes drained at the same time. Defaults to ``DISCORD_DELIVERY_WORKERS``.
+
+    Returns:
+        DeliveryStats: Counts and timing for the run.
+    """
+    started: float = time.perf_counter()
+    lanes: dict[str, list[T]] = partition_by_key(jobs)
+    workers: int = max(1, min(max_workers or get_delivery_workers(), len(lanes)))
+    stats = DeliveryStats(lanes=len(lanes), workers=workers if lanes else 0)
+
+    if workers == 1:
+        results: list[tuple[int, int]] = [_drain_lane(key, lane, deliver) for key, lane in lanes.items()]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discord-delivery") as pool:
+            futures: list[concurrent.futures.Future[tuple[int, int]]] = [
+                pool.submit(_drain_lane, key, lane, deliver) for key, lane in lanes.items()
+            ]
+            results = [future.result() for future in futures]
+
+    for delivered, failed in results:
+        stats.delivered += delivered
+        stats.failed += failed
+    stats.elapsed = time.perf_counter() - started
+
+    if lanes:
+        logger.info(
+            "Delivered %d entries (%d failed) across %d webhooks with %d workers in %.2fs",
+            stats.delivered,
+            stats.failed,
+            stats.lanes,
+            stats.workers,
+            stats.elapsed,
+        )
+    return stats
@@ -0,0 +1,249 @@
+"""Digest delivery: buffer a feed's new entries and send them as one summary message.
+
+Feeds in ``digest`` delivery mode do not send a message per entry. Each accepted
+entry is rendered into one line with the feed's digest entry template and stored
+in the ``digest_entries`` table of the state database. Once the oldest buffered
+line has waited ``digest_interval`` minutes, or ``digest_max_entries`` lines are
+buffered, the lines are joined into the feed's digest message template and moved
+to the outbox in the same transaction, so a digest is neither lost nor sent twice.
+
+Per-feed tags:
+
+- ``digest_interval``: Minutes between digests (default 60).
+- ``digest_max_entries``: Send early once this many entries are buffered (default 20).
+- ``digest_entry_template``: One line per entry; supports the custom message placeholders.
+- ``digest_message``: The message; supports ``{{digest_count}}``, ``{{digest_entries}}``,
+  ``{{feed_title}}``, ``{{feed_url}}`` and ``{{feed_link}}``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from reader import ReaderError
+
+from discord_rss_bot.custom_message import CompiledTemplate
+from discord_rss_bot.custom_message import compile_template
+from discord_rss_bot.state_db import get_state_db
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from reader import Feed
+    from reader import Reader
+
+    from discord_rss_bot.outbox import Outbox
+    from discord_rss_bot.state_db import StateDatabase
+    from discord_rss_bot.webhook import JsonObject
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_DIGEST_INTERVAL_MINUTES: int = 60
+DEFAULT_DIGEST_MAX_ENTRIES: int = 20
+MAX_DIGEST_MAX_ENTRIES: int = 100
+DEFAULT_DIGEST_ENTRY_TEMPLATE: str = "- [{{entry_title}}](<{{entry_link}}>)"
+DEFAULT_DIGEST_MESSAGE_TEMPLATE: str = "**{{feed_title}}**: {{digest_count}} new entries\\n{{digest_entries}}"
+
+
+@dataclass(frozen=True, slots=True)
+class DigestSettings:
+    """How often and in what shape a feed's digest is sent."""
+
+    interval_minutes: int = DEFAULT_DIGEST_INTERVAL_MINUTES
+    max_entries: int = DEFAULT_DIGEST_MAX_ENTRIES
+    entry_template: str = DEFAULT_DIGEST_ENTRY_TEMPLATE
+    message_template: str = DEFAULT_DIGEST_MESSAGE_TEMPLATE
+
+
+def _get_int_tag(reader: Reader, feed: Feed | str, key: str, default: int, maximum: int) -> int:
+    try:
+        value = reader.get_tag(feed, key, default)
+    except ReaderError:
+        logger.exception("Error getting %s tag for feed: %s", key, getattr(feed, "url", feed))
+        return default
+
+    if isinstance(value, bool) or not isinstance(value, int | str):
+        return default
+    try:
+        parsed_value: int = int(value)
+    except ValueError:
+        return default
+    return min(max(parsed_value, 1), maximum)
+
+
+def _get_str_tag(reader: Reader, feed: Feed | str, key: str, default: str) -> str:
+    try:
+        value = reader.get_tag(feed, key, default)
+    except ReaderError:
+        logger.exception("Error getting %s tag for feed: %s", key, getattr(feed, "url", feed))
+        return default
+    return value if isinstance(value, str) and value.strip() else default
+
+
+def get_digest_settings(reader: Reader, feed: Feed | str) -> DigestSettings:
+    """Read a feed's digest settings from its tags, falling back to the defaults.
+
+    Returns:
+        DigestSettings: The feed's digest settings.
+    """
+    return DigestSettings(
+        interval_minutes=_get_int_tag(reader, feed, "digest_interval", DEFAULT_DIGEST_INTERVAL_MINUTES, 7 * 24 * 60),
+        max_entries=_get_int_tag(
+            reader, feed, "digest_max_entries", DEFAULT_DIGEST_MAX_ENTRIES, MAX_DIGEST_MAX_ENTRIES
+        ),
+        entry_template=_get_str_tag(reader, feed, "digest_entry_template", DEFAULT_DIGEST_ENTRY_TEMPLATE),
+        message_template=_get_str_tag(reader, feed, "digest_message", DEFAULT_DIGEST_MESSAGE_TEMPLATE),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class DigestEntry:
+    """One rendered line waiting in a feed's digest."""
+
+    id: int
+    feed_url: str
+    entry_id: str
+    webhook_url: str
+    line: str
+    added_at: float
+
+
+def is_digest_due(entries: list[DigestEntry], settings: DigestSettings, *, now: float) -> bool:
+    """Return whether a feed's buffered entries should be sent now."""
+    if not entries:
+        return False
+    if len(entries) >= settings.max_entries:
+        return True
+    return now - entries[0].added_at >= settings.interval_minutes * 60
+
+
+def render_digest_message(
+    settings: DigestSettings,
+    lines: list[str],
+    *,
+    feed_title: str,
+    feed_url: str,
+    feed_link: str,
+    max_length: int,
+) -> str:
+    """Fill the digest message template, leaving out the last lines if the message would be too long.
+
+    Lines that do not fit are summarized as "...and N more" instead of cutting a line in half.
+
+    Returns:
+        str: The digest message, at most *max_length* characters.
+    """
+    message: str = ""
+    compiled_template: CompiledTemplate = compile_template(settings.message_template)
+    for shown in range(len(lines), -1, -1):
+        entries_text: str = "\n".join(lines[:shown])
+        if shown < len(lines):
+            entries_text = f"{entries_text}\n...and {len(lines) - shown} more".lstrip("\n")
+
+        message = compiled_template.render({
+            "{{digest_count}}": str(len(lines)),
+            "{{feed_title}}": feed_title,
+            "{{feed_url}}": feed_url,
+            "{{feed_link}}": feed_link,
+            "{{digest_entries}}": entries_text,
+        })
+        message = message.replace("\\n", "\n")
+        if len(message) <= max_length:
+            return message
+    return message[:max_length]
+
+
+class DigestBuffer:
+    """Entries waiting to be sent in a digest, backed by the ``digest_entries`` table."""
+
+    def __init__(self, db: StateDatabase) -> None:  # ruff:ignore[undocumented-public-init]
+        self.db: StateDatabase = db
+
+    def add(self, *, feed_url: str, entry_id: str, webhook_url: str, line: str, now: float | None = None) -> bool:
+        """Buffer an entry's digest line. An entry is buffered at most once per webhook.
+
+        Returns:
+            bool: False if the entry was already buffered.
+        """
+        with self.db.transaction() as connection:
+            cursor: sqlite3.Cursor = connection.execute(
+                "INSERT OR IGNORE INTO digest_entries (feed_url, entry_id, webhook_url, line, added_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (feed_url, entry_id, webhook_url, line, time.time() if now is None else now),
+            )
+        return bool(cursor.rowcount)
+
+    def get_pending(self) -> dict[tuple[str, str], list[DigestEntry]]:
+        """Return buffered entries grouped by ``(feed_url, webhook_url)``, oldest first.
+
+        Returns:
+            dict[tuple[str, str], list[DigestEntry]]: One list per digest.
+        """
+        pending: dict[tuple[str, str], list[DigestEntry]] = {}
+        for row in self.db.query("SELECT * FROM digest_entries ORDER BY id"):
+            entry = DigestEntry(
+                id=row["id"],
+                feed_url=row["feed_url"],
+                entry_id=row["entry_id"],
+                webhook_url=row["webhook_url"],
+                line=row["line"],
+                added_at=row["added_at"],
+            )
+            pending.setdefault((entry.feed_url, entry.webhook_url), []).append(entry)
+        return pending
+
+    def count(self, feed_url: str | None = None) -> int:
+        """Return how many entries are buffered, optionally for one feed."""
+        if feed_url is None:
+            return int(self.db.query("SELECT COUNT(*) FROM digest_entries")[0][0])
+        return int(self.db.query("SELECT COUNT(*) FROM digest_entries WHERE feed_url = ?", (feed_url,))[0][0])
+
+    def flush(
+        self,
+        entries: list[DigestEntry],
+        outbox: Outbox,
+        *,
+        request_payload: JsonObject,
+        message_payload: JsonObject,
+        thread_id: str | None = None,
+    ) -> int | None:
+        """Move buffered entries to the outbox as one digest message, in a single transaction.
+
+        Returns:
+            int | None: The outbox message id, or None if the digest was already queued.
+        """
+        first, last = entries[0], entries[-1]
+        with self.db.transaction() as connection:
+            message_id: int | None = outbox.insert(
+                connection,
+                feed_url=first.feed_url,
+                entry_id=f"digest:{first.id}-{last.id}",
+                webhook_url=first.webhook_url,
+                delivery_mode="digest",
+                request_payload=request_payload,
+                message_payload=message_payload,
+                thread_id=thread_id,
+            )
+            connection.executemany("DELETE FROM digest_entries WHERE id = ?", [(entry.id,) for entry in entries])
+        return message_id
+
+    def discard(self, feed_url: str) -> int:
+        """Drop every buffered entry of a feed, e.g. after the feed was removed.
+
+        Returns:
+            int: Number of dropped entries.
+        """
+        with self.db.transaction() as connection:
+            return connection.execute("DELETE FROM digest_entries WHERE feed_url = ?", (feed_url,)).rowcount
+
+
+def get_digest_buffer() -> DigestBuffer:
+    """Get the digest buffer stored in the shared state database.
+
+    Returns:
+        DigestBuffer: The digest buffer.
+    """
+    return DigestBuffer(get_state_db())
@@ -0,0 +1,198 @@
+"""Cache of the slow parts of the entry cards on the feed and webhook entries pages.
+
+Rendering a card fills in the feed's custom message (running extensions, which
+may fetch from the network), finds the entry's first image and evaluates the
+saved blacklist and whitelist. None of that changes until the entry or the
+feed's tags do, so the result is cached under the entry's identity and update
+times plus a template version and a filter version of its feed. When the
+feed's custom message uses a tag like ``{{entry_read}}`` or
+``{{feed_last_updated}}``, whose value changes without either, the key also
+holds the state that tag reads.
+
+The versions are hashes of the feed's tags, read with one query per feed and
+page. Saving a feed's message, embed, extensions or filters therefore only
+re-renders that feed's cards, and no tag write has to remember to invalidate
+the cache. Tune its size with ``ENTRY_CARD_CACHE_SIZE`` (default 1024 cards).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from discord_rss_bot.custom_message import ParsedEntry
+from discord_rss_bot.custom_message import compile_template
+from discord_rss_bot.custom_message import replace_tags_in_text_message
+from discord_rss_bot.filter.evaluator import EntryFilterDecision
+from discord_rss_bot.filter.evaluator import FilterValues
+from discord_rss_bot.filter.evaluator import coerce_filter_values
+from discord_rss_bot.filter.evaluator import evaluate_entry_filters
+from discord_rss_bot.payloads import hash_payload
+from discord_rss_bot.settings import env_int
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from reader import Entry
+    from reader import Feed
+    from reader import Reader
+
+DEFAULT_ENTRY_CARD_CACHE_SIZE: int = 1024
+
+# Feed tags that hold blacklist and whitelist rules; every other tag may change how a card is rendered.
+FILTER_TAG_PREFIXES: tuple[str, ...] = ("blacklist_", "whitelist_", "regex_blacklist_", "regex_whitelist_")
+
+# Template tags whose values change without the entry being updated or the feed's tags being saved.
+STATE_TAG_VALUES: dict[str, Callable[[Entry], object]] = {
+    "{{entry_important}}": lambda entry: entry.important,
+    "{{entry_read}}": lambda entry: entry.read,
+    "{{entry_read_modified}}": lambda entry: entry.read_modified,
+    "{{feed_last_exception}}": lambda entry: entry.feed.last_exception,
+    "{{feed_last_updated}}": lambda entry: entry.feed.last_updated,
+    "{{feed_updates_enabled}}": lambda entry: entry.feed.updates_enabled,
+}
+
+EntryCardKey = tuple[str, str, "datetime | None", "datetime | None", str, str, tuple[object, ...]]
+
+
+@dataclass(frozen=True, slots=True)
+class EntryCard:
+    """The slow parts of an entry's card: its rendered custom message, first image and saved filter matches."""
+
+    text: str
+    first_image: str
+    is_blacklisted: bool
+    is_whitelisted: bool
+
+
+@dataclass(frozen=True, slots=True)
+class FeedTagVersions:
+    """Hashes of the feed tags an entry card depends on, its saved filter rules and the state tags it uses."""
+
+    template_version: str
+    filter_version: str
+    blacklist_values: FilterValues
+    whitelist_values: FilterValues
+    state_tags: tuple[str, ...] = ()
+
+    @classmethod
+    def from_reader(cls, reader: Reader, feed: Feed) -> FeedTagVersions:
+        """Read every tag of *feed* once and hash the template and filter tags separately.
+
+        Tags starting with a dot belong to ``reader`` and its plugins and are left out.
+
+        Returns:
+            FeedTagVersions: The feed's versions and filter rules.
+        """
+        tags: dict[str, object] = {key: value for key, value in reader.get_tags(feed) if not key.startswith(".")}
+        filter_tags: dict[str, object] = {
+            key: value for key, value in tags.items() if key.startswith(FILTER_TAG_PREFIXES)
+        }
+        template_tags: dict[str, object] = {key: value for key, value in tags.items() if key not in filter_tags}
+        values: dict[str, str] = {key: str(value) for key, value in filter_tags.items()}
+        custom_message: str = str(tags.get("custom_message", ""))
+        return cls(
+            template_version=hash_payload(template_tags),
+            filter_version=hash_payload(filter_tags),
+            blacklist_values=coerce_filter_values("blacklist", values),
+            whitelist_values=coerce_filter_values("whitelist", values),
+            state_tags=tuple(sorted(STATE_TAG_VALUES.keys() & set(compile_template(custom_message).tags))),
+        )
+
+
+class EntryCardCache:
+    """Bounded LRU cache of rendered entry cards, shared between requests."""
+
+    def __init__(self, max_size: int = DEFAULT_ENTRY_CARD_CACHE_SIZE) -> None:  # ruff:ignore[undocumented-public-init]
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._cards: OrderedDict[EntryCardKey, EntryCard] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get_or_render(self, key: EntryCardKey, render: Callable[[], EntryCard]) -> EntryCard:
+        """Return the cached card for *key*, rendering it with *render* on a miss.
+
+        Returns:
+            EntryCard: The card.
+        """
+        with self._lock:
+            card: EntryCard | None = self._cards.get(key)
+            if card is not None:
+                self._cards.move_to_end(key)
+                self.hits += 1
+                return card
+            self.misses += 1
+
+        card = render()
+        with self._lock:
+            self._cards[key] = card
+            self._cards.move_to_end(key)
+            while len(self._cards) > self.max_size:
+                self._cards.popitem(last=False)
+        return card
+
+    def clear(self) -> None:
+        """Forget every card and reset the counters."""
+        with self._lock:
+            self._cards.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+@lru_cache(maxsize=1)
+def get_entry_card_cache() -> EntryCardCache:
+    """Get the entry card cache shared by every page.
+
+    Returns:
+        EntryCardCache: The cache, sized by ``ENTRY_CARD_CACHE_SIZE``.
+    """
+    return EntryCardCache(env_int("ENTRY_CARD_CACHE_SIZE", DEFAULT_ENTRY_CARD_CACHE_SIZE))
+
+
+def get_entry_card(entry: Entry, reader: Reader, versions: FeedTagVersions) -> EntryCard:
+    """Get the card of *entry*, rendering it only if the entry or its feed's tags changed since it was cached.
+
+    Args:
+        entry: The entry to render.
+        reader: The Reader instance to use.
+        versions: The versions of the entry's feed, from ``FeedTagVersions.from_reader``.
+
+    Returns:
+        EntryCard: The rendered card.
+    """
+    key: EntryCardKey = (
+        entry.feed.url,
+        entry.id,
+        entry.updated,
+        entry.last_updated,
+        versions.template_version,
+        versions.filter_version,
+        tuple(STATE_TAG_VALUES[tag](entry) for tag in versions.state_tags),
+    )
+    return get_entry_card_cache().get_or_render(key, lambda: render_entry_card(entry, reader, versions))
+
+
+def render_entry_card(entry: Entry, reader: Reader, versions: FeedTagVersions) -> EntryCard:
+    """Render the slow parts of an entry's card.
+
+    Returns:
+        EntryCard: The rendered card.
+    """
+    # The message and the first image share one parse of the entry's HTML.
+    parsed_entry: ParsedEntry = ParsedEntry.from_entry(entry)
+    decision: EntryFilterDecision = evaluate_entry_filters(
+        entry,
+        blacklist_values=versions.blacklist_values,
+        whitelist_values=versions.whitelist_values,
+    )
+    return EntryCard(
+        text=replace_tags_in_text_message(entry, reader=reader, parsed_entry=parsed_entry),
+        first_image=parsed_entry.first_image,
+        is_blacklisted=decision.blacklist_match is not None,
+        is_whitelisted=decision.whitelist_match is not None,
+    )
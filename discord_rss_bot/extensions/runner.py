@@ -17,6 +17,8 @@ from discord_rss_bot.extensions.storage import get_enabled_extensions_for_feed
 from discord_rss_bot.extensions.storage import set_enabled_extensions_for_feed
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
     from reader import Entry
     from reader import Reader
 
@@ -159,7 +161,7 @@ def _process_extension_instance(
     return True
 
 
-def run_extensions(entry: Entry, reader: Reader) -> dict[str, str]:
+def run_extensions(entry: Entry, reader: Reader, *, variables: Collection[str] | None = None) -> dict[str, str]:
     """Run all enabled extensions for the given entry.
 
     For every enabled extension, all of its ``provides_variables`` are
@@ -174,6 +176,9 @@ def run_extensions(entry: Entry, reader: Reader) -> dict[str, str]:
     Args:
         entry: The feed entry to process.
         reader: The reader instance (used to load per-feed config).
+        variables: Only run extensions that provide one of these
+            variables, e.g. the ones a template uses.  Extensions that
+            do not declare ``provides_variables`` are always run.
 
     Returns:
         Flat dict of ``{variable_name: value}`` pairs.  Always returns a
@@ -182,9 +187,13 @@ def run_extensions(entry: Entry, reader: Reader) -> dict[str, str]:
     results: dict[str, str] = {}
 
     for instance in _get_enabled_instances(entry, reader):
+        provided: list[str] = getattr(type(instance), "provides_variables", [])
+        if variables is not None and provided and not any(var_name in variables for var_name in provided):
+            continue
+
         # Seed with empty strings so every declared variable is at
         # least present (prevents literal ``{{var}}`` in output).
-        for var_name in getattr(type(instance), "provides_variables", []):
+        for var_name in provided:
             results.setdefault(var_name, "")
 
         try:
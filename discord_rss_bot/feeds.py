@@ -2,18 +2,21 @@ from __future__ import annotations
 
 import asyncio
 import concurrent.futures
+import copy
 import datetime
 import functools
-import hashlib
 import html
 import json
 import logging
 import os
 import pprint
 import re
+import sqlite3
+import threading
 import time
 from collections.abc import Callable
 from contextlib import suppress
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Literal
@@ -48,17 +51,42 @@ from reader.types import UpdatedFeed
 from requests import RequestException
 
 from discord_rss_bot.custom_message import CustomEmbed
+from discord_rss_bot.custom_message import ParsedEntry
 from discord_rss_bot.custom_message import get_custom_message
-from discord_rss_bot.custom_message import get_image_urls
 from discord_rss_bot.custom_message import get_validated_message_avatar_url
 from discord_rss_bot.custom_message import get_validated_message_username
 from discord_rss_bot.custom_message import normalize_message_username
 from discord_rss_bot.custom_message import replace_tags_in_embed
 from discord_rss_bot.custom_message import replace_tags_in_text_message
+from discord_rss_bot.delivery import deliver_concurrently
+from discord_rss_bot.delivery import get_render_workers
+from discord_rss_bot.delivery import partition_by_key
+from discord_rss_bot.digest import get_digest_buffer
+from discord_rss_bot.digest import get_digest_settings
+from discord_rss_bot.digest import is_digest_due
+from discord_rss_bot.digest import render_digest_message
 from discord_rss_bot.extensions import auto_enable_extensions_for_feed
 from discord_rss_bot.extensions import run_modify_webhook
 from discord_rss_bot.filter.evaluator import get_entry_filter_decision_from_reader
+from discord_rss_bot.http_client import get_discord_http_client
 from discord_rss_bot.is_url_valid import is_url_valid
+from discord_rss_bot.outbox import get_outbox
+from discord_rss_bot.packing import MAX_EMBED_TEXT_LENGTH
+from discord_rss_bot.packing import MAX_EMBEDS_PER_MESSAGE
+from discord_rss_bot.packing import combine_payloads
+from discord_rss_bot.packing import get_embed_text_length
+from discord_rss_bot.packing import get_pack_key
+from discord_rss_bot.packing import pack_messages
+from discord_rss_bot.payloads import canonicalize_payload
+from discord_rss_bot.payloads import hash_payload
+from discord_rss_bot.rate_limits import RateLimitedError
+from discord_rss_bot.rate_limits import get_rate_limit_manager
+from discord_rss_bot.rate_limits import get_rate_limit_route
+from discord_rss_bot.sent_webhooks import EditLimits
+from discord_rss_bot.sent_webhooks import get_edit_deferred_until
+from discord_rss_bot.sent_webhooks import get_recent_edit_times
+from discord_rss_bot.sent_webhooks import get_record_key
+from discord_rss_bot.sent_webhooks import get_sent_webhook_store
 from discord_rss_bot.settings import default_custom_embed
 from discord_rss_bot.settings import default_custom_message
 from discord_rss_bot.settings import get_reader
@@ -68,13 +96,28 @@ from discord_rss_bot.webhook import WebhookFile
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
+    from collections.abc import Sequence
 
     from reader._types import EntryData
     from reader.types import JSONType
 
+    from discord_rss_bot.delivery import DeliveryStats
+    from discord_rss_bot.digest import DigestBuffer
+    from discord_rss_bot.digest import DigestEntry
+    from discord_rss_bot.digest import DigestSettings
+    from discord_rss_bot.http_client import DiscordHttpClient
+    from discord_rss_bot.outbox import Outbox
+    from discord_rss_bot.outbox import OutboxMessage
+    from discord_rss_bot.payloads import CanonicalPayload
+    from discord_rss_bot.rate_limits import RateLimitManager
+    from discord_rss_bot.sent_webhooks import SentWebhookStore
+
 logger: logging.Logger = logging.getLogger(__name__)
 
-type DeliveryMode = Literal["embed", "text", "screenshot"]
+#: Seconds to wait before retrying a 429 response that did not say how long to wait.
+RATE_LIMIT_FALLBACK_SECONDS: float = 5.0
+
+type DeliveryMode = Literal["embed", "text", "screenshot", "digest"]
 type ScreenshotLayout = Literal["desktop", "mobile"]
 type ScreenshotFileType = Literal["png", "jpeg"]
 type JsonValue = bool | int | float | str | list[JsonValue] | dict[str, JsonValue] | None
@@ -83,6 +126,9 @@ type SentWebhookRecord = dict[str, JsonValue]
 type UpdateCallback = Callable[[], UpdatedFeed | None]
 
 
+DELIVERY_MODES: frozenset[str] = frozenset({"embed", "text", "screenshot", "digest"})
+
+
 class FeedUpdateError(HTTPException):
     """Raised when the initial update for a newly added feed fails."""
 
@@ -263,7 +309,7 @@ def get_entry_delivery_mode(reader: Reader, entry: Entry) -> DeliveryMode:
         logger.exception("Error getting delivery_mode tag for feed: %s", entry.feed.url)
         delivery_mode_raw = ""
 
-    if delivery_mode_raw in {"embed", "text", "screenshot"}:
+    if delivery_mode_raw in DELIVERY_MODES:
         return cast("DeliveryMode", delivery_mode_raw)
 
     try:
@@ -289,7 +335,7 @@ def get_feed_delivery_mode(reader: Reader, feed: Feed) -> DeliveryMode:
         logger.exception("Error getting delivery_mode tag for feed: %s", feed.url)
         delivery_mode_raw = ""
 
-    if delivery_mode_raw in {"embed", "text", "screenshot"}:
+    if delivery_mode_raw in DELIVERY_MODES:
         return cast("DeliveryMode", delivery_mode_raw)
 
     try:
@@ -406,64 +452,101 @@ def feed_saves_sent_webhooks(reader: Reader, feed: Feed | str) -> bool:
     return bool(value)
 
 
-def get_sent_webhook_records(reader: Reader) -> list[SentWebhookRecord]:
-    """Get stored sent webhook records from the global reader tag.
+def feed_packs_embeds(reader: Reader, feed: Feed | str) -> bool:
+    """Return whether consecutive embed messages for a feed may be packed into one Discord message.
+
+    Missing tags default to disabled; packing changes how messages look in the channel, so feeds opt in.
+    """
+    feed_url: str = feed.url if isinstance(feed, Feed) else str(feed)
+    try:
+        value = cast("JsonValue", reader.get_tag(feed, "pack_embeds", False))
+    except ReaderError:
+        logger.exception("Error getting %s tag for feed: %s", "pack_embeds", feed_url)
+        return False
+
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on", "enabled"}
+    return bool(value)
+
+
+def migrate_sent_webhooks_tag(reader: Reader, store: SentWebhookStore | None = None) -> int:
+    """Move records from the global ``sent_webhooks`` reader tag into the sent webhook table.
+
+    Older versions stored every sent message in that one tag. The tag is deleted once its records are copied,
+    so this only does work on the first start after upgrading.
 
     Returns:
-        list[SentWebhookRecord]: Saved sent webhook records.
+        int: Number of records moved.
     """
-    raw_records = cast("JsonValue", reader.get_tag((), "sent_webhooks", []))
-    if not isinstance(raw_records, list):
-        return []
+    try:
+        raw_records = cast("JsonValue", reader.get_tag((), "sent_webhooks", None))
+    except ReaderError:
+        logger.exception("Error getting the sent_webhooks tag")
+        return 0
+    if raw_records is None:
+        return 0
 
-    records: list[SentWebhookRecord] = [
-        cast("SentWebhookRecord", dict(raw_record)) for raw_record in raw_records if isinstance(raw_record, dict)
-    ]
-    return records
+    imported: int = (store or get_sent_webhook_store()).import_records(
+        raw_records if isinstance(raw_records, list) else []
+    )
+    reader.delete_tag((), "sent_webhooks", missing_ok=True)
+    logger.info("Moved %d sent webhook records from the sent_webhooks tag to the state database", imported)
+    return imported
 
 
-def save_sent_webhook_records(reader: Reader, records: list[SentWebhookRecord]) -> None:
-    """Save sent webhook records to the global reader tag."""
-    reader.set_tag((), "sent_webhooks", records)  # pyright: ignore[reportArgumentType]
+@dataclass(frozen=True, slots=True)
+class WebhookPayloads:
+    """The payloads of a rendered webhook, normalized from one canonical encoding."""
 
+    request: JsonObject
+    message: JsonObject
+    message_hash: str
 
-def get_webhook_request_payload(webhook: DiscordWebhook) -> JsonObject:
-    """Return the Discord message payload sent to Discord.
 
-    Runtime fields on the webhook object are intentionally excluded. Unlike
-    `get_webhook_message_payload`, this does not add empty defaults because
-    Components V2 messages reject otherwise-empty `content` and `embeds` fields.
+def get_webhook_payloads(webhook: DiscordWebhook) -> WebhookPayloads:
+    """Return the payload sent to Discord, the payload saved for edits and its hash, with one JSON encode.
+
+    Runtime fields on the webhook object are intentionally excluded. The request payload only has the fields
+    the webhook sets, because Components V2 messages reject otherwise-empty ``content`` and ``embeds`` fields.
+    The message payload keeps empty ``content``, ``embeds`` and ``attachments`` so message edits can clear stale
+    content when a feed changes delivery mode. The two share nested values; copy before changing them.
 
     Returns:
-        JsonObject: Discord request payload.
+        WebhookPayloads: The normalized payloads.
     """
     raw_payload = cast("JsonValue", webhook.json)
-    if not isinstance(raw_payload, dict):
-        return {}
+    webhook_payload: JsonObject = cast("JsonObject", raw_payload) if isinstance(raw_payload, dict) else {}
+    request_keys: set[str] = {key for key in MESSAGE_PAYLOAD_KEYS if key in webhook_payload}
+
+    canonical: CanonicalPayload = canonicalize_payload({
+        "content": "",
+        "embeds": [],
+        "attachments": [],
+        **{key: webhook_payload[key] for key in request_keys},
+    })
+    return WebhookPayloads(
+        request={key: value for key, value in canonical.payload.items() if key in request_keys},
+        message=canonical.payload,
+        message_hash=canonical.digest,
+    )
 
-    payload: JsonObject = {}
-    webhook_payload = cast("JsonObject", raw_payload)
-    for key in MESSAGE_PAYLOAD_KEYS:
-        if key in webhook_payload:
-            payload[key] = webhook_payload[key]
 
-    return cast("JsonObject", json.loads(json.dumps(payload, default=str)))
+def get_webhook_request_payload(webhook: DiscordWebhook) -> JsonObject:
+    """Return the Discord message payload sent to Discord.
+
+    Returns:
+        JsonObject: Discord request payload.
+    """
+    return get_webhook_payloads(webhook).request
 
 
 def get_webhook_message_payload(webhook: DiscordWebhook) -> JsonObject:
     """Return the normalized Discord message payload used to compare saved messages.
 
-    Empty `content`, `embeds`, and `attachments` are kept here so message edits can clear stale content when a feed
-    changes delivery mode. Use `get_webhook_request_payload` for the payload sent to Discord.
-
     Returns:
         JsonObject: Normalized Discord message payload.
     """
-    payload: JsonObject = get_webhook_request_payload(webhook)
-    payload.setdefault("content", "")
-    payload.setdefault("embeds", [])
-    payload.setdefault("attachments", [])
-    return cast("JsonObject", json.loads(json.dumps(payload, default=str)))
+    return get_webhook_payloads(webhook).message
 
 
 def hash_webhook_payload(payload: JsonObject) -> str:
@@ -472,8 +555,7 @@ def hash_webhook_payload(payload: JsonObject) -> str:
     Returns:
         str: SHA-256 hash of the payload.
     """
-    normalized_payload: str = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
-    return hashlib.sha256(normalized_payload.encode()).hexdigest()
+    return hash_payload(payload)
 
 
 def json_object_or_empty(value: JsonValue) -> JsonObject:
@@ -502,21 +584,27 @@ def preserve_previous_embed_media(payload: JsonObject, previous_payload: JsonObj
     if not embeds or not previous_embeds:
         return payload
 
-    merged_payload: JsonObject = cast("JsonObject", json.loads(json.dumps(payload, default=str)))
-    merged_embeds: list[JsonValue] = json_list_or_empty(merged_payload.get("embeds"))
-
-    for index, embed_value in enumerate(merged_embeds):
+    # Only the embeds that get media back are copied; the payload itself may share values with others.
+    merged_embeds: list[JsonValue] = list(embeds)
+    restored: bool = False
+    for index, embed_value in enumerate(embeds):
         if index >= len(previous_embeds) or not isinstance(embed_value, dict):
             continue
 
         previous_embed: JsonObject = json_object_or_empty(previous_embeds[index])
         embed: JsonObject = cast("JsonObject", embed_value)
-        for media_key in ("image", "thumbnail"):
-            previous_media: JsonValue = previous_embed.get(media_key)
-            if has_media_url(previous_media) and not has_media_url(embed.get(media_key)):
-                embed[media_key] = previous_media
-
-    return merged_payload
+        restored_media: JsonObject = {
+            media_key: previous_embed[media_key]
+            for media_key in ("image", "thumbnail")
+            if has_media_url(previous_embed.get(media_key)) and not has_media_url(embed.get(media_key))
+        }
+        if restored_media:
+            merged_embeds[index] = {**embed, **restored_media}
+            restored = True
+
+    if not restored:
+        return payload
+    return {**payload, "embeds": merged_embeds}
 
 
 def get_webhook_message_edit_payload(payload: JsonObject, record: SentWebhookRecord) -> JsonObject:
@@ -526,7 +614,8 @@ def get_webhook_message_edit_payload(payload: JsonObject, record: SentWebhookRec
         JsonObject: Payload suitable for a Discord message edit request.
     """
     previous_payload: JsonObject = json_object_or_empty(record.get("payload"))
-    edit_payload: JsonObject = preserve_previous_embed_media(payload, previous_payload)
+    # Copy the top level so removing fields below does not change the payload that is hashed and saved.
+    edit_payload: JsonObject = dict(preserve_previous_embed_media(payload, previous_payload))
 
     previous_embeds: list[JsonValue] = json_list_or_empty(previous_payload.get("embeds"))
     if edit_payload.get("embeds") == [] and not previous_embeds:
@@ -632,8 +721,17 @@ def upsert_sent_webhook_record(
     webhook: DiscordWebhook,
     response: JsonResponseLike,
     payload: JsonObject,
+    *,
+    pack_index: int | None = None,
+    pack_size: int | None = None,
+    payload_hash: str | None = None,
 ) -> None:
-    """Store the Discord message id and rendered payload for a successfully sent entry."""
+    """Store the Discord message id and rendered payload for a successfully sent entry.
+
+    For a packed message, *pack_index* is the position of the entry's embeds in the shared message. The stored
+    payload is always the entry's own, so later edits can rebuild the shared message from every entry in it.
+    Pass *payload_hash* when the payload was just hashed by ``get_webhook_payloads``.
+    """
     if not feed_saves_sent_webhooks(reader, entry.feed):
         return
 
@@ -644,7 +742,7 @@ def upsert_sent_webhook_record(
         return
 
     now: str = datetime.datetime.now(tz=datetime.UTC).isoformat()
-    payload_hash: str = hash_webhook_payload(payload)
+    payload_hash = payload_hash or hash_webhook_payload(payload)
     delivery_mode: DeliveryMode = get_entry_delivery_mode(reader, entry)
     record: SentWebhookRecord = {
         "feed_url": entry.feed.url,
@@ -667,22 +765,11 @@ def upsert_sent_webhook_record(
         "last_error": "",
         "update_count": 0,
     }
+    if pack_index is not None and pack_size is not None:
+        record["pack_index"] = pack_index
+        record["pack_size"] = pack_size
 
-    records: list[SentWebhookRecord] = get_sent_webhook_records(reader)
-    for index, existing_record in enumerate(records):
-        if (
-            existing_record.get("feed_url") == entry.feed.url
-            and existing_record.get("entry_id") == entry.id
-            and existing_record.get("webhook_url") == webhook_url
-        ):
-            record["first_sent_at"] = existing_record.get("first_sent_at") or now
-            record["update_count"] = json_value_to_int(existing_record.get("update_count"))
-            records[index] = record
-            save_sent_webhook_records(reader, records)
-            return
-
-    records.append(record)
-    save_sent_webhook_records(reader, records)
+    get_sent_webhook_store().upsert(record)
 
 
 def split_webhook_url_for_message_endpoint(webhook_url: str) -> tuple[str, str | None]:
@@ -797,9 +884,25 @@ def request_discord_webhook(
     files: list[WebhookFile] | None,
     timeout: float,
     rate_limit_retry: bool,
+    wait_for_rate_limit: bool = True,
 ) -> Response:
     """Send a Discord webhook request with optional multipart files.
 
+    Requests go through the shared pooled client so consecutive deliveries reuse open connections.
+    Before sending, the request waits if Discord's rate-limit headers say its bucket is exhausted;
+    only this webhook's bucket is held back.
+
+    Args:
+        method: HTTP method.
+        url: Webhook URL without query parameters.
+        payload: JSON payload, sent as ``payload_json`` when there are files.
+        params: Query parameters.
+        files: Files to upload with the message.
+        timeout: Request timeout in seconds.
+        rate_limit_retry: Sleep and retry once when Discord answers 429.
+        wait_for_rate_limit: When False, never sleep: raise ``RateLimitedError`` if the bucket is exhausted
+            and return 429 responses to the caller so it can reschedule the request.
+
     Returns:
         Discord API response.
     """
@@ -812,19 +915,40 @@ def request_discord_webhook(
     else:
         request_kwargs["json"] = payload
 
-    response: Response = httpx2.request(method, url, **request_kwargs)
-    if not rate_limit_retry or response.status_code != 429:  # ruff:ignore[magic-value-comparison]
-        return response
+    client: DiscordHttpClient = get_discord_http_client()
+    rate_limits: RateLimitManager = get_rate_limit_manager()
+    route: str = get_rate_limit_route(method, url)
+
+    def send(*, block: bool) -> tuple[Response, float | None]:
+        # Every attempt, the retry included, waits for the bucket and the global circuit breaker first.
+        rate_limits.acquire(route, block=block)
+        response: Response = client.request(method, url, **request_kwargs)
+        is_rate_limited: bool = response.status_code == 429  # ruff:ignore[magic-value-comparison]
+        retry_after: float | None = get_retry_after_seconds(response) if is_rate_limited else None
+        rate_limits.update(
+            route,
+            response.headers,
+            status_code=response.status_code,
+            retry_after=retry_after,
+            is_global=is_rate_limited and get_response_json(response).get("global") is True,
+        )
+        return response, retry_after
 
-    retry_after: float | None = get_retry_after_seconds(response)
-    if retry_after is None:
+    response, retry_after = send(block=wait_for_rate_limit)
+    if not wait_for_rate_limit or not rate_limit_retry or retry_after is None:
         return response
 
     time.sleep(max(0.0, retry_after))
-    return httpx2.request(method, url, **request_kwargs)
+    response, _ = send(block=True)
+    return response
 
 
-def send_webhook_message(webhook: DiscordWebhook, payload: JsonObject) -> Response:
+def send_webhook_message(
+    webhook: DiscordWebhook,
+    payload: JsonObject,
+    *,
+    wait_for_rate_limit: bool = True,
+) -> Response:
     """Execute a Discord webhook message create request using httpx2.
 
     Returns:
@@ -839,6 +963,7 @@ def send_webhook_message(webhook: DiscordWebhook, payload: JsonObject) -> Respon
         files=get_webhook_files(webhook),
         timeout=cast("int | float", getattr(webhook, "timeout", None) or 30.0),
         rate_limit_retry=bool(getattr(webhook, "rate_limit_retry", False)),
+        wait_for_rate_limit=wait_for_rate_limit,
     )
 
 
@@ -873,7 +998,15 @@ def apply_feed_webhook_identity(webhook: DiscordWebhook, entry: Entry, reader: R
     Returns:
         The same webhook instance with optional identity overrides.
     """
-    feed: Feed = entry.feed
+    return apply_feed_identity(webhook, entry.feed, reader)
+
+
+def apply_feed_identity(webhook: DiscordWebhook, feed: Feed, reader: Reader) -> DiscordWebhook:
+    """Apply a feed's custom username and avatar to a webhook that is not tied to one entry, e.g. a digest.
+
+    Returns:
+        The same webhook instance with optional identity overrides.
+    """
     username: str = get_validated_message_username(reader, feed)
     avatar_url: str = get_validated_message_avatar_url(reader, feed)
 
@@ -900,6 +1033,9 @@ def create_webhook_for_entry(
 ) -> tuple[DiscordWebhook, DeliveryMode]:
     """Create the Discord webhook payload for the entry's effective delivery mode.
 
+    Digests are rendered by ``flush_due_digests``. An entry of a digest feed rendered on its own here, when it
+    is sent by hand or a message sent that way is edited, uses the feed's text message.
+
     Returns:
         tuple[DiscordWebhook, DeliveryMode]: Rendered webhook object and delivery mode.
     """
@@ -911,6 +1047,8 @@ def create_webhook_for_entry(
     if delivery_mode == "screenshot":
         webhook = create_screenshot_webhook(webhook_url, entry, reader=reader)
         return apply_feed_webhook_identity(webhook, entry, reader), delivery_mode
+
+    # Text feeds, and digest feeds, which have no message of their own for a single entry.
     webhook = create_text_webhook(
         webhook_url,
         entry,
@@ -970,13 +1108,63 @@ def update_feed_and_collect_modified_entries(reader: Reader, feed: Feed | str) -
     return collect_modified_entries_during_update(reader, lambda: reader.update_feed(feed))
 
 
-def update_sent_webhook_record_for_entry(
+def get_packed_message_embeds(
+    record: SentWebhookRecord,
+    payload: JsonObject,
+    records: Iterable[SentWebhookRecord],
+) -> list[JsonValue] | None:
+    """Rebuild the embeds of a packed Discord message with one entry's embeds replaced.
+
+    Returns:
+        list[JsonValue] | None: Every embed of the shared message in order, or None if the message cannot be
+            rebuilt safely because an entry's record is missing, the entry is no longer a plain embed message,
+            or the edit would exceed Discord's embed limits.
+    """
+    embeds: list[JsonValue] = json_list_or_empty(payload.get("embeds"))
+    if not embeds or payload.get("content") or payload_has_components(payload):
+        return None
+
+    parts: dict[int, list[JsonValue]] = {json_value_to_int(record.get("pack_index")): embeds}
+    for other in records:
+        other_index: JsonValue = other.get("pack_index")
+        if (
+            isinstance(other_index, int)
+            and other_index not in parts
+            and other.get("webhook_url") == record.get("webhook_url")
+            and other.get("message_id") == record.get("message_id")
+        ):
+            parts[other_index] = json_list_or_empty(json_object_or_empty(other.get("payload")).get("embeds"))
+
+    if len(parts) != json_value_to_int(record.get("pack_size")):
+        return None
+
+    packed_embeds: list[JsonValue] = [embed for index in sorted(parts) for embed in parts[index]]
+    if (
+        len(packed_embeds) > MAX_EMBEDS_PER_MESSAGE
+        or sum(map(get_embed_text_length, packed_embeds)) > MAX_EMBED_TEXT_LENGTH
+    ):
+        return None
+    return packed_embeds
+
+
+def update_sent_webhook_record_for_entry(  # ruff:ignore[too-many-return-statements]
     reader: Reader,
     entry: Entry,
     record: SentWebhookRecord,
+    *,
+    records: Iterable[SentWebhookRecord] = (),
+    rendered: tuple[DiscordWebhook, DeliveryMode] | None = None,
+    edit_limits: EditLimits | None = None,
 ) -> tuple[SentWebhookRecord, bool, bool]:
     """Edit one saved Discord webhook message record for an updated entry.
 
+    When the entry was packed with other entries into one Discord message, the message is rebuilt from the
+    saved records in *records* that share it, so only this entry's embeds change. Pass *rendered* to reuse a
+    rendering of the entry when it was sent to several webhooks.
+
+    An edit that comes too soon after the last one, or after the message used up its hourly edit budget, is
+    not sent; the record's ``edit_deferred_until`` says when ``send_deferred_edits`` sends it instead.
+
     Returns:
         tuple[SentWebhookRecord, bool, bool]: Updated record, whether it changed, and whether Discord was edited.
     """
@@ -991,33 +1179,71 @@ def update_sent_webhook_record_for_entry(
         return record, False, False
 
     previous_payload: JsonObject = json_object_or_empty(record.get("payload"))
-    webhook, delivery_mode = create_webhook_for_entry(
+    webhook, delivery_mode = rendered or create_webhook_for_entry(
         webhook_url_value,
         entry,
         reader,
         use_default_message_on_empty=True,
     )
-    payload: JsonObject = preserve_previous_embed_media(
-        get_webhook_message_payload(webhook),
-        previous_payload,
-    )
+    payloads: WebhookPayloads = get_webhook_payloads(webhook)
+    payload: JsonObject = preserve_previous_embed_media(payloads.message, previous_payload)
     edit_payload: JsonObject = get_webhook_message_edit_payload(payload, record)
-    payload_hash: str = hash_webhook_payload(payload)
+    payload_hash: str = payloads.message_hash if payload is payloads.message else hash_webhook_payload(payload)
     if payload_hash == record.get("payload_hash"):
+        # The entry changed back before a held-back edit was sent, so there is nothing left to edit.
+        if record.get("edit_deferred_until"):
+            return {**record, "edit_deferred_until": ""}, True, False
         return record, False, False
-    if previous_payload and payload_hash == hash_webhook_payload(previous_payload):
+    # The store keys payloads by their hash, so a saved payload_hash always matches the previous payload; only
+    # records saved before payloads were hashed need the previous payload hashed.
+    if previous_payload and not record.get("payload_hash") and payload_hash == hash_webhook_payload(previous_payload):
         return (
             {
                 **record,
                 "payload": payload,
                 "payload_hash": payload_hash,
                 "delivery_mode": delivery_mode,
+                "edit_deferred_until": "",
             },
             True,
             False,
         )
 
-    now: str = datetime.datetime.now(tz=datetime.UTC).isoformat()
+    now_at: datetime.datetime = datetime.datetime.now(tz=datetime.UTC)
+    deferred_until: datetime.datetime | None = get_edit_deferred_until(
+        record,
+        edit_limits or EditLimits.from_env(),
+        now=now_at,
+    )
+    if deferred_until is not None:
+        logger.debug("Holding back edit of Discord message %s until %s", message_id_value, deferred_until)
+        return (
+            {
+                **record,
+                "edit_deferred_until": deferred_until.isoformat(),
+                "deferred_edit_count": json_value_to_int(record.get("deferred_edit_count")) + 1,
+            },
+            True,
+            False,
+        )
+
+    now: str = now_at.isoformat()
+    if "pack_index" in record:
+        packed_embeds: list[JsonValue] | None = get_packed_message_embeds(record, payload, records)
+        if packed_embeds is None:
+            logger.warning("Cannot edit packed Discord message %s for entry %s", message_id_value, entry.id)
+            return (
+                {
+                    **record,
+                    "last_update_attempt_at": now,
+                    "last_error": "The entry can no longer be edited inside its packed Discord message.",
+                    "edit_deferred_until": "",
+                },
+                True,
+                False,
+            )
+        edit_payload["embeds"] = packed_embeds
+
     try:
         response: Response = edit_sent_webhook_message(
             webhook_url=webhook_url_value,
@@ -1032,14 +1258,14 @@ def update_sent_webhook_record_for_entry(
                 **record,
                 "last_update_attempt_at": now,
                 "last_error": str(e),
+                "edit_deferred_until": "",
             },
             True,
             False,
         )
 
-    status_code: int = response.status_code
     response_json: JsonObject = get_response_json(response)
-    if status_code in {200, 204}:
+    if response.status_code in {200, 204}:
         return (
             {
                 **record,
@@ -1053,9 +1279,11 @@ def update_sent_webhook_record_for_entry(
                 "discord_response": response_json,
                 "response_text": response.text[:5000],
                 "last_updated_at": now,
-                "last_status_code": status_code,
+                "last_status_code": response.status_code,
                 "last_error": "",
                 "update_count": json_value_to_int(record.get("update_count")) + 1,
+                "recent_edit_times": [*get_recent_edit_times(record, now=now_at), now],
+                "edit_deferred_until": "",
             },
             True,
             True,
@@ -1065,22 +1293,31 @@ def update_sent_webhook_record_for_entry(
         {
             **record,
             "last_update_attempt_at": now,
-            "last_status_code": status_code,
+            "last_status_code": response.status_code,
             "discord_response": response_json,
             "response_text": response.text[:5000],
             "last_error": response.text[:500],
+            "edit_deferred_until": "",
         },
         True,
         False,
     )
 
 
-def update_sent_webhooks_for_modified_entries(  # ruff:ignore[complex-structure]
+def update_sent_webhooks_for_modified_entries(
     reader: Reader,
     modified_entries: Iterable[tuple[str, str]],
 ) -> int:
     """Edit saved Discord webhook messages for modified reader entries.
 
+    Only the records of the modified entries are loaded, by key, so the cost depends on how many entries
+    changed and not on how many messages have been sent.
+
+    Entries are rendered on the render pool, then the edits are sent with one ordered lane per webhook, like
+    new messages: a slow or rate-limited webhook no longer holds up the edits of every other channel, and
+    entries packed into one message are still edited one after another. Changed records are saved in one
+    transaction once every edit has finished.
+
     Returns:
         int: Number of Discord messages successfully edited.
     """
@@ -1088,49 +1325,155 @@ def update_sent_webhooks_for_modified_entries(  # ruff:ignore[complex-structure]
     if not modified_entry_keys:
         return 0
 
-    records: list[SentWebhookRecord] = get_sent_webhook_records(reader)
-    if not records:
-        return 0
-
-    records_changed: bool = False
+    store: SentWebhookStore = get_sent_webhook_store()
+    records_by_entry: dict[tuple[str, str], list[SentWebhookRecord]] = store.get_for_entries(modified_entry_keys)
+    rendered_entries: dict[tuple[str, str], tuple[Entry, tuple[DiscordWebhook, DeliveryMode] | None]] = {}
+    # Records edited during this call, so later entries packed into the same message see the new payloads.
+    changed_records: dict[tuple[str, str, str], SentWebhookRecord] = {}
+    edit_limits: EditLimits = EditLimits.from_env()
     updated_count: int = 0
+    lock = threading.Lock()
 
-    for feed_url, entry_id in modified_entry_keys:
-        matching_record_indexes: list[int] = [
-            index
-            for index, record in enumerate(records)
-            if record.get("feed_url") == feed_url and record.get("entry_id") == entry_id
-        ]
-        if not matching_record_indexes:
-            continue
-
+    def render_entry(webhook_url: str, entry_key: tuple[str, str]) -> bool:
         try:
-            entry: Entry = reader.get_entry((feed_url, entry_id))
+            entry: Entry = reader.get_entry(entry_key)
         except (FeedNotFoundError, EntryNotFoundError):
-            logger.exception("Saved webhook entry no longer exists: %s %s", feed_url, entry_id)
-            continue
+            logger.exception("Saved webhook entry no longer exists: %s %s", *entry_key)
+            return False
 
         if not feed_saves_sent_webhooks(reader, entry.feed):
-            continue
+            return True
 
-        for record_index in matching_record_indexes:
-            updated_record, record_changed, message_was_edited = update_sent_webhook_record_for_entry(
-                reader,
-                entry,
-                records[record_index],
-            )
-            if record_changed:
-                records[record_index] = updated_record
-                records_changed = True
+        # Render the entry once, even when it was sent to several webhooks.
+        rendered: tuple[DiscordWebhook, DeliveryMode] | None = None
+        if webhook_url:
+            rendered = create_webhook_for_entry(webhook_url, entry, reader, use_default_message_on_empty=True)
+        with lock:
+            rendered_entries[entry_key] = (entry, rendered)
+        return True
+
+    def edit_message(_webhook_url: str, job: tuple[tuple[str, str], SentWebhookRecord]) -> bool:
+        nonlocal updated_count
+        entry_key, record = job
+        entry, rendered = rendered_entries[entry_key]
+        rendered = get_rendered_for_target(rendered, str(record.get("webhook_url") or ""))
+        with lock:
+            siblings: list[SentWebhookRecord] = get_packed_sibling_records(store, record, changed_records)
+
+        updated_record, record_changed, message_was_edited = update_sent_webhook_record_for_entry(
+            reader,
+            entry,
+            record,
+            records=siblings,
+            rendered=rendered,
+            edit_limits=edit_limits,
+        )
+        with lock:
+            if record_changed and (key := get_record_key(updated_record)) is not None:
+                changed_records[key] = updated_record
             if message_was_edited:
                 updated_count += 1
+        return message_was_edited or not record_changed
 
-    if records_changed:
-        save_sent_webhook_records(reader, records)
+    deliver_concurrently(
+        ((get_first_webhook_url(entry_records), entry_key) for entry_key, entry_records in records_by_entry.items()),
+        render_entry,
+        max_workers=get_render_workers(),
+    )
+    deliver_concurrently(
+        (
+            (str(record.get("webhook_url") or ""), (entry_key, record))
+            for entry_key, entry_records in records_by_entry.items()
+            if entry_key in rendered_entries
+            for record in entry_records
+        ),
+        edit_message,
+    )
+
+    if changed_records:
+        store.save(changed_records.values())
 
     return updated_count
 
 
+def send_deferred_edits(reader: Reader | None = None) -> int:
+    """Send message edits held back by the edit debounce or budget that are now due; run by the scheduler.
+
+    Returns:
+        int: Number of Discord messages successfully edited.
+    """
+    store: SentWebhookStore = get_sent_webhook_store()
+    now: datetime.datetime = datetime.datetime.now(tz=datetime.UTC)
+    due_entries: list[tuple[str, str]] = store.get_due_edits(now=now)
+    if not due_entries:
+        return 0
+
+    updated_count: int = update_sent_webhooks_for_modified_entries(
+        get_reader() if reader is None else reader,
+        due_entries,
+    )
+    # Edits that are still due belong to entries that were deleted or whose feed stopped saving sent messages.
+    store.clear_due_edits(now=now)
+    return updated_count
+
+
+def get_rendered_for_target(
+    rendered: tuple[DiscordWebhook, DeliveryMode] | None,
+    webhook_url: str,
+) -> tuple[DiscordWebhook, DeliveryMode] | None:
+    """Return an entry rendered for one webhook, ready to send to *webhook_url*.
+
+    A thread id on the rendered webhook names a thread in the channel of the webhook it was rendered for, so
+    it is dropped when the message goes to another webhook.
+
+    Returns:
+        tuple[DiscordWebhook, DeliveryMode] | None: *rendered*, or a copy whose webhook has no thread id.
+    """
+    if rendered is None:
+        return None
+    webhook, delivery_mode = rendered
+    if webhook.url == webhook_url or not isinstance(getattr(webhook, "thread_id", None), str):
+        return rendered
+    target_webhook: DiscordWebhook = copy.copy(webhook)
+    target_webhook.thread_id = None
+    return target_webhook, delivery_mode
+
+
+def get_first_webhook_url(records: Iterable[SentWebhookRecord]) -> str:
+    """Return the first webhook URL saved in *records*, used to render an entry sent to several webhooks.
+
+    Returns:
+        str: The webhook URL, or an empty string if no record has one.
+    """
+    for record in records:
+        webhook_url: JsonValue = record.get("webhook_url")
+        if isinstance(webhook_url, str) and webhook_url:
+            return webhook_url
+    return ""
+
+
+def get_packed_sibling_records(
+    store: SentWebhookStore,
+    record: SentWebhookRecord,
+    changed_records: dict[tuple[str, str, str], SentWebhookRecord],
+) -> list[SentWebhookRecord]:
+    """Return the records of every entry packed into the same Discord message as *record*.
+
+    Returns:
+        list[SentWebhookRecord]: The records, with pending edits applied; empty if the message was not packed.
+    """
+    webhook_url: JsonValue = record.get("webhook_url")
+    message_id: JsonValue = record.get("message_id")
+    if record.get("pack_size") is None or not isinstance(webhook_url, str) or not isinstance(message_id, str):
+        return []
+
+    siblings: list[SentWebhookRecord] = store.get_message_records(webhook_url, message_id)
+    return [
+        changed_records.get(key, sibling) if (key := get_record_key(sibling)) is not None else sibling
+        for sibling in siblings
+    ]
+
+
 def create_text_webhook(
     webhook_url: str,
     entry: Entry,
@@ -1632,9 +1975,16 @@ def get_entry_media_gallery_items(
     custom_embed: CustomEmbed,
     *,
     image_limit: int = 10,
+    parsed_entry: ParsedEntry | None = None,
 ) -> list[JsonObject]:
     """Return items for a Discord Media Gallery component.
 
+    Args:
+        entry: The entry to collect images from.
+        custom_embed: The rendered embed, whose image and thumbnail are added after the entry's images.
+        image_limit: The maximum number of items.
+        parsed_entry: The entry's parsed HTML, if the caller parsed it already for the embed.
+
     Returns:
         Media Gallery items capped to Discord's item limit.
     """
@@ -1648,7 +1998,8 @@ def get_entry_media_gallery_items(
         return ttvdrops_media_items[:image_limit]
 
     description: str = entry.title or entry.id
-    for image_url in get_image_urls(entry.summary, entry.content, limit=image_limit):
+    parsed_entry = parsed_entry or ParsedEntry.from_entry(entry)
+    for image_url in parsed_entry.image_urls(limit=image_limit):
         add_unique_media_gallery_item(media_items, image_url, description=description)
 
     add_unique_media_gallery_item(media_items, custom_embed.image_url, description=description)
@@ -1783,8 +2134,11 @@ def create_embed_webhook(  # ruff:ignore[complex-structure, too-many-branches]
     webhook: DiscordWebhook = DiscordWebhook(url=webhook_url, rate_limit_retry=True)
     feed: Feed = entry.feed
 
+    # The embed tags and the media gallery both read the entry's HTML; parse it once for both.
+    parsed_entry: ParsedEntry = ParsedEntry.from_entry(entry)
+
     # Get the embed data from the database.
-    custom_embed: CustomEmbed = replace_tags_in_embed(feed=feed, entry=entry, reader=reader)
+    custom_embed: CustomEmbed = replace_tags_in_embed(feed=feed, entry=entry, reader=reader, parsed_entry=parsed_entry)
     media_gallery_image_limit: int = get_feed_media_gallery_image_limit(reader, feed)
     webhook_text_length_limit: int = get_feed_webhook_text_length_limit(reader, feed)
     if media_gallery_image_limit == 0:
@@ -1795,6 +2149,7 @@ def create_embed_webhook(  # ruff:ignore[complex-structure, too-many-branches]
         entry,
         custom_embed,
         image_limit=media_gallery_image_limit,
+        parsed_entry=parsed_entry,
     )
     if media_gallery_items:
         return create_components_v2_webhook(
@@ -1895,6 +2250,66 @@ def get_webhook_url(reader: Reader, entry: Entry) -> str:
     return webhook_url
 
 
+@dataclass(frozen=True, slots=True)
+class WebhookTarget:
+    """An additional webhook a feed delivers to, with optional overrides for the rendered message."""
+
+    url: str
+    username: str = ""
+    avatar_url: str = ""
+
+    def apply(self, payload: JsonObject) -> JsonObject:
+        """Return a copy of a request payload with this target's overrides applied.
+
+        Returns:
+            JsonObject: The payload to send to this target.
+        """
+        target_payload: JsonObject = dict(payload)
+        if self.username:
+            target_payload["username"] = self.username
+        if self.avatar_url:
+            target_payload["avatar_url"] = self.avatar_url
+        return target_payload
+
+
+def get_extra_webhook_targets(reader: Reader, feed: Feed | str) -> list[WebhookTarget]:
+    """Get the webhooks a feed delivers to in addition to its main ``webhook`` tag.
+
+    They are stored in the ``extra_webhooks`` feed tag as a list of ``{"url", "username", "avatar_url"}``
+    objects; the overrides are optional. Entries are rendered once and the result is sent to every target.
+
+    Returns:
+        list[WebhookTarget]: Valid extra targets, without duplicates or the main webhook.
+    """
+    feed_url: str = feed.url if isinstance(feed, Feed) else str(feed)
+    try:
+        raw_targets = cast("JsonValue", reader.get_tag(feed, "extra_webhooks", []))
+        main_webhook_url: str = str(reader.get_tag(feed, "webhook", "")).strip()
+    except ReaderError:
+        logger.exception("Error getting %s tag for feed: %s", "extra_webhooks", feed_url)
+        return []
+
+    targets: dict[str, WebhookTarget] = {}
+    for raw_target in raw_targets if isinstance(raw_targets, list) else []:
+        if not isinstance(raw_target, dict):
+            continue
+        url: JsonValue = raw_target.get("url")
+        if not isinstance(url, str) or url.strip() == main_webhook_url or not is_url_valid(url.strip()):
+            continue
+
+        username: JsonValue = raw_target.get("username")
+        avatar_url: JsonValue = raw_target.get("avatar_url")
+        targets.setdefault(
+            url.strip(),
+            WebhookTarget(
+                url=url.strip(),
+                username=normalize_message_username(username) if isinstance(username, str) else "",
+                avatar_url=avatar_url.strip() if isinstance(avatar_url, str) and is_url_valid(avatar_url) else "",
+            ),
+        )
+    return list(targets.values())
+
+
 def set_entry_as_read(reader: Reader, entry: Entry) -> None:
     """Set the webhook to read, so we don't send it again.
 
@@ -1915,6 +2330,9 @@ def send_to_discord(reader: Reader | None = None, feed: Feed | None = None, *, d
 
     If response was not ok, we will log the error and mark the entry as unread, so it will be sent again next time.
 
+    Entries for different webhooks are delivered concurrently (see ``discord_rss_bot.delivery``);
+    entries for the same webhook are still sent in the order the reader returned them.
+
     Args:
         reader: If we should use a custom reader instead of the default one.
         feed: The feed to send to Discord.
@@ -1935,40 +2353,412 @@ def send_to_discord(reader: Reader | None = None, feed: Feed | None = None, *, d
     except (AssertionError, ReaderError, RequestException, HTTPError, OSError, ValueError):
         logger.exception("Failed to update saved Discord webhooks for modified feed entries.")
 
-    # Loop through the unread entries.
+    # Decide what to send on this thread. Entries that will not be sent are marked as read right away.
+    jobs: list[tuple[str, Entry]] = []
     entries: Iterable[Entry] = effective_reader.get_entries(feed=feed, read=False)
     for entry in entries:
-        set_entry_as_read(effective_reader, entry)
-
         if entry.added < datetime.datetime.now(tz=entry.added.tzinfo) - datetime.timedelta(days=1):
             logger.info("Entry is older than 24 hours: %s from %s", entry.id, entry.feed.url)
+            set_entry_as_read(effective_reader, entry)
             continue
 
         webhook_url: str = get_webhook_url(effective_reader, entry)
         if not webhook_url:
             logger.info("No webhook URL found for feed: %s", entry.feed.url)
+            set_entry_as_read(effective_reader, entry)
             continue
 
         decision = get_entry_filter_decision_from_reader(effective_reader, entry)
         if not decision.should_send:
             logger.info("Entry was skipped: %s (%s)", entry.id, decision.reason)
+            set_entry_as_read(effective_reader, entry)
             continue
 
-        webhook, _delivery_mode = create_webhook_for_entry(
-            webhook_url,
-            entry,
-            effective_reader,
-            use_default_message_on_empty=True,
-        )
-
-        # Send the entry to Discord because the combined blacklist/whitelist decision allowed it.
-        execute_webhook(webhook, entry, reader=effective_reader)
+        jobs.append((webhook_url, entry))
 
         # If we only want to send one entry, we will break the loop. This is used when testing this function.
         if do_once:
-            logger.info("Sent one entry to Discord. Breaking the loop.")
+            logger.info("Queued one entry for Discord. Breaking the loop.")
             break
 
+    outbox: Outbox = get_outbox()
+
+    def render_entry(webhook_url: str, entry: Entry) -> None:
+        try:
+            # The combined blacklist/whitelist decision allowed the entry, so render it into the outbox,
+            # or into the feed's next digest.
+            # The entry is rendered once and fanned out to the feed's extra webhooks.
+            extra_targets: list[WebhookTarget] = get_extra_webhook_targets(effective_reader, entry.feed)
+            if get_entry_delivery_mode(effective_reader, entry) == "digest":
+                buffer_entry_for_digest(webhook_url, entry, effective_reader, extra_targets=extra_targets)
+            else:
+                enqueue_entry_for_delivery(
+                    webhook_url,
+                    entry,
+                    effective_reader,
+                    outbox=outbox,
+                    extra_targets=extra_targets,
+                )
+        finally:
+            # Mark as read only after the message is stored, so a crash while rendering re-renders it next time.
+            # An entry that fails to render is also marked as read; retrying it every minute would not help.
+            set_entry_as_read(effective_reader, entry)
+
+    deliver_concurrently(jobs, render_entry, max_workers=get_render_workers())
+    try:
+        flush_due_digests(effective_reader, outbox=outbox)
+    except (ReaderError, sqlite3.Error):
+        logger.exception("Failed to queue due digests.")
+    drain_outbox(effective_reader, outbox=outbox)
+
+
+def entry_feed_accepts_deliveries(entry: Entry, reader: Reader) -> bool:
+    """Return whether the entry's feed still exists and is not paused."""
+    entry_feed: Feed = entry.feed
+    if entry_feed.updates_enabled is False:
+        logger.warning("Feed is paused, not sending entry to Discord: %s", entry_feed.url)
+        return False
+
+    try:
+        reader.get_feed(entry_feed.url)
+    except FeedNotFoundError:
+        logger.warning("Feed not found in reader, not sending entry to Discord: %s", entry_feed.url)
+        return False
+    return True
+
+
+def enqueue_entry_for_delivery(
+    webhook_url: str,
+    entry: Entry,
+    reader: Reader,
+    *,
+    outbox: Outbox | None = None,
+    extra_targets: Sequence[WebhookTarget] = (),
+) -> int | None:
+    """Render an entry and store the finished Discord request in the outbox.
+
+    The entry is rendered once; the result is queued for *webhook_url* and for each of *extra_targets*, with
+    the target's overrides applied.
+
+    Returns:
+        int | None: The outbox message id for *webhook_url*, or None if nothing was queued.
+    """
+    if not entry_feed_accepts_deliveries(entry, reader):
+        return None
+
+    webhook, delivery_mode = create_webhook_for_entry(webhook_url, entry, reader, use_default_message_on_empty=True)
+
+    # Let enabled extensions modify the webhook before it is stored.
+    webhook = run_modify_webhook(webhook, entry, reader)
+
+    thread_id: str | None = getattr(webhook, "thread_id", None)
+    thread_id = thread_id if isinstance(thread_id, str) else None
+    payloads: WebhookPayloads = get_webhook_payloads(webhook)
+    request_payload: JsonObject = payloads.request
+    message_payload: JsonObject = payloads.message
+    files: list[WebhookFile] = get_webhook_files(webhook)
+    packs_embeds: bool = delivery_mode == "embed" and feed_packs_embeds(reader, entry.feed)
+    effective_outbox: Outbox = outbox or get_outbox()
+
+    message_ids: list[int | None] = []
+    for target in (WebhookTarget(url=webhook_url), *extra_targets):
+        target_payload: JsonObject = target.apply(request_payload)
+        # A thread id set on the rendered webhook names a thread in the main webhook's channel; extra targets
+        # post to their own channel, or to the thread in their own URL.
+        target_thread_id: str | None = thread_id if target.url == webhook_url else None
+        message_id: int | None = effective_outbox.enqueue(
+            feed_url=entry.feed.url,
+            entry_id=entry.id,
+            webhook_url=target.url,
+            delivery_mode=delivery_mode,
+            request_payload=target_payload,
+            message_payload=message_payload,
+            thread_id=target_thread_id,
+            files=files,
+            pack_key=(
+                get_pack_key(target_payload, thread_id=target_thread_id, has_files=bool(files))
+                if packs_embeds
+                else None
+            ),
+        )
+        if message_id is None:
+            logger.info("Entry is already waiting in the outbox: %s", entry.id)
+        message_ids.append(message_id)
+    return message_ids[0]
+
+
+def buffer_entry_for_digest(
+    webhook_url: str,
+    entry: Entry,
+    reader: Reader,
+    *,
+    buffer: DigestBuffer | None = None,
+    extra_targets: Sequence[WebhookTarget] = (),
+) -> bool:
+    """Render an entry's digest line once and buffer it until the next digest of each target webhook.
+
+    Returns:
+        bool: True if the entry was buffered for *webhook_url*, False if it was skipped or already buffered.
+    """
+    if not entry_feed_accepts_deliveries(entry, reader):
+        return False
+
+    settings: DigestSettings = get_digest_settings(reader, entry.feed)
+    line: str = replace_tags_in_text_message(entry, reader, message_template=settings.entry_template).strip()
+    effective_buffer: DigestBuffer = buffer or get_digest_buffer()
+    added: list[bool] = [
+        effective_buffer.add(
+            feed_url=entry.feed.url,
+            entry_id=entry.id,
+            webhook_url=target_url,
+            line=line or entry.title or entry.id,
+        )
+        for target_url in (webhook_url, *(target.url for target in extra_targets))
+    ]
+    if not added[0]:
+        logger.info("Entry is already waiting in a digest: %s", entry.id)
+    return added[0]
+
+
+def flush_due_digests(
+    reader: Reader,
+    *,
+    outbox: Outbox | None = None,
+    buffer: DigestBuffer | None = None,
+    now: float | None = None,
+) -> int:
+    """Move every digest that is due from the digest buffer to the outbox.
+
+    A digest is due once its oldest entry has waited the feed's digest interval or it holds the feed's maximum
+    number of entries. Digests of paused feeds wait; entries of removed feeds are dropped.
+
+    Returns:
+        int: Number of digest messages queued.
+    """
+    effective_buffer: DigestBuffer = buffer or get_digest_buffer()
+    effective_outbox: Outbox = outbox or get_outbox()
+    flush_time: float = time.time() if now is None else now
+    queued: int = 0
+
+    for (feed_url, webhook_url), entries in effective_buffer.get_pending().items():
+        feed: Feed | None = reader.get_feed(feed_url, None)
+        if feed is None:
+            logger.warning(
+                "Dropped %d digest entries of removed feed: %s", effective_buffer.discard(feed_url), feed_url
+            )
+            continue
+        if feed.updates_enabled is False:
+            continue
+
+        settings: DigestSettings = get_digest_settings(reader, feed)
+        if not is_digest_due(entries, settings, now=flush_time):
+            continue
+
+        target: WebhookTarget = next(
+            (target for target in get_extra_webhook_targets(reader, feed) if target.url == webhook_url),
+            WebhookTarget(url=webhook_url),
+        )
+
+        for start in range(0, len(entries), settings.max_entries):
+            chunk: list[DigestEntry] = entries[start : start + settings.max_entries]
+            content: str = render_digest_message(
+                settings,
+                [entry.line for entry in chunk],
+                feed_title=html.unescape(feed.title or feed.url),
+                feed_url=feed.url,
+                feed_link=feed.link or "",
+                max_length=get_feed_webhook_text_length_limit(reader, feed),
+            )
+            webhook: DiscordWebhook = apply_feed_identity(
+                DiscordWebhook(url=webhook_url, content=content, rate_limit_retry=True),
+                feed,
+                reader,
+            )
+            payloads: WebhookPayloads = get_webhook_payloads(webhook)
+            effective_buffer.flush(
+                chunk,
+                effective_outbox,
+                request_payload=target.apply(payloads.request),
+                message_payload=payloads.message,
+            )
+            queued += 1
+            logger.info("Queued a digest of %d entries for feed: %s", len(chunk), feed_url)
+
+    return queued
+
+
+def deliver_outbox_messages(messages: list[OutboxMessage], reader: Reader, outbox: Outbox) -> bool:
+    """Send outbox messages as one Discord message, removing them on success and rescheduling them on failure.
+
+    More than one message is only passed when they were packed together (see ``discord_rss_bot.packing``).
+
+    Returns:
+        bool: True if Discord accepted the message.
+    """
+    first: OutboxMessage = messages[0]
+    entry_ids: str = ", ".join(message.entry_id for message in messages)
+    webhook: DiscordWebhook = first.to_webhook()
+    request_payload: JsonObject = (
+        first.request_payload
+        if len(messages) == 1
+        else combine_payloads(message.request_payload for message in messages)
+    )
+    try:
+        # Never sleep on a rate limit here; that would hold up the scheduler job. Reschedule instead.
+        response: Response = send_webhook_message(webhook, request_payload, wait_for_rate_limit=False)
+    except RateLimitedError as e:
+        defer_rate_limited_messages(messages, outbox, e.retry_after)
+        return False
+    except (HTTPError, OSError) as e:
+        next_attempt_at: float | None = mark_outbox_messages_failed(messages, outbox, str(e))
+        if next_attempt_at is None:
+            logger.exception("Giving up on entry %s after %d attempts", entry_ids, first.attempts + 1)
+        else:
+            logger.warning(
+                "Failed to send entry %s to Discord (attempt %d), retrying in %.0fs: %s",
+                entry_ids,
+                first.attempts + 1,
+                next_attempt_at - time.time(),
+                e,
+            )
+        return False
+
+    logger.debug("Discord webhook response for entry %s: status=%s", entry_ids, response.status_code)
+    if response.status_code == 429:  # ruff:ignore[magic-value-comparison]
+        retry_after: float | None = get_retry_after_seconds(response)
+        defer_rate_limited_messages(
+            messages,
+            outbox,
+            RATE_LIMIT_FALLBACK_SECONDS if retry_after is None else retry_after,
+        )
+        return False
+
+    if response.status_code not in {200, 204}:
+        # Discord will reject the same request again (bad payload, deleted webhook, ...), so do not retry 4xx.
+        next_attempt_at = mark_outbox_messages_failed(
+            messages,
+            outbox,
+            f"{response.status_code}: {response.text[:1000]}",
+            status_code=response.status_code,
+            response_body=response.text,
+            permanent=400 <= response.status_code < 500,  # ruff:ignore[magic-value-comparison]
+        )
+        logger.error(
+            "Error sending entry %s to Discord (attempt %d), %s: %s\n%s",
+            entry_ids,
+            first.attempts + 1,
+            "moved to failed deliveries"
+            if next_attempt_at is None
+            else f"retrying in {next_attempt_at - time.time():.0f}s",
+            response.text,
+            pprint.pformat(request_payload),
+        )
+        return False
+
+    logger.info("Sent entry to Discord: %s", entry_ids)
+    for pack_index, message in enumerate(messages):
+        outbox.mark_sent(message.id)
+        entry: Entry | None = reader.get_entry((message.feed_url, message.entry_id), None)
+        if entry is not None:
+            upsert_sent_webhook_record(
+                reader,
+                entry,
+                message.webhook_url,
+                webhook,
+                response,
+                message.message_payload,
+                pack_index=pack_index if len(messages) > 1 else None,
+                pack_size=len(messages) if len(messages) > 1 else None,
+            )
+    return True
+
+
+def mark_outbox_messages_failed(
+    messages: list[OutboxMessage],
+    outbox: Outbox,
+    error: str,
+    *,
+    status_code: int | None = None,
+    response_body: str = "",
+    permanent: bool = False,
+) -> float | None:
+    """Record a failed attempt for every message that was sent together.
+
+    Returns:
+        float | None: Unix time of the next attempt of the first message, or None if it became a dead letter.
+    """
+    next_attempts: list[float | None] = [
+        outbox.mark_failed(
+            message.id,
+            error,
+            status_code=status_code,
+            response_body=response_body,
+            permanent=permanent,
+        )
+        for message in messages
+    ]
+    return next_attempts[0]
+
+
+def defer_rate_limited_messages(messages: list[OutboxMessage], outbox: Outbox, retry_after: float) -> None:
+    """Put rate-limited messages back in the outbox until Discord's retry deadline, without using up an attempt."""
+    retry_after = max(retry_after, 0.0)
+    for message in messages:
+        outbox.defer(message.id, time.time() + retry_after, reason=f"Rate limited; retrying after {retry_after:.2f}s")
+    get_rate_limit_manager().record_deferral(retry_after)
+    logger.info(
+        "Rate limited while sending entry %s; requeued for %.2fs",
+        ", ".join(message.entry_id for message in messages),
+        retry_after,
+    )
+
+
+_drain_lock: threading.Lock = threading.Lock()
+
+
+def drain_outbox(reader: Reader | None = None, *, outbox: Outbox | None = None) -> DeliveryStats | None:
+    """Send every due outbox message, one ordered lane per webhook.
+
+    Consecutive messages from feeds with ``pack_embeds`` enabled are packed into one Discord message. When a
+    message fails, the later messages for the same webhook are held back until it is sent or dead-lettered so
+    they are not posted ahead of it. Only one drain runs at a time; overlapping calls return immediately.
+
+    Returns:
+        DeliveryStats | None: Counts for this drain, or None if another drain was already running
+            or the global circuit breaker has paused Discord traffic.
+    """
+    if not _drain_lock.acquire(blocking=False):
+        logger.debug("The outbox is already being drained.")
+        return None
+
+    try:
+        paused_for: float = get_rate_limit_manager().breaker.remaining()
+        if paused_for > 0:
+            logger.info("Discord traffic is paused for %.1fs; not draining the outbox.", paused_for)
+            return None
+
+        effective_reader: Reader = get_reader() if reader is None else reader
+        effective_outbox: Outbox = outbox or get_outbox()
+        blocked_webhooks: set[str] = set()
+
+        def deliver(webhook_url: str, messages: list[OutboxMessage]) -> bool:
+            if webhook_url in blocked_webhooks:
+                return False
+            if deliver_outbox_messages(messages, effective_reader, effective_outbox):
+                return True
+            blocked_webhooks.add(webhook_url)
+            return False
+
+        due: list[OutboxMessage] = effective_outbox.get_due()
+        jobs: list[tuple[str, list[OutboxMessage]]] = [
+            (webhook_url, batch)
+            for webhook_url, lane in partition_by_key((message.webhook_url, message) for message in due).items()
+            for batch in pack_messages(lane)
+        ]
+        return deliver_concurrently(jobs, deliver)
+    finally:
+        _drain_lock.release()
+
 
 def execute_webhook(
     webhook: DiscordWebhook,
@@ -1986,22 +2776,15 @@ def execute_webhook(
         save_sent_webhook: Whether to save the sent Discord message metadata for future edits.
     """
     # If the feed has been paused or deleted, we will not send the entry to Discord.
-    entry_feed: Feed = entry.feed
-    if entry_feed.updates_enabled is False:
-        logger.warning("Feed is paused, not sending entry to Discord: %s", entry_feed.url)
-        return
-
-    try:
-        reader.get_feed(entry_feed.url)
-    except FeedNotFoundError:
-        logger.warning("Feed not found in reader, not sending entry to Discord: %s", entry_feed.url)
+    if not entry_feed_accepts_deliveries(entry, reader):
         return
 
     # Let enabled extensions modify the webhook before it is sent.
     webhook = run_modify_webhook(webhook, entry, reader)
 
-    request_payload: JsonObject = get_webhook_request_payload(webhook)
-    payload: JsonObject = get_webhook_message_payload(webhook)
+    payloads: WebhookPayloads = get_webhook_payloads(webhook)
+    request_payload: JsonObject = payloads.request
+    payload: JsonObject = payloads.message
     response: Response = send_webhook_message(webhook, request_payload)
     logger.debug("Discord webhook response for entry %s: status=%s", entry.id, response.status_code)
     if response.status_code not in {200, 204}:
@@ -2010,12 +2793,35 @@ def execute_webhook(
             msg += f"\n{entry}"
 
         logger.error(msg)
+        # Keep the rendered message so it can be replayed from /failed_deliveries. Messages that are not
+        # tracked for edits get their own id, so replaying them does not overwrite the entry's sent record.
+        get_outbox().add_dead_letter(
+            feed_url=entry.feed.url,
+            entry_id=entry.id if save_sent_webhook else f"notification:{entry.id}",
+            webhook_url=webhook.url,
+            delivery_mode="manual",
+            request_payload=request_payload,
+            message_payload=payload,
+            error=f"{response.status_code}: {response.text[:1000]}",
+            status_code=response.status_code,
+            response_body=response.text,
+            thread_id=webhook.thread_id,
+            files=webhook.files,
+        )
     else:
         logger.info("Sent entry to Discord: %s", entry.id)
         if save_sent_webhook:
             webhook_url: str = get_webhook_url(reader, entry)
             if webhook_url:
-                upsert_sent_webhook_record(reader, entry, webhook_url, webhook, response, payload)
+                upsert_sent_webhook_record(
+                    reader,
+                    entry,
+                    webhook_url,
+                    webhook,
+                    response,
+                    payload,
+                    payload_hash=payloads.message_hash,
+                )
 
 
 def truncate_webhook_message(
@@ -43,6 +43,7 @@ type TagValue = JsonValue
 # Tags that are exported per-feed (empty values are omitted).
 _FEED_TAGS: tuple[str, ...] = (
     "webhook",
+    "extra_webhooks",
     "custom_message",
     "message_username",
     "message_avatar_url",
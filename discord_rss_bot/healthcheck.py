@@ -5,6 +5,26 @@ import sys
 import requests
 
 
+def report_discord_circuit(response: requests.Response) -> None:
+    """Print a warning when the bot has paused all Discord traffic.
+
+    The bot is still healthy while paused, so this only reports the state.
+    """
+    try:
+        health = response.json()
+    except ValueError:
+        return
+    if not isinstance(health, dict):
+        return
+
+    circuit = health.get("discord_circuit")
+    if isinstance(circuit, dict) and circuit.get("state") == "open":
+        print(  # ruff:ignore[print]
+            f"Discord traffic is paused: {circuit.get('reason')} (resuming in {circuit.get('retry_in')}s)",
+            file=sys.stderr,
+        )
+
+
 def healthcheck() -> None:
     """Check if the website is up.
 
@@ -13,8 +33,9 @@ def healthcheck() -> None:
     """
     # TODO(TheLovinator): We should check more than just that the website is up.
     try:
-        r: requests.Response = requests.get(url="http://localhost:5000", timeout=5)
+        r: requests.Response = requests.get(url="http://localhost:5000/healthz", timeout=5)
         if r.ok:
+            report_discord_circuit(r)
             sys.exit(0)
         sys.exit(1)
     except requests.exceptions.RequestException as e:
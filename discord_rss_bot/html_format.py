@@ -2,19 +2,50 @@
 
 Converts entry HTML to Discord-friendly markdown while preserving
 Discord timestamp tags (``<t:12345:R>``).
+
+The same entry body is converted again for every send, edit check, feed
+page view and filter preview, so conversions are kept in a bounded LRU
+cache keyed by a hash of the HTML. Tune its size with
+``HTML_MARKDOWN_CACHE_SIZE`` (default 1024 conversions).
 """
 
 from __future__ import annotations
 
+import hashlib
 import html
 import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from bs4 import BeautifulSoup
+from lxml.etree import HTMLPullParser
+from markdownify import MarkdownConverter
+
+from discord_rss_bot.settings import env_int
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
 
-from markdownify import markdownify
+DEFAULT_MARKDOWN_CACHE_SIZE: int = 1024
+
+# How much HTML the image extractor parses before checking whether it has found enough images.
+IMAGE_PARSE_CHUNK_SIZE: int = 4096
 
 DISCORD_TIMESTAMP_TAG_RE: re.Pattern[str] = re.compile(r"<t:\d+(?::[tTdDfFrRsS])?>")
 
 _REDUNDANT_LINK_PREFIX_RE: re.Pattern[str] = re.compile(r"\[https://(www\.)?")
 
+_MARKDOWN_CONVERTER: MarkdownConverter = MarkdownConverter(
+    strip=["img", "table", "td", "tr", "tbody", "thead"],
+    escape_misc=False,
+    heading_style="ATX",
+)
+
 
 def _preserve_discord_timestamp_tags(text: str) -> tuple[str, dict[str, str]]:
     """Replace Discord timestamp tags with placeholders before markdown conversion.
@@ -51,27 +82,169 @@ def _restore_discord_timestamp_tags(text: str, replacements: dict[str, str]) ->
     return text
 
 
+@dataclass(frozen=True, slots=True)
+class MarkdownCacheStats:
+    """How well the HTML to markdown cache is doing."""
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of conversions that were served from the cache."""
+        total: int = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Return the counters as a plain dict for templates and logs."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": self.size,
+            "max_size": self.max_size,
+            "hit_ratio": round(self.hit_ratio, 3),
+        }
+
+
+class MarkdownCache:
+    """Bounded LRU cache of HTML converted to markdown, keyed by a SHA-256 hash of the HTML.
+
+    Keying by hash keeps the cache from holding on to the HTML of every cached entry. It is shared between the
+    render threads; two threads that miss on the same HTML at once both convert it.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MARKDOWN_CACHE_SIZE) -> None:  # ruff:ignore[undocumented-public-init]
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._conversions: OrderedDict[bytes, str] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get_or_convert(self, text: str, convert: Callable[[str], str]) -> str:
+        """Return the cached conversion of *text*, converting it with *convert* on a miss.
+
+        Returns:
+            str: The converted text.
+        """
+        key: bytes = hashlib.sha256(text.encode()).digest()
+        with self._lock:
+            converted: str | None = self._conversions.get(key)
+            if converted is not None:
+                self._conversions.move_to_end(key)
+                self.hits += 1
+                return converted
+            self.misses += 1
+
+        converted = convert(text)
+        with self._lock:
+            self._conversions[key] = converted
+            self._conversions.move_to_end(key)
+            while len(self._conversions) > self.max_size:
+                self._conversions.popitem(last=False)
+        return converted
+
+    def get_stats(self) -> MarkdownCacheStats:
+        """Return the hit and miss counters and how full the cache is."""
+        with self._lock:
+            return MarkdownCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                size=len(self._conversions),
+                max_size=self.max_size,
+            )
+
+    def clear(self) -> None:
+        """Forget every conversion and reset the counters."""
+        with self._lock:
+            self._conversions.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+@lru_cache(maxsize=1)
+def get_markdown_cache() -> MarkdownCache:
+    """Get the HTML to markdown cache shared by every render.
+
+    Returns:
+        MarkdownCache: The cache, sized by ``HTML_MARKDOWN_CACHE_SIZE``.
+    """
+    return MarkdownCache(env_int("HTML_MARKDOWN_CACHE_SIZE", DEFAULT_MARKDOWN_CACHE_SIZE))
+
+
+class ParsedHtml:
+    """One piece of entry HTML, read at most once for markdown and at most once for images.
+
+    Markdown conversion parses the HTML into a BeautifulSoup tree, and a markdown cache hit skips parsing
+    altogether. Images do not use that tree: they are found by streaming the HTML through lxml's pull parser
+    until the caller has seen enough of them, which is faster than walking the tree even when it exists.
+    """
+
+    def __init__(self, text: str) -> None:  # ruff:ignore[undocumented-public-init]
+        self.text: str = text
+        self._image_sources: list[str | None] = []
+
+    @cached_property
+    def _prepared(self) -> tuple[str, dict[str, str]]:
+        """The unescaped HTML with Discord timestamp tags swapped for placeholders, and the swapped tags."""
+        return _preserve_discord_timestamp_tags(html.unescape(self.text))
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        """The parsed HTML."""
+        return BeautifulSoup(self._prepared[0], features="lxml")
+
+    @property
+    def markdown(self) -> str:
+        """The HTML as Discord-friendly markdown, with Discord timestamp tags preserved."""
+        if not self.text:
+            return ""
+        return get_markdown_cache().get_or_convert(self.text, self._convert)
+
+    def iter_image_sources(self) -> Iterator[str | None]:
+        """Yield the ``src`` of every ``<img>`` in document order, or None for an image without one.
+
+        The HTML is only read as far as the caller iterates, and images found by an earlier call are not looked
+        for again.
+        """
+        yield from tuple(self._image_sources)
+        for source in self._image_stream:
+            self._image_sources.append(source)
+            yield source
+
+    @cached_property
+    def _image_stream(self) -> Iterator[str | None]:
+        return self._stream_image_sources()
+
+    def _stream_image_sources(self) -> Iterator[str | None]:
+        # The entry's own HTML, not the markdown input: lxml decodes entities in attributes once, and the
+        # timestamp placeholders are never restored in sources.
+        text: str = self.text
+        parser: HTMLPullParser = HTMLPullParser(events=("start",), tag="img")
+        for offset in range(0, len(text), IMAGE_PARSE_CHUNK_SIZE):
+            parser.feed(text[offset : offset + IMAGE_PARSE_CHUNK_SIZE])
+            for _event, image in parser.read_events():
+                yield image.get("src")
+        parser.close()
+        for _event, image in parser.read_events():
+            yield image.get("src")
+
+    def _convert(self, _text: str) -> str:
+        formatted_text: str = _MARKDOWN_CONVERTER.convert_soup(self.soup)
+        formatted_text = _REDUNDANT_LINK_PREFIX_RE.sub("[", formatted_text)
+        return _restore_discord_timestamp_tags(formatted_text, self._prepared[1])
+
+
 def format_entry_html_for_discord(text: str) -> str:
     """Convert entry HTML to Discord-friendly markdown while preserving Discord timestamp tags.
 
+    Conversions are cached, so converting the same HTML again is a hash and a lookup.
+
     Args:
         text: The HTML text to format.
 
     Returns:
         The formatted text with Discord timestamp tags preserved.
     """
-    if not text:
-        return ""
-
-    unescaped_text: str = html.unescape(text)
-    protected_text, replacements = _preserve_discord_timestamp_tags(unescaped_text)
-    formatted_text: str = markdownify(
-        html=protected_text,
-        strip=["img", "table", "td", "tr", "tbody", "thead"],
-        escape_misc=False,
-        heading_style="ATX",
-    )
-
-    formatted_text = _REDUNDANT_LINK_PREFIX_RE.sub("[", formatted_text)
-
-    return _restore_discord_timestamp_tags(formatted_text, replacements)
+    return ParsedHtml(text).markdown
@@ -0,0 +1,230 @@
+"""Process-wide pooled HTTP client for Discord webhook traffic.
+
+Every webhook send and edit goes through one ``httpx2.Client`` so repeated
+requests to discord.com reuse keep-alive connections instead of paying a new
+TCP and TLS handshake per message.
+
+The client is opened in ``main.lifespan`` and closed on shutdown. Code that
+runs outside the web app (tests, scripts) gets a lazily created client.
+
+Configure the pool with these environment variables:
+
+- ``DISCORD_HTTP2``: Set to ``1``/``true`` to negotiate HTTP/2 when the
+  optional ``h2`` package is installed.
+- ``DISCORD_HTTP_MAX_CONNECTIONS``: Maximum open connections (default 20).
+- ``DISCORD_HTTP_MAX_KEEPALIVE_CONNECTIONS``: Idle connections kept open (default 10).
+- ``DISCORD_HTTP_KEEPALIVE_EXPIRY``: Seconds an idle connection is kept (default 30).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+from typing import Any
+
+import httpx2
+
+from discord_rss_bot.settings import env_bool
+from discord_rss_bot.settings import env_float
+from discord_rss_bot.settings import env_int
+
+if TYPE_CHECKING:
+    from httpx2 import Response
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS: int = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS: int = 10
+DEFAULT_KEEPALIVE_EXPIRY: float = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class DiscordHttpConfig:
+    """Connection pool settings for the Discord HTTP client."""
+
+    http2: bool = False
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+
+    @classmethod
+    def from_env(cls) -> DiscordHttpConfig:
+        """Build the pool settings from environment variables.
+
+        HTTP/2 is only enabled when requested and the ``h2`` package is installed.
+
+        Returns:
+            The resolved configuration.
+        """
+        http2: bool = env_bool("DISCORD_HTTP2")
+        if http2 and find_spec("h2") is None:
+            logger.warning("DISCORD_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1.")
+            http2 = False
+
+        max_connections: int = env_int("DISCORD_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+        return cls(
+            http2=http2,
+            max_connections=max_connections,
+            max_keepalive_connections=min(
+                env_int("DISCORD_HTTP_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS),
+                max_connections,
+            ),
+            keepalive_expiry=env_float("DISCORD_HTTP_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY),
+        )
+
+
+@dataclass(slots=True)
+class DiscordHttpStats:
+    """Counters describing how well the connection pool is being reused."""
+
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    errors: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests that were sent on an already-open connection."""
+        total: int = self.new_connections + self.reused_connections
+        return self.reused_connections / total if total else 0.0
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Return the counters as a plain dict for templates and logs."""
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "errors": self.errors,
+            "reuse_ratio": round(self.reuse_ratio, 3),
+        }
+
+
+class DiscordHttpClient:
+    """Thread-safe wrapper around a pooled ``httpx2.Client`` that counts connection reuse."""
+
+    def __init__(  # ruff:ignore[undocumented-public-init]
+        self,
+        config: DiscordHttpConfig | None = None,
+        *,
+        transport: httpx2.BaseTransport | None = None,
+    ) -> None:
+        self.config: DiscordHttpConfig = config or DiscordHttpConfig.from_env()
+        self._stats: DiscordHttpStats = DiscordHttpStats()
+        self._lock: threading.Lock = threading.Lock()
+        self._client: httpx2.Client = httpx2.Client(
+            http2=self.config.http2,
+            limits=httpx2.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry,
+            ),
+            transport=transport,
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Response:  # ruff:ignore[any-type]
+        """Send a request on the shared pool and record whether a connection was reused.
+
+        Returns:
+            The HTTP response.
+
+        Raises:
+            httpx2.HTTPError: If the request fails at the transport level.
+        """
+        opened_connection: list[bool] = [False]
+
+        def trace(event_name: str, _info: dict[str, Any]) -> None:
+            if event_name.endswith(("connect_tcp.started", "connect_unix_socket.started")):
+                opened_connection[0] = True
+
+        extensions: dict[str, Any] = dict(kwargs.pop("extensions", None) or {})
+        extensions.setdefault("trace", trace)
+
+        try:
+            response: Response = self._client.request(method, url, extensions=extensions, **kwargs)
+        except httpx2.HTTPError:
+            with self._lock:
+                self._stats.requests += 1
+                self._stats.errors += 1
+            raise
+
+        with self._lock:
+            self._stats.requests += 1
+            if opened_connection[0]:
+                self._stats.new_connections += 1
+            else:
+                self._stats.reused_connections += 1
+        return response
+
+    def stats(self) -> DiscordHttpStats:
+        """Return a snapshot of the connection counters."""
+        with self._lock:
+            return DiscordHttpStats(
+                requests=self._stats.requests,
+                new_connections=self._stats.new_connections,
+                reused_connections=self._stats.reused_connections,
+                errors=self._stats.errors,
+            )
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_client_lock: threading.Lock = threading.Lock()
+_client: DiscordHttpClient | None = None
+
+
+def open_discord_http_client(config: DiscordHttpConfig | None = None) -> DiscordHttpClient:
+    """Create the process-wide Discord HTTP client, replacing a closed one.
+
+    Returns:
+        The open shared client.
+    """
+    global _client  # ruff:ignore[global-statement]
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = DiscordHttpClient(config)
+            logger.info(
+                "Opened Discord HTTP client (http2=%s, max_connections=%d, max_keepalive=%d)",
+                _client.config.http2,
+                _client.config.max_connections,
+                _client.config.max_keepalive_connections,
+            )
+        return _client
+
+
+def get_discord_http_client() -> DiscordHttpClient:
+    """Return the shared Discord HTTP client, opening it on first use.
+
+    Returns:
+        The open shared client.
+    """
+    client: DiscordHttpClient | None = _client
+    if client is not None and not client.is_closed:
+        return client
+    return open_discord_http_client()
+
+
+def close_discord_http_client() -> None:
+    """Close the process-wide Discord HTTP client and log its final counters."""
+    global _client  # ruff:ignore[global-statement]
+    with _client_lock:
+        if _client is None:
+            return
+        logger.info("Closing Discord HTTP client: %s", _client.stats().as_dict())
+        _client.close()
+        _client = None
+
+
+def get_discord_http_stats() -> DiscordHttpStats:
+    """Return connection counters for the shared client (zeros when it is not open)."""
+    client: DiscordHttpClient | None = _client
+    if client is None:
+        return DiscordHttpStats()
+    return client.stats()
@@ -12,7 +12,9 @@ import urllib.parse
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import UTC
+from datetime import date
 from datetime import datetime
+from datetime import timedelta
 from functools import lru_cache
 from html import escape
 from html import unescape
@@ -51,6 +53,7 @@ from reader import TagNotFoundError
 from reader import opml
 from starlette.responses import RedirectResponse
 from starlette.responses import Response as StarletteResponse
+from starlette.responses import StreamingResponse
 
 from discord_rss_bot.custom_message import CustomEmbed
 from discord_rss_bot.custom_message import get_custom_message
@@ -58,8 +61,13 @@ from discord_rss_bot.custom_message import get_embed
 from discord_rss_bot.custom_message import get_first_image
 from discord_rss_bot.custom_message import get_message_avatar_url
 from discord_rss_bot.custom_message import get_message_username
-from discord_rss_bot.custom_message import replace_tags_in_text_message
 from discord_rss_bot.custom_message import save_embed
+from discord_rss_bot.digest import MAX_DIGEST_MAX_ENTRIES
+from discord_rss_bot.digest import get_digest_buffer
+from discord_rss_bot.digest import get_digest_settings
+from discord_rss_bot.entry_cards import EntryCard
+from discord_rss_bot.entry_cards import FeedTagVersions
+from discord_rss_bot.entry_cards import get_entry_card
 from discord_rss_bot.extensions import FeedExtension as FeedExtensionABC
 from discord_rss_bot.extensions import get_registry as get_extension_registry
 from discord_rss_bot.extensions import run_extensions
@@ -69,20 +77,24 @@ from discord_rss_bot.extensions.storage import set_enabled_extensions_for_feed a
 from discord_rss_bot.extensions.youtube import extract_youtube_video_id
 from discord_rss_bot.extensions.youtube import is_youtube_feed_url
 from discord_rss_bot.feeds import FeedUpdateError
+from discord_rss_bot.feeds import JsonObject
 from discord_rss_bot.feeds import JsonValue
-from discord_rss_bot.feeds import SentWebhookRecord
 from discord_rss_bot.feeds import coerce_media_gallery_image_limit
 from discord_rss_bot.feeds import coerce_webhook_text_length_limit
 from discord_rss_bot.feeds import create_feed
+from discord_rss_bot.feeds import drain_outbox
 from discord_rss_bot.feeds import extract_domain
+from discord_rss_bot.feeds import feed_packs_embeds
 from discord_rss_bot.feeds import feed_saves_sent_webhooks
+from discord_rss_bot.feeds import get_extra_webhook_targets
 from discord_rss_bot.feeds import get_feed_delivery_mode
 from discord_rss_bot.feeds import get_feed_display_name
 from discord_rss_bot.feeds import get_feed_media_gallery_image_limit
 from discord_rss_bot.feeds import get_feed_webhook_text_length_limit
 from discord_rss_bot.feeds import get_screenshot_layout
-from discord_rss_bot.feeds import get_sent_webhook_records
 from discord_rss_bot.feeds import is_chromium_installed
+from discord_rss_bot.feeds import migrate_sent_webhooks_tag
+from discord_rss_bot.feeds import send_deferred_edits
 from discord_rss_bot.feeds import send_entry_to_discord
 from discord_rss_bot.feeds import send_to_discord
 from discord_rss_bot.feeds import update_feed_and_collect_modified_entries
@@ -91,8 +103,6 @@ from discord_rss_bot.filter.evaluator import FILTER_FIELDS
 from discord_rss_bot.filter.evaluator import EntryFilterDecision
 from discord_rss_bot.filter.evaluator import FilterMatch
 from discord_rss_bot.filter.evaluator import coerce_filter_values
-from discord_rss_bot.filter.evaluator import entry_is_blacklisted
-from discord_rss_bot.filter.evaluator import entry_is_whitelisted
 from discord_rss_bot.filter.evaluator import evaluate_entry_filters
 from discord_rss_bot.filter.evaluator import get_entry_decision_key
 from discord_rss_bot.filter.evaluator import get_entry_fields
@@ -100,8 +110,19 @@ from discord_rss_bot.filter.evaluator import get_filter_values_from_reader
 from discord_rss_bot.filter.evaluator import has_filter_values
 from discord_rss_bot.git_backup import commit_state_change
 from discord_rss_bot.git_backup import get_backup_path
+from discord_rss_bot.html_format import get_markdown_cache
+from discord_rss_bot.http_client import close_discord_http_client
+from discord_rss_bot.http_client import get_discord_http_stats
+from discord_rss_bot.http_client import open_discord_http_client
 from discord_rss_bot.is_url_valid import is_url_valid
+from discord_rss_bot.outbox import get_outbox
+from discord_rss_bot.rate_limits import get_rate_limit_manager
 from discord_rss_bot.search import create_search_context
+from discord_rss_bot.sent_webhooks import SENT_WEBHOOK_STATUSES
+from discord_rss_bot.sent_webhooks import RetentionPolicy
+from discord_rss_bot.sent_webhooks import SentWebhookFilter
+from discord_rss_bot.sent_webhooks import compact_sent_webhook_history
+from discord_rss_bot.sent_webhooks import get_sent_webhook_store
 from discord_rss_bot.settings import data_dir
 from discord_rss_bot.settings import default_custom_embed
 from discord_rss_bot.settings import default_custom_message
@@ -112,9 +133,14 @@ from discord_rss_bot.settings import make_app_reader
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
     from collections.abc import Iterable
+    from collections.abc import Iterator
 
     from reader.types import JSONType
 
+    from discord_rss_bot.outbox import Outbox
+    from discord_rss_bot.sent_webhooks import SentWebhookPage
+    from discord_rss_bot.sent_webhooks import SentWebhookStore
+
 
 class PreviewFieldRow(TypedDict):
     label: str
@@ -264,6 +290,11 @@ def relative_time(dt: datetime | None) -> str:
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     """Lifespan function for the FastAPI app."""
     reader: Reader = get_reader()
+    migrate_sent_webhooks_tag(reader)
+
+    # Share one pooled connection to Discord between all webhook sends and edits.
+    open_discord_http_client()
+
     scheduler: AsyncIOScheduler = AsyncIOScheduler(timezone=UTC)
     scheduler.add_job(
         func=send_to_discord,
@@ -273,6 +304,31 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
         max_instances=1,
         next_run_time=datetime.now(tz=UTC),
     )
+    # Retry queued deliveries between feed checks. Rate-limited messages are requeued with Discord's
+    # retry deadline (usually a few seconds), so drain often enough to pick them up promptly.
+    scheduler.add_job(
+        func=drain_outbox,
+        trigger="interval",
+        seconds=10,
+        id="drain_outbox",
+        max_instances=1,
+    )
+    # Send message edits that were held back because the message was edited too recently or too often.
+    scheduler.add_job(
+        func=send_deferred_edits,
+        trigger="interval",
+        minutes=1,
+        id="send_deferred_edits",
+        max_instances=1,
+    )
+    scheduler.add_job(
+        func=compact_sent_webhook_history,
+        trigger="interval",
+        hours=1,
+        id="compact_sent_webhook_history",
+        max_instances=1,
+        next_run_time=datetime.now(tz=UTC),
+    )
     scheduler.start()
     logger.info("Scheduler started.")
 
@@ -281,6 +337,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     finally:
         reader.close()
         scheduler.shutdown(wait=True)
+        close_discord_http_client()
 
 
 app: FastAPI = FastAPI(lifespan=lifespan)
@@ -296,6 +353,9 @@ templates.env.filters["feed_display_name"] = get_feed_display_name
 templates.env.globals["get_backup_path"] = get_backup_path  # pyright: ignore[reportArgumentType]
 templates.env.globals["has_webhooks"] = has_webhooks  # pyright: ignore[reportArgumentType]
 
+# Stands in for the entry cards when a page is rendered around them; see stream_page_with_entry_cards.
+ENTRY_CARDS_MARKER: str = "<!-- entry cards -->"
+
 
 @app.get("/export_opml")
 def export_opml(
@@ -1772,6 +1832,64 @@ async def post_use_screenshot_desktop(
     return RedirectResponse(url=f"/feed?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
 
 
+@app.post("/use_digest")
+async def post_use_digest(
+    feed_url: Annotated[str, Form()],
+    reader: Annotated[Reader, Depends(get_reader_dependency)],
+) -> RedirectResponse:
+    """Collect new entries into a periodic digest message instead of sending each one.
+
+    Args:
+        feed_url: The feed to change.
+        reader: The Reader instance.
+
+    Returns:
+        RedirectResponse: Redirect to the feed page.
+    """
+    clean_feed_url: str = feed_url.strip()
+    reader.set_tag(clean_feed_url, "delivery_mode", "digest")  # pyright: ignore[reportArgumentType]
+    reader.set_tag(clean_feed_url, "should_send_embed", False)  # pyright: ignore[reportArgumentType]
+    commit_state_change(reader, f"Enable digest mode for {clean_feed_url}")
+    return RedirectResponse(url=f"/feed?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+
+
+@app.post("/set_feed_digest_settings")
+async def post_set_feed_digest_settings(
+    feed_url: Annotated[str, Form()],
+    interval: Annotated[int, Form()],
+    max_entries: Annotated[int, Form()],
+    reader: Annotated[Reader, Depends(get_reader_dependency)],
+    entry_template: Annotated[str, Form()] = "",
+    message_template: Annotated[str, Form()] = "",
+) -> RedirectResponse:
+    """Set how often a feed's digest is sent and what it looks like.
+
+    Empty templates reset to the default templates.
+
+    Returns:
+        RedirectResponse: Redirect to the specified feed page.
+
+    Raises:
+        HTTPException: If Feed does not exists.
+    """
+    clean_feed_url: str = feed_url.strip()
+    try:
+        reader.get_feed(clean_feed_url)
+    except FeedNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Feed not found") from e
+
+    reader.set_tag(clean_feed_url, "digest_interval", max(interval, 1))  # pyright: ignore[reportArgumentType]
+    clamped_max_entries: int = min(max(max_entries, 1), MAX_DIGEST_MAX_ENTRIES)
+    reader.set_tag(clean_feed_url, "digest_max_entries", clamped_max_entries)  # pyright: ignore[reportArgumentType]
+    for key, value in (("digest_entry_template", entry_template), ("digest_message", message_template)):
+        if value.strip():
+            reader.set_tag(clean_feed_url, key, value)  # pyright: ignore[reportArgumentType]
+        else:
+            reader.delete_tag(clean_feed_url, key, missing_ok=True)
+    commit_state_change(reader, f"Update digest settings for {clean_feed_url}")
+    return RedirectResponse(url=f"/feed?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+
+
 @app.post("/set_feed_save_sent_webhooks")
 async def post_set_feed_save_sent_webhooks(
     feed_url: Annotated[str, Form()],
@@ -1800,6 +1918,34 @@ async def post_set_feed_save_sent_webhooks(
     return RedirectResponse(url=f"/feed?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
 
 
+@app.post("/set_feed_pack_embeds")
+async def post_set_feed_pack_embeds(
+    feed_url: Annotated[str, Form()],
+    enabled: Annotated[str, Form()],
+    reader: Annotated[Reader, Depends(get_reader_dependency)],
+) -> RedirectResponse:
+    """Set whether consecutive embed messages for a feed are packed into one Discord message.
+
+    Returns:
+        RedirectResponse: Redirect to the specified feed page.
+
+    Raises:
+        HTTPException: If Feed does not exists.
+    """
+    clean_feed_url: str = feed_url.strip()
+    should_pack: bool = enabled.strip().lower() in {"1", "true", "yes", "on", "enabled"}
+
+    try:
+        reader.get_feed(clean_feed_url)
+    except FeedNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Feed not found") from e
+
+    reader.set_tag(clean_feed_url, "pack_embeds", should_pack)  # pyright: ignore[reportArgumentType]
+    action: str = "Enable" if should_pack else "Disable"
+    commit_state_change(reader, f"{action} embed packing for {clean_feed_url}")
+    return RedirectResponse(url=f"/feed?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+
+
 @app.post("/set_feed_media_gallery_image_limit")
 async def post_set_feed_media_gallery_image_limit(
     feed_url: Annotated[str, Form()],
@@ -2128,7 +2274,7 @@ async def get_feed(  # ruff:ignore[complex-structure, too-many-branches, too-man
         reader: The Reader instance.
 
     Returns:
-        HTMLResponse: The feed page.
+        HTMLResponse: The feed page, streamed as the entries are rendered.
 
     Raises:
         HTTPException: If the feed is not found.
@@ -2144,6 +2290,7 @@ async def get_feed(  # ruff:ignore[complex-structure, too-many-branches, too-man
 
     webhooks: list[dict[str, str]] = cast("list[dict[str, str]]", list(reader.get_tag((), "webhooks", [])))
     current_webhook_url: str = str(reader.get_tag(feed.url, "webhook", "")).strip()
+    webhook_names: dict[str, str] = {hook.get("url", "").strip(): hook.get("name", "").strip() for hook in webhooks}
     current_webhook_name: str = ""
     for hook in webhooks:
         if hook.get("url", "").strip() == current_webhook_url:
@@ -2228,8 +2375,8 @@ async def get_feed(  # ruff:ignore[complex-structure, too-many-branches, too-man
     if entries:
         last_entry = entries[-1]
 
-    # Create the html for the entries.
-    html: str = create_html_for_feed(reader=reader, entries=entries, current_feed_url=clean_feed_url)
+    # The entry cards are rendered while the page streams.
+    cards: Iterator[str] = iter_entry_cards_html(reader=reader, entries=entries, current_feed_url=clean_feed_url)
 
     delivery_mode: str = get_feed_delivery_mode(reader, feed)
     should_send_embed: bool = delivery_mode == "embed"
@@ -2256,7 +2403,6 @@ async def get_feed(  # ruff:ignore[complex-structure, too-many-branches, too-man
         "feed": feed,
         "entries": entries,
         "feed_counts": reader.get_feed_counts(feed=clean_feed_url),
-        "html": html,
         "should_send_embed": should_send_embed,
         "delivery_mode": delivery_mode,
         "screenshot_layout": screenshot_layout,
@@ -2275,12 +2421,24 @@ async def get_feed(  # ruff:ignore[complex-structure, too-many-branches, too-man
         "webhook_text_length_limit": get_feed_webhook_text_length_limit(reader, feed),
         "max_webhook_text_length_limit": 4000,
         "save_sent_webhooks": feed_saves_sent_webhooks(reader, feed),
+        "pack_embeds": feed_packs_embeds(reader, feed),
+        "extra_webhooks": [
+            {
+                "url": target.url,
+                "name": webhook_names.get(target.url, "Unsaved webhook"),
+                "username": target.username,
+            }
+            for target in get_extra_webhook_targets(reader, feed)
+        ],
+        "digest_settings": get_digest_settings(reader, feed),
+        "digest_pending": get_digest_buffer().count(feed.url),
+        "max_digest_entries": MAX_DIGEST_MAX_ENTRIES,
         "chromium_installed": is_chromium_installed(),
     }
-    return templates.TemplateResponse(request=request, name="feed.html", context=context)
+    return stream_page_with_entry_cards(request, "feed.html", context, cards)
 
 
-def create_html_for_feed(  # ruff:ignore[complex-structure, too-many-locals]
+def create_html_for_feed(
     reader: Reader,
     entries: Iterable[Entry],
     current_feed_url: str = "",
@@ -2297,20 +2455,35 @@ def create_html_for_feed(  # ruff:ignore[complex-structure, too-many-locals]
     Returns:
         str: The HTML for the search results.
     """
-    html: str = ""
-    for entry in entries:
-        first_image: str = ""
-        summary: str | None = entry.summary
-        content = ""
-        if entry.content:
-            for content_item in entry.content:
-                content: str = content_item.value
+    return "".join(iter_entry_cards_html(reader, entries, current_feed_url, entry_decisions))
 
-        first_image = get_first_image(summary, content)
 
-        text: str = replace_tags_in_text_message(entry, reader=reader) or (
-            "<div class='text-muted'>No content available.</div>"
-        )
+def iter_entry_cards_html(  # ruff:ignore[complex-structure, too-many-locals]
+    reader: Reader,
+    entries: Iterable[Entry],
+    current_feed_url: str = "",
+    entry_decisions: dict[str, EntryFilterDecision] | None = None,
+) -> Iterator[str]:
+    """Yield the HTML of each entry's card as it is rendered, separated by newlines.
+
+    Args:
+        reader: The Reader instance to use.
+        entries: The entries to create HTML for.
+        current_feed_url: The feed URL currently being viewed in /feed.
+        entry_decisions: Optional preview decisions keyed by feed URL and entry id.
+
+    Yields:
+        str: The HTML of one card.
+    """
+    separator: str = ""
+    feed_versions: dict[str, FeedTagVersions] = {}
+    for entry in entries:
+        if entry.feed.url not in feed_versions:
+            feed_versions[entry.feed.url] = FeedTagVersions.from_reader(reader, entry.feed)
+        card: EntryCard = get_entry_card(entry, reader, feed_versions[entry.feed.url])
+
+        first_image: str = card.first_image
+        text: str = card.text or "<div class='text-muted'>No content available.</div>"
         published = ""
         if entry.published:
             published: str = entry.published.strftime("%Y-%m-%d %H:%M:%S")
@@ -2319,8 +2492,8 @@ def create_html_for_feed(  # ruff:ignore[complex-structure, too-many-locals]
         if entry_decisions is not None:
             decision = entry_decisions.get(get_entry_decision_key(entry))
 
-        is_blacklisted: bool = entry_is_blacklisted(entry, reader=reader)
-        is_whitelisted: bool = entry_is_whitelisted(entry, reader=reader)
+        is_blacklisted: bool = card.is_blacklisted
+        is_whitelisted: bool = card.is_whitelisted
         if decision is not None:
             is_blacklisted = decision.blacklist_match is not None
             is_whitelisted = decision.whitelist_match is not None
@@ -2377,16 +2550,50 @@ def create_html_for_feed(  # ruff:ignore[complex-structure, too-many-locals]
 
         image_html: str = f"<img src='{first_image}' class='img-fluid'>" if first_image else ""
 
-        html += f"""<div class="p-2 mb-2 border border-dark">
+        yield f"""{separator}<div class="p-2 mb-2 border border-dark">
 {blacklisted}{whitelisted}{from_another_feed}<a class="text-muted text-decoration-none" href="{entry.link}"><h2>{entry.title}</h2></a>
 {feed_link}{f"By {entry.authors_str} @" if entry.authors_str else ""}{published} - {to_discord_html}
 
 {text}
 {video_embed_html}
 {image_html}
-</div>
-"""  # ruff:ignore[line-too-long]
-    return html.strip()
+</div>"""  # ruff:ignore[line-too-long]
+        separator = "\n"
+
+
+def stream_page_with_entry_cards(
+    request: Request,
+    name: str,
+    context: dict[str, object],
+    cards: Iterable[str],
+) -> StreamingResponse:
+    """Stream a page whose template shows the entry cards with ``{{ html|safe }}``.
+
+    The page around the cards is rendered first and sent before the first card is rendered, so the time to the
+    first byte does not grow with the number or size of the entries.
+
+    Args:
+        request: The request object.
+        name: The template to render.
+        context: The template context, without ``html``.
+        cards: The HTML of the entry cards, rendered lazily, e.g. from ``iter_entry_cards_html``.
+
+    Returns:
+        StreamingResponse: The page.
+    """
+    page: str = templates.get_template(name).render({**context, "request": request, "html": ENTRY_CARDS_MARKER})
+    head, _, tail = page.partition(ENTRY_CARDS_MARKER)
+
+    def iter_page() -> Iterator[str]:
+        yield head
+        try:
+            yield from cards
+        except Exception:
+            logger.exception("Failed to render the entries of %s", request.url)
+            yield "<div class='text-danger'>Failed to render the rest of the entries, see the logs.</div>"
+        yield tail
+
+    return StreamingResponse(iter_page(), media_type="text/html")
 
 
 @app.get("/add_webhook", response_class=HTMLResponse)
@@ -2518,6 +2725,15 @@ async def get_settings(
         "max_webhook_text_length_limit": 4000,
         "feed_intervals": feed_intervals,
         "chromium_installed": is_chromium_installed(),
+        "discord_http_stats": get_discord_http_stats().as_dict(),
+        "discord_rate_limit_buckets": get_rate_limit_manager().snapshot(),
+        "discord_rate_limit_stats": get_rate_limit_manager().stats().as_dict(),
+        "discord_circuit": get_rate_limit_manager().breaker.snapshot(),
+        "outbox_count": get_outbox().count(),
+        "failed_delivery_count": get_outbox().count_dead_letters(),
+        "sent_webhook_storage": get_sent_webhook_store().get_storage_stats(),
+        "markdown_cache_stats": get_markdown_cache().get_stats().as_dict(),
+        "sent_webhook_retention": RetentionPolicy.from_env(),
         "messages": message or None,
     }
     return templates.TemplateResponse(request=request, name="settings.html", context=context)
@@ -2552,31 +2768,139 @@ async def get_webhooks(
     return templates.TemplateResponse(request=request, name="webhooks.html", context=context)
 
 
+SENT_WEBHOOKS_PAGE_SIZE: int = 50
+
+
+def _parse_date_filter(value: str, *, days: int = 0) -> str:
+    """Return a ``YYYY-MM-DD`` filter value moved by *days*, or an empty string if it is not a date.
+
+    Returns:
+        str: The date in ISO 8601 format.
+    """
+    try:
+        return (date.fromisoformat(value.strip()) + timedelta(days=days)).isoformat()
+    except ValueError:
+        return ""
+
+
 @app.get("/sent_webhooks", response_class=HTMLResponse)
 async def get_sent_webhooks(
     request: Request,
     reader: Annotated[Reader, Depends(get_reader_dependency)],
     feed_url: str = "",
     webhook_url: str = "",
+    status: str = "",
+    since: str = "",
+    until: str = "",
+    starting_after: str = "",
 ) -> HTMLResponse:
-    """View sent Discord webhook messages saved for future edits.
+    """View sent Discord webhook messages saved for future edits, newest first, one page at a time.
+
+    Args:
+        request: The request object.
+        reader: The Reader instance.
+        feed_url: Only show messages of this feed.
+        webhook_url: Only show messages sent to this webhook.
+        status: Only show messages whose last send or edit was ``sent``, ``failed`` or is ``deferred``.
+        since: Only show messages sent or edited on or after this ``YYYY-MM-DD`` date (UTC).
+        until: Only show messages sent or edited on or before this ``YYYY-MM-DD`` date (UTC).
+        starting_after: Cursor of the page to show, from the previous page's "Older" link.
 
     Returns:
         sent_webhooks.html HTML
     """
-    clean_feed_url: str = feed_url.strip()
-    clean_webhook_url: str = webhook_url.strip()
+    filters = SentWebhookFilter(
+        feed_url=feed_url.strip(),
+        webhook_url=webhook_url.strip(),
+        status=status if status in SENT_WEBHOOK_STATUSES else "",
+        since=_parse_date_filter(since),
+        until=_parse_date_filter(until, days=1),
+    )
+    store: SentWebhookStore = get_sent_webhook_store()
+    page: SentWebhookPage = store.get_page(filters, starting_after=starting_after, limit=SENT_WEBHOOKS_PAGE_SIZE)
 
-    records: list[SentWebhookRecord] = get_sent_webhook_records(reader)
-    if clean_feed_url:
-        records = [record for record in records if record.get("feed_url") == clean_feed_url]
-    if clean_webhook_url:
-        records = [record for record in records if record.get("webhook_url") == clean_webhook_url]
+    webhooks: list[dict[str, str]] = cast("list[dict[str, str]]", list(reader.get_tag((), "webhooks", [])))
+    webhook_names: dict[str, str] = {
+        hook.get("url", ""): hook.get("name", "") for hook in webhooks if isinstance(hook, dict)
+    }
+    filter_query: dict[str, str] = {
+        key: value
+        for key, value in (
+            ("feed_url", filters.feed_url),
+            ("webhook_url", filters.webhook_url),
+            ("status", filters.status),
+            ("since", filters.since),
+            ("until", _parse_date_filter(until)),
+        )
+        if value
+    }
+
+    context = {
+        "request": request,
+        "records": page.records,
+        "total_records": store.count(filters),
+        "next_page_url": (
+            f"/sent_webhooks?{urllib.parse.urlencode({**filter_query, 'starting_after': page.next_cursor})}"
+            if page.next_cursor
+            else ""
+        ),
+        "first_page_url": f"/sent_webhooks?{urllib.parse.urlencode(filter_query)}" if starting_after else "",
+        "feed_url": filters.feed_url,
+        "webhook_url": filters.webhook_url,
+        "status": filters.status,
+        "statuses": SENT_WEBHOOK_STATUSES,
+        "since": filters.since,
+        "until": filter_query.get("until", ""),
+        "webhook_names": webhook_names,
+        "feed_titles": store.get_feed_titles(),
+    }
+    return templates.TemplateResponse(request=request, name="sent_webhooks.html", context=context)
+
+
+@app.get("/sent_webhooks/record", response_class=HTMLResponse)
+async def get_sent_webhook_record(request: Request, feed_url: str, entry_id: str, webhook_url: str) -> HTMLResponse:
+    """Render the saved payload and Discord response of one sent message, loaded when its row is expanded.
+
+    Returns:
+        HTMLResponse: Rendered record fragment.
+
+    Raises:
+        HTTPException: If no message of the entry was saved for the webhook.
+    """
+    record: JsonObject | None = get_sent_webhook_store().get(feed_url, entry_id, webhook_url)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Sent message not found")
+    return templates.TemplateResponse(request=request, name="_sent_webhook_record.html", context={"record": record})
+
+
+FAILED_DELIVERIES_PAGE_SIZE: int = 500
+
+
+def _failed_deliveries_url(feed_url: str, webhook_url: str, message: str = "") -> str:
+    query: dict[str, str] = {
+        key: value
+        for key, value in (("feed_url", feed_url), ("webhook_url", webhook_url), ("message", message))
+        if value
+    }
+    return f"/failed_deliveries?{urllib.parse.urlencode(query)}" if query else "/failed_deliveries"
 
-    records.sort(
-        key=lambda record: str(record.get("last_updated_at") or record.get("last_sent_at") or ""),
-        reverse=True,
-    )
+
+@app.get("/failed_deliveries", response_class=HTMLResponse)
+async def get_failed_deliveries(
+    request: Request,
+    reader: Annotated[Reader, Depends(get_reader_dependency)],
+    feed_url: str = "",
+    webhook_url: str = "",
+    message: str = "",
+) -> HTMLResponse:
+    """View messages the outbox gave up on, so they can be replayed or deleted in bulk.
+
+    Returns:
+        failed_deliveries.html HTML
+    """
+    clean_feed_url: str = feed_url.strip()
+    clean_webhook_url: str = webhook_url.strip()
+    outbox: Outbox = get_outbox()
 
     webhooks: list[dict[str, str]] = cast("list[dict[str, str]]", list(reader.get_tag((), "webhooks", [])))
     webhook_names: dict[str, str] = {
@@ -2586,14 +2910,92 @@ async def get_sent_webhooks(
 
     context = {
         "request": request,
-        "records": records,
-        "total_records": len(records),
+        "dead_letters": outbox.get_dead_letters(
+            feed_url=clean_feed_url or None,
+            webhook_url=clean_webhook_url or None,
+            limit=FAILED_DELIVERIES_PAGE_SIZE,
+        ),
+        "total_dead_letters": outbox.count_dead_letters(
+            feed_url=clean_feed_url or None,
+            webhook_url=clean_webhook_url or None,
+        ),
         "feed_url": clean_feed_url,
         "webhook_url": clean_webhook_url,
         "webhook_names": webhook_names,
         "feed_titles": feed_titles,
+        "messages": message or None,
+    }
+    return templates.TemplateResponse(request=request, name="failed_deliveries.html", context=context)
+
+
+@app.post("/failed_deliveries/replay")
+async def post_replay_failed_deliveries(
+    feed_url: Annotated[str, Form()] = "",
+    webhook_url: Annotated[str, Form()] = "",
+    ids: Annotated[list[int] | None, Form()] = None,
+) -> RedirectResponse:
+    """Queue failed deliveries again: the selected ones, or every one matching the feed and webhook filter.
+
+    The outbox drain sends them within Discord's rate limits, so a large backlog is paced rather than burst.
+
+    Returns:
+        RedirectResponse: Redirect to the failed deliveries page.
+    """
+    clean_feed_url: str = feed_url.strip()
+    clean_webhook_url: str = webhook_url.strip()
+    replayed: int = get_outbox().replay_dead_letters(
+        ids=ids,
+        feed_url=clean_feed_url or None,
+        webhook_url=clean_webhook_url or None,
+    )
+    logger.info("Replaying %d failed deliveries", replayed)
+    return RedirectResponse(
+        url=_failed_deliveries_url(clean_feed_url, clean_webhook_url, f"Queued {replayed} message(s) again."),
+        status_code=303,
+    )
+
+
+@app.post("/failed_deliveries/delete")
+async def post_delete_failed_deliveries(
+    feed_url: Annotated[str, Form()] = "",
+    webhook_url: Annotated[str, Form()] = "",
+    ids: Annotated[list[int] | None, Form()] = None,
+) -> RedirectResponse:
+    """Delete failed deliveries: the selected ones, or every one matching the feed and webhook filter.
+
+    Returns:
+        RedirectResponse: Redirect to the failed deliveries page.
+    """
+    clean_feed_url: str = feed_url.strip()
+    clean_webhook_url: str = webhook_url.strip()
+    deleted: int = get_outbox().delete_dead_letters(
+        ids=ids,
+        feed_url=clean_feed_url or None,
+        webhook_url=clean_webhook_url or None,
+    )
+    return RedirectResponse(
+        url=_failed_deliveries_url(clean_feed_url, clean_webhook_url, f"Deleted {deleted} message(s)."),
+        status_code=303,
+    )
+
+
+@app.get("/healthz")
+def get_health() -> dict[str, object]:
+    """Report whether the bot is up and whether Discord traffic is flowing.
+
+    The Docker health check calls this. A paused circuit breaker is reported but does not make the bot
+    unhealthy: it resumes on its own and restarting would not help.
+
+    Returns:
+        dict[str, object]: Status, circuit breaker state, outbox size and number of failed deliveries.
+    """
+    discord_circuit = get_rate_limit_manager().breaker.snapshot()
+    return {
+        "status": "degraded" if discord_circuit["state"] == "open" else "ok",
+        "discord_circuit": discord_circuit,
+        "outbox_count": get_outbox().count(),
+        "failed_delivery_count": get_outbox().count_dead_letters(),
     }
-    return templates.TemplateResponse(request=request, name="sent_webhooks.html", context=context)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -3271,6 +3673,18 @@ async def post_entry(
     return RedirectResponse(url=f"/feed?feed_url={urllib.parse.quote(redirect_feed_url)}", status_code=303)
 
 
+def replace_extra_webhook_url(reader: Reader, feed: Feed, old_url: str, new_url: str) -> None:
+    """Point a feed's extra webhooks that use *old_url* at *new_url* instead."""
+    extra_webhooks = cast("list[dict[str, str]]", list(reader.get_tag(feed, "extra_webhooks", [])))
+    if not any(target.get("url") == old_url for target in extra_webhooks):
+        return
+
+    for target in extra_webhooks:
+        if target.get("url") == old_url:
+            target["url"] = new_url
+    reader.set_tag(feed.url, "extra_webhooks", extra_webhooks)  # pyright: ignore[reportArgumentType]
+
+
 @app.post("/modify_webhook", response_class=HTMLResponse)
 def modify_webhook(
     old_hook: Annotated[str, Form()],
@@ -3328,6 +3742,8 @@ def modify_webhook(
                 if webhook == old_hook_clean:
                     reader.set_tag(feed.url, "webhook", new_hook_clean)  # pyright: ignore[reportArgumentType]
 
+                replace_extra_webhook_url(reader, feed, old_hook_clean, new_hook_clean)
+
     if webhook_modified and old_hook_clean != new_hook_clean:
         commit_state_change(reader, f"Modify webhook URL from {old_hook_clean} to {new_hook_clean}")
 
@@ -3340,6 +3756,70 @@ def modify_webhook(
     return RedirectResponse(url=redirect_url, status_code=303)
 
 
+@app.post("/add_feed_extra_webhook")
+async def post_add_feed_extra_webhook(
+    feed_url: Annotated[str, Form()],
+    webhook_dropdown: Annotated[str, Form()],
+    reader: Annotated[Reader, Depends(get_reader_dependency)],
+    username: Annotated[str, Form()] = "",
+    avatar_url: Annotated[str, Form()] = "",
+) -> RedirectResponse:
+    """Send a feed's entries to another saved webhook as well, optionally under a different name or avatar.
+
+    Returns:
+        RedirectResponse: Redirect to the feed page.
+
+    Raises:
+        HTTPException: If the feed or webhook cannot be found, or the avatar URL is invalid.
+    """
+    clean_feed_url: str = feed_url.strip()
+    try:
+        reader.get_feed(clean_feed_url)
+    except FeedNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Feed not found") from e
+
+    hooks = cast("list[dict[str, str]]", list(reader.get_tag((), "webhooks", [])))
+    webhook_url: str = next(
+        (hook.get("url", "").strip() for hook in hooks if hook.get("name") == webhook_dropdown.strip()),
+        "",
+    )
+    if not webhook_url:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+
+    clean_avatar_url: str = avatar_url.strip()
+    if clean_avatar_url and not is_url_valid(clean_avatar_url):
+        raise HTTPException(status_code=400, detail="Invalid avatar URL")
+
+    targets = cast("list[dict[str, str]]", list(reader.get_tag(clean_feed_url, "extra_webhooks", [])))
+    targets = [target for target in targets if target.get("url") != webhook_url]
+    targets.append({"url": webhook_url, "username": username.strip(), "avatar_url": clean_avatar_url})
+    reader.set_tag(clean_feed_url, "extra_webhooks", targets)  # pyright: ignore[reportArgumentType]
+    commit_state_change(reader, f"Also send {clean_feed_url} to webhook {webhook_dropdown.strip()}")
+    return RedirectResponse(url=f"/feed?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+
+
+@app.post("/remove_feed_extra_webhook")
+async def post_remove_feed_extra_webhook(
+    feed_url: Annotated[str, Form()],
+    webhook_url: Annotated[str, Form()],
+    reader: Annotated[Reader, Depends(get_reader_dependency)],
+) -> RedirectResponse:
+    """Stop sending a feed's entries to one of its extra webhooks.
+
+    Returns:
+        RedirectResponse: Redirect to the feed page.
+    """
+    clean_feed_url: str = feed_url.strip()
+    targets = cast("list[dict[str, str]]", list(reader.get_tag(clean_feed_url, "extra_webhooks", [])))
+    remaining: list[dict[str, str]] = [target for target in targets if target.get("url") != webhook_url.strip()]
+    if remaining:
+        reader.set_tag(clean_feed_url, "extra_webhooks", remaining)  # pyright: ignore[reportArgumentType]
+    else:
+        reader.delete_tag(clean_feed_url, "extra_webhooks", missing_ok=True)
+    commit_state_change(reader, f"Stop sending {clean_feed_url} to an extra webhook")
+    return RedirectResponse(url=f"/feed?feed_url={urllib.parse.quote(clean_feed_url)}", status_code=303)
+
+
 def resolve_final_feed_url(url: str) -> tuple[str, str | None]:
     """Resolve a feed URL by following redirects.
 
@@ -3551,7 +4031,7 @@ async def get_webhook_entries(  # ruff:ignore[complex-structure, too-many-locals
     resolve_urls: bool = True,  # ruff:ignore[boolean-type-hint-positional-argument, boolean-default-value-positional-argument]
     force_update: bool = False,  # ruff:ignore[boolean-type-hint-positional-argument, boolean-default-value-positional-argument]
     message: str = "",
-) -> HTMLResponse:
+) -> StreamingResponse:
     """Get all latest entries from all feeds for a specific webhook.
 
     Args:
@@ -3566,7 +4046,7 @@ async def get_webhook_entries(  # ruff:ignore[complex-structure, too-many-locals
         reader: The Reader instance.
 
     Returns:
-        HTMLResponse: The webhook entries page.
+        StreamingResponse: The webhook entries page, streamed as the entries are rendered.
 
     Raises:
         HTTPException: If no feeds are found for this webhook or webhook doesn't exist.
@@ -3636,8 +4116,8 @@ async def get_webhook_entries(  # ruff:ignore[complex-structure, too-many-locals
     if paginated_entries:
         last_entry = paginated_entries[-1]
 
-    # Create the html for the entries
-    html: str = create_html_for_feed(reader=reader, entries=paginated_entries)
+    # The entry cards are rendered while the page streams.
+    cards: Iterator[str] = iter_entry_cards_html(reader=reader, entries=paginated_entries)
 
     mass_update_context = build_webhook_mass_update_context(
         webhook_feeds=webhook_feeds,
@@ -3659,7 +4139,6 @@ async def get_webhook_entries(  # ruff:ignore[complex-structure, too-many-locals
         "webhook_url": clean_webhook_url,
         "webhook_feeds": webhook_feeds,
         "entries": paginated_entries,
-        "html": html,
         "last_entry": last_entry,
         "is_show_more_entries_button_visible": is_show_more_entries_button_visible,
         "total_entries": total_entries,
@@ -3667,7 +4146,7 @@ async def get_webhook_entries(  # ruff:ignore[complex-structure, too-many-locals
         "message": message,
         **mass_update_context,
     }
-    return templates.TemplateResponse(request=request, name="webhook_entries.html", context=context)
+    return stream_page_with_entry_cards(request, "webhook_entries.html", context, cards)
 
 
 @app.post("/bulk_change_feed_urls", response_class=HTMLResponse)
@@ -0,0 +1,551 @@
+"""Durable outbox of rendered Discord messages waiting to be sent.
+
+Delivery happens in two stages:
+
+1. ``send_to_discord`` renders each new entry and stores the finished request in
+   the outbox, and only then marks the entry as read.
+2. ``drain_outbox`` sends due messages. A successful send removes the message;
+   a failed send is kept and retried later with exponential backoff. A
+   rate-limited send is deferred until Discord's retry deadline instead.
+
+A message that Discord rejects outright (a 4xx other than 429), or that is
+still failing after ``DISCORD_OUTBOX_MAX_ATTEMPTS`` attempts (default 10), is
+moved to the ``dead_letters`` table together with the last status code and
+response body. Dead letters are never retried on their own; replaying them
+moves them back into the outbox, where the drain paces them like any other
+message.
+
+Because the outbox is stored in the state database, messages that were
+rendered but not yet sent survive a crash or restart, and a Discord outage
+only delays them.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import cast
+
+from discord_rss_bot.settings import env_int
+from discord_rss_bot.state_db import get_state_db
+from discord_rss_bot.webhook import DiscordWebhook
+from discord_rss_bot.webhook import WebhookFile
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from discord_rss_bot.state_db import StateDatabase
+    from discord_rss_bot.webhook import JsonObject
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS: float = 30.0
+BACKOFF_MAX_SECONDS: float = 60.0 * 60.0
+DEFAULT_MAX_ATTEMPTS: int = 10
+
+
+def get_backoff_seconds(attempts: int) -> float:
+    """Return how long to wait before retrying a message that has failed *attempts* times.
+
+    Returns:
+        float: 30s, 60s, 120s, ... capped at one hour.
+    """
+    if attempts <= 0:
+        return 0.0
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxMessage:
+    """A rendered Discord message stored in the outbox."""
+
+    id: int
+    feed_url: str
+    entry_id: str
+    webhook_url: str
+    delivery_mode: str
+    thread_id: str | None
+    request_payload: JsonObject
+    message_payload: JsonObject
+    attempts: int
+    next_attempt_at: float
+    created_at: float
+    last_error: str
+    files: tuple[WebhookFile, ...] = ()
+    pack_key: str | None = None
+
+    def to_webhook(self) -> DiscordWebhook:
+        """Rebuild the webhook the message was rendered from.
+
+        Returns:
+            DiscordWebhook: Webhook carrying the stored URL, thread and files.
+        """
+        webhook = DiscordWebhook(url=self.webhook_url, thread_id=self.thread_id)
+        webhook.files = list(self.files)
+        return webhook
+
+
+@dataclass(frozen=True, slots=True)
+class DeadLetter:
+    """A message that could not be delivered and waits to be replayed or deleted."""
+
+    id: int
+    feed_url: str
+    entry_id: str
+    webhook_url: str
+    delivery_mode: str
+    request_payload: JsonObject
+    attempts: int
+    status_code: int | None
+    response_body: str
+    last_error: str
+    created_at: float
+    failed_at: float
+
+
+def _dead_letter_filter(
+    *,
+    ids: list[int] | None = None,
+    feed_url: str | None = None,
+    webhook_url: str | None = None,
+) -> tuple[str, tuple[object, ...]]:
+    conditions: list[str] = []
+    parameters: list[object] = []
+    if ids is not None:
+        conditions.append(f"id IN ({', '.join('?' for _ in ids) or 'NULL'})")
+        parameters.extend(ids)
+    if feed_url:
+        conditions.append("feed_url = ?")
+        parameters.append(feed_url)
+    if webhook_url:
+        conditions.append("webhook_url = ?")
+        parameters.append(webhook_url)
+    return " AND ".join(conditions) or "1", tuple(parameters)
+
+
+class Outbox:
+    """Queue of pending deliveries backed by the ``outbox`` table, plus the ``dead_letters`` it gave up on."""
+
+    def __init__(self, db: StateDatabase, *, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> None:  # ruff:ignore[undocumented-public-init]
+        self.db: StateDatabase = db
+        self.max_attempts: int = max_attempts
+
+    def enqueue(
+        self,
+        *,
+        feed_url: str,
+        entry_id: str,
+        webhook_url: str,
+        delivery_mode: str,
+        request_payload: JsonObject,
+        message_payload: JsonObject,
+        thread_id: str | None = None,
+        files: list[WebhookFile] | None = None,
+        pack_key: str | None = None,
+        now: float | None = None,
+    ) -> int | None:
+        """Store a rendered message so it can be sent, and retried, later.
+
+        An entry is queued at most once per webhook; enqueuing it again is a no-op. Consecutive messages with the
+        same *pack_key* may be sent as one Discord message (see ``discord_rss_bot.packing``).
+
+        Returns:
+            int | None: The new message id, or None if it was already queued.
+        """
+        with self.db.transaction() as connection:
+            return self.insert(
+                connection,
+                feed_url=feed_url,
+                entry_id=entry_id,
+                webhook_url=webhook_url,
+                delivery_mode=delivery_mode,
+                request_payload=request_payload,
+                message_payload=message_payload,
+                thread_id=thread_id,
+                files=files,
+                pack_key=pack_key,
+                now=now,
+            )
+
+    def insert(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        feed_url: str,
+        entry_id: str,
+        webhook_url: str,
+        delivery_mode: str,
+        request_payload: JsonObject,
+        message_payload: JsonObject,
+        thread_id: str | None = None,
+        files: list[WebhookFile] | None = None,
+        pack_key: str | None = None,
+        now: float | None = None,
+    ) -> int | None:
+        """Like ``enqueue``, but inside a transaction the caller already holds on the state database.
+
+        Returns:
+            int | None: The new message id, or None if it was already queued.
+        """
+        queued_at: float = time.time() if now is None else now
+        cursor: sqlite3.Cursor = connection.execute(
+            """
+            INSERT OR IGNORE INTO outbox (
+                feed_url, entry_id, webhook_url, delivery_mode, thread_id,
+                request_payload, message_payload, next_attempt_at, created_at, pack_key
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                feed_url,
+                entry_id,
+                webhook_url,
+                delivery_mode,
+                thread_id,
+                json.dumps(request_payload, default=str),
+                json.dumps(message_payload, default=str),
+                queued_at,
+                queued_at,
+                pack_key,
+            ),
+        )
+        if not cursor.rowcount:
+            return None
+
+        message_id: int = cast("int", cursor.lastrowid)
+        connection.executemany(
+            "INSERT INTO outbox_files (outbox_id, position, filename, content) VALUES (?, ?, ?, ?)",
+            [(message_id, position, file.filename, file.content) for position, file in enumerate(files or [])],
+        )
+        return message_id
+
+    def get_due(self, *, now: float | None = None, limit: int | None = None) -> list[OutboxMessage]:
+        """Return messages whose next attempt is due, oldest first.
+
+        A message queued behind an earlier message for the same webhook that is still backing off or deferred is
+        not due yet, so a retry can never be overtaken by the messages queued after it.
+
+        Returns:
+            list[OutboxMessage]: Due messages in the order they were queued.
+        """
+        due_at: float = time.time() if now is None else now
+        rows: list[sqlite3.Row] = self.db.query(
+            """
+            SELECT * FROM outbox
+            WHERE next_attempt_at <= :now
+            AND NOT EXISTS (
+                SELECT 1 FROM outbox AS earlier
+                WHERE earlier.webhook_url = outbox.webhook_url
+                AND earlier.id < outbox.id
+                AND earlier.next_attempt_at > :now
+            )
+            ORDER BY id LIMIT :limit
+            """,
+            {"now": due_at, "limit": -1 if limit is None else limit},
+        )
+        return self._load(rows)
+
+    def get_all(self) -> list[OutboxMessage]:
+        """Return every queued message, oldest first."""
+        return self._load(self.db.query("SELECT * FROM outbox ORDER BY id"))
+
+    def _load(self, rows: list[sqlite3.Row]) -> list[OutboxMessage]:
+        if not rows:
+            return []
+
+        ids: list[int] = [row["id"] for row in rows]
+        files: dict[int, list[WebhookFile]] = {}
+        placeholders: str = ", ".join("?" for _ in ids)
+        sql: str = f"SELECT * FROM outbox_files WHERE outbox_id IN ({placeholders}) ORDER BY position"  # ruff:ignore[hardcoded-sql-expression]
+        for file_row in self.db.query(sql, tuple(ids)):
+            files.setdefault(file_row["outbox_id"], []).append(
+                WebhookFile(filename=file_row["filename"], content=bytes(file_row["content"])),
+            )
+
+        return [
+            OutboxMessage(
+                id=row["id"],
+                feed_url=row["feed_url"],
+                entry_id=row["entry_id"],
+                webhook_url=row["webhook_url"],
+                delivery_mode=row["delivery_mode"],
+                thread_id=row["thread_id"],
+                request_payload=json.loads(row["request_payload"]),
+                message_payload=json.loads(row["message_payload"]),
+                attempts=row["attempts"],
+                next_attempt_at=row["next_attempt_at"],
+                created_at=row["created_at"],
+                last_error=row["last_error"],
+                files=tuple(files.get(row["id"], ())),
+                pack_key=row["pack_key"],
+            )
+            for row in rows
+        ]
+
+    def mark_sent(self, message_id: int) -> None:
+        """Remove a message that Discord accepted."""
+        with self.db.transaction() as connection:
+            connection.execute("DELETE FROM outbox WHERE id = ?", (message_id,))
+
+    def mark_failed(
+        self,
+        message_id: int,
+        error: str,
+        *,
+        status_code: int | None = None,
+        response_body: str = "",
+        permanent: bool = False,
+        now: float | None = None,
+    ) -> float | None:
+        """Record a failed attempt and schedule the next one with exponential backoff.
+
+        The message is moved to the dead letters instead when the failure is *permanent* or it has used up
+        ``max_attempts``.
+
+        Returns:
+            float | None: Unix time of the next attempt, or None if the message became a dead letter.
+        """
+        failed_at: float = time.time() if now is None else now
+        with self.db.transaction() as connection:
+            row: sqlite3.Row | None = connection.execute(
+                "SELECT attempts FROM outbox WHERE id = ?",
+                (message_id,),
+            ).fetchone()
+            if row is None:
+                return failed_at
+
+            attempts: int = row["attempts"] + 1
+            if permanent or attempts >= self.max_attempts:
+                self._move_to_dead_letters(
+                    connection,
+                    message_id,
+                    attempts=attempts,
+                    status_code=status_code,
+                    response_body=response_body,
+                    error=error,
+                    failed_at=failed_at,
+                )
+                return None
+
+            next_attempt_at: float = failed_at + get_backoff_seconds(attempts)
+            connection.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (attempts, next_attempt_at, error[:2000], message_id),
+            )
+        return next_attempt_at
+
+    @staticmethod
+    def _move_to_dead_letters(
+        connection: sqlite3.Connection,
+        message_id: int,
+        *,
+        attempts: int,
+        status_code: int | None,
+        response_body: str,
+        error: str,
+        failed_at: float,
+    ) -> None:
+        cursor: sqlite3.Cursor = connection.execute(
+            """
+            INSERT INTO dead_letters (
+                feed_url, entry_id, webhook_url, delivery_mode, thread_id, request_payload, message_payload,
+                pack_key, attempts, status_code, response_body, last_error, created_at, failed_at
+            )
+            SELECT
+                feed_url, entry_id, webhook_url, delivery_mode, thread_id, request_payload, message_payload,
+                pack_key, ?, ?, ?, ?, created_at, ?
+            FROM outbox WHERE id = ?
+            """,
+            (attempts, status_code, response_body[:4000], error[:2000], failed_at, message_id),
+        )
+        connection.execute(
+            "INSERT INTO dead_letter_files (dead_letter_id, position, filename, content)"
+            " SELECT ?, position, filename, content FROM outbox_files WHERE outbox_id = ?",
+            (cursor.lastrowid, message_id),
+        )
+        connection.execute("DELETE FROM outbox WHERE id = ?", (message_id,))
+
+    def add_dead_letter(
+        self,
+        *,
+        feed_url: str,
+        entry_id: str,
+        webhook_url: str,
+        delivery_mode: str,
+        request_payload: JsonObject,
+        message_payload: JsonObject,
+        error: str,
+        status_code: int | None = None,
+        response_body: str = "",
+        thread_id: str | None = None,
+        files: list[WebhookFile] | None = None,
+        now: float | None = None,
+    ) -> int:
+        """Keep a message that failed outside the outbox (e.g. a manual send) so it can be replayed later.
+
+        Returns:
+            int: The dead letter id.
+        """
+        failed_at: float = time.time() if now is None else now
+        with self.db.transaction() as connection:
+            cursor: sqlite3.Cursor = connection.execute(
+                """
+                INSERT INTO dead_letters (
+                    feed_url, entry_id, webhook_url, delivery_mode, thread_id, request_payload, message_payload,
+                    attempts, status_code, response_body, last_error, created_at, failed_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?)
+                """,
+                (
+                    feed_url,
+                    entry_id,
+                    webhook_url,
+                    delivery_mode,
+                    thread_id,
+                    json.dumps(request_payload, default=str),
+                    json.dumps(message_payload, default=str),
+                    status_code,
+                    response_body[:4000],
+                    error[:2000],
+                    failed_at,
+                    failed_at,
+                ),
+            )
+            dead_letter_id: int = cast("int", cursor.lastrowid)
+            connection.executemany(
+                "INSERT INTO dead_letter_files (dead_letter_id, position, filename, content) VALUES (?, ?, ?, ?)",
+                [(dead_letter_id, position, file.filename, file.content) for position, file in enumerate(files or [])],
+            )
+        return dead_letter_id
+
+    def get_dead_letters(
+        self,
+        *,
+        feed_url: str | None = None,
+        webhook_url: str | None = None,
+        limit: int | None = None,
+    ) -> list[DeadLetter]:
+        """Return dead letters, oldest first, optionally only those of one feed or webhook.
+
+        Returns:
+            list[DeadLetter]: The matching dead letters.
+        """
+        where, parameters = _dead_letter_filter(feed_url=feed_url, webhook_url=webhook_url)
+        rows: list[sqlite3.Row] = self.db.query(
+            f"SELECT * FROM dead_letters WHERE {where} ORDER BY id LIMIT ?",  # ruff:ignore[hardcoded-sql-expression]
+            (*parameters, -1 if limit is None else limit),
+        )
+        return [
+            DeadLetter(
+                id=row["id"],
+                feed_url=row["feed_url"],
+                entry_id=row["entry_id"],
+                webhook_url=row["webhook_url"],
+                delivery_mode=row["delivery_mode"],
+                request_payload=json.loads(row["request_payload"]),
+                attempts=row["attempts"],
+                status_code=row["status_code"],
+                response_body=row["response_body"],
+                last_error=row["last_error"],
+                created_at=row["created_at"],
+                failed_at=row["failed_at"],
+            )
+            for row in rows
+        ]
+
+    def count_dead_letters(self, *, feed_url: str | None = None, webhook_url: str | None = None) -> int:
+        """Return how many dead letters there are, optionally for one feed or webhook."""
+        where, parameters = _dead_letter_filter(feed_url=feed_url, webhook_url=webhook_url)
+        sql: str = f"SELECT COUNT(*) FROM dead_letters WHERE {where}"  # ruff:ignore[hardcoded-sql-expression]
+        return int(self.db.query(sql, parameters)[0][0])
+
+    def replay_dead_letters(
+        self,
+        *,
+        ids: list[int] | None = None,
+        feed_url: str | None = None,
+        webhook_url: str | None = None,
+        now: float | None = None,
+    ) -> int:
+        """Move dead letters back into the outbox with a fresh set of attempts, oldest first.
+
+        Replayed messages are sent by the next drain, one ordered lane per webhook and within Discord's rate
+        limits, so hundreds of them can be replayed at once. A dead letter whose entry is already queued again
+        for the same webhook is dropped instead of being queued twice.
+
+        Returns:
+            int: Number of messages queued again.
+        """
+        queued_at: float = time.time() if now is None else now
+        where, parameters = _dead_letter_filter(ids=ids, feed_url=feed_url, webhook_url=webhook_url)
+        replayed: int = 0
+        with self.db.transaction() as connection:
+            dead_letter_ids: list[int] = [
+                row["id"]
+                for row in connection.execute(
+                    f"SELECT id FROM dead_letters WHERE {where} ORDER BY id",  # ruff:ignore[hardcoded-sql-expression]
+                    parameters,
+                )
+            ]
+            for dead_letter_id in dead_letter_ids:
+                cursor: sqlite3.Cursor = connection.execute(
+                    """
+                    INSERT OR IGNORE INTO outbox (
+                        feed_url, entry_id, webhook_url, delivery_mode, thread_id,
+                        request_payload, message_payload, next_attempt_at, created_at, pack_key
+                    )
+                    SELECT
+                        feed_url, entry_id, webhook_url, delivery_mode, thread_id,
+                        request_payload, message_payload, ?, created_at, pack_key
+                    FROM dead_letters WHERE id = ?
+                    """,
+                    (queued_at, dead_letter_id),
+                )
+                if cursor.rowcount:
+                    connection.execute(
+                        "INSERT INTO outbox_files (outbox_id, position, filename, content)"
+                        " SELECT ?, position, filename, content FROM dead_letter_files WHERE dead_letter_id = ?",
+                        (cursor.lastrowid, dead_letter_id),
+                    )
+                    replayed += 1
+                connection.execute("DELETE FROM dead_letters WHERE id = ?", (dead_letter_id,))
+        return replayed
+
+    def delete_dead_letters(
+        self,
+        *,
+        ids: list[int] | None = None,
+        feed_url: str | None = None,
+        webhook_url: str | None = None,
+    ) -> int:
+        """Delete dead letters that should not be sent after all.
+
+        Returns:
+            int: Number of deleted dead letters.
+        """
+        where, parameters = _dead_letter_filter(ids=ids, feed_url=feed_url, webhook_url=webhook_url)
+        with self.db.transaction() as connection:
+            sql: str = f"DELETE FROM dead_letters WHERE {where}"  # ruff:ignore[hardcoded-sql-expression]
+            return connection.execute(sql, parameters).rowcount
+
+    def defer(self, message_id: int, until: float, *, reason: str) -> None:
+        """Reschedule a message without counting a failed attempt, e.g. after a rate limit."""
+        with self.db.transaction() as connection:
+            connection.execute(
+                "UPDATE outbox SET next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (until, reason, message_id),
+            )
+
+    def count(self) -> int:
+        """Return how many messages are waiting to be sent."""
+        return int(self.db.query("SELECT COUNT(*) FROM outbox")[0][0])
+
+
+def get_outbox() -> Outbox:
+    """Get the outbox stored in the shared state database.
+
+    Returns:
+        Outbox: The outbox.
+    """
+    return Outbox(get_state_db(), max_attempts=env_int("DISCORD_OUTBOX_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
@@ -0,0 +1,130 @@
+"""Pack consecutive embed messages for the same webhook into one Discord message.
+
+A Discord message can carry up to 10 embeds with at most 6000 characters of
+embed text between them, but every entry used to be its own webhook call and
+used up its own rate-limit slot. Feeds with the ``pack_embeds`` tag store a
+*pack key* with each outbox message. When the outbox is drained, consecutive
+due messages in a webhook's lane that share a pack key are sent as one message.
+
+Only plain embed messages are packed: a message with content, components,
+files or anything else that cannot be merged is always sent on its own. Each
+entry still gets its own sent-webhook record, which points at the shared
+Discord message and remembers the entry's position in it, so entry updates
+edit only that entry's embed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import cast
+
+from discord_rss_bot.payloads import hash_payload
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from discord_rss_bot.outbox import OutboxMessage
+    from discord_rss_bot.webhook import JsonObject
+    from discord_rss_bot.webhook import JsonValue
+
+MAX_EMBEDS_PER_MESSAGE: int = 10
+MAX_EMBED_TEXT_LENGTH: int = 6000
+
+# Keys that may differ between packed messages (embeds) or must match for them to be packed (the rest).
+PACKABLE_PAYLOAD_KEYS: frozenset[str] = frozenset({"embeds", "username", "avatar_url", "allowed_mentions"})
+
+
+def get_embed_text_length(embed: JsonValue) -> int:
+    """Count the characters of an embed that Discord adds up against the 6000 character limit.
+
+    Returns:
+        int: Length of the title, description, field names and values, footer text and author name.
+    """
+    if not isinstance(embed, dict):
+        return 0
+
+    length: int = 0
+    for key in ("title", "description"):
+        value: JsonValue = embed.get(key)
+        if isinstance(value, str):
+            length += len(value)
+
+    for nested_key, text_key in (("footer", "text"), ("author", "name")):
+        nested: JsonValue = embed.get(nested_key)
+        if isinstance(nested, dict) and isinstance(nested.get(text_key), str):
+            length += len(cast("str", nested[text_key]))
+
+    fields: JsonValue = embed.get("fields")
+    if isinstance(fields, list):
+        for field in fields:
+            if isinstance(field, dict):
+                length += sum(len(value) for key in ("name", "value") if isinstance(value := field.get(key), str))
+    return length
+
+
+def get_pack_key(payload: JsonObject, *, thread_id: str | None, has_files: bool) -> str | None:
+    """Return the key shared by messages that can be packed together, or None if this one cannot be packed.
+
+    Messages are only packed when everything except their embeds is identical, so the packed message looks
+    the same as the individual ones would have.
+
+    Returns:
+        str | None: Hash of the non-embed parts of the message.
+    """
+    embeds: JsonValue = payload.get("embeds")
+    if has_files or not isinstance(embeds, list) or not embeds or not set(payload) <= PACKABLE_PAYLOAD_KEYS:
+        return None
+    if len(embeds) > MAX_EMBEDS_PER_MESSAGE or sum(map(get_embed_text_length, embeds)) > MAX_EMBED_TEXT_LENGTH:
+        return None
+
+    identity: JsonObject = {key: value for key, value in payload.items() if key != "embeds"}
+    identity["thread_id"] = thread_id
+    return hash_payload(identity)
+
+
+def _fits(batch: list[OutboxMessage], message: OutboxMessage) -> bool:
+    embeds: list[JsonValue] = [
+        embed for queued in (*batch, message) for embed in cast("list[JsonValue]", queued.request_payload["embeds"])
+    ]
+    return len(embeds) <= MAX_EMBEDS_PER_MESSAGE and sum(map(get_embed_text_length, embeds)) <= MAX_EMBED_TEXT_LENGTH
+
+
+def pack_messages(messages: Iterable[OutboxMessage]) -> list[list[OutboxMessage]]:
+    """Group consecutive messages with the same pack key into batches that fit in one Discord message.
+
+    The messages are expected to belong to one webhook and be in send order; the order is kept.
+
+    Returns:
+        list[list[OutboxMessage]]: Batches to send, each as one Discord message.
+    """
+    batches: list[list[OutboxMessage]] = []
+    for message in messages:
+        previous: list[OutboxMessage] | None = batches[-1] if batches else None
+        if (
+            previous is not None
+            and message.pack_key is not None
+            and previous[-1].pack_key == message.pack_key
+            and _fits(previous, message)
+        ):
+            previous.append(message)
+        else:
+            batches.append([message])
+    return batches
+
+
+def combine_payloads(payloads: Iterable[JsonObject]) -> JsonObject:
+    """Merge packable payloads into one, keeping the first payload's identity and every embed in order.
+
+    Returns:
+        JsonObject: The payload of the packed message.
+    """
+    combined: JsonObject = {}
+    embeds: list[JsonValue] = []
+    for payload in payloads:
+        for key, value in payload.items():
+            if key == "embeds":
+                embeds.extend(cast("list[JsonValue]", value))
+            else:
+                combined.setdefault(key, value)
+    combined["embeds"] = embeds
+    return combined
@@ -0,0 +1,74 @@
+"""Canonical JSON encoding of Discord message payloads.
+
+Rendered webhooks can hold values that are not plain JSON, such as tuples or
+objects set by extensions, so payloads are normalized into plain JSON before
+they are queued, stored or compared. Edits are detected by hashing the stored
+payload. Normalizing and hashing used to be separate ``json.dumps`` passes
+over the same payload. Now the payload is encoded once in a canonical form
+(sorted keys, no whitespace, anything else as ``str``). The normalized copy is
+read back from that string and the hash is taken from it, so both come from
+one encode.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from discord_rss_bot.webhook import JsonObject
+
+# Building an encoder is a noticeable part of encoding a small payload, so reuse one.
+_CANONICAL_ENCODER: json.JSONEncoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
+
+def canonical_json(value: object) -> str:
+    """Encode a value as canonical JSON: sorted keys, no whitespace and non-JSON values as ``str``.
+
+    Returns:
+        str: The encoded value; equal values always encode to the same string.
+    """
+    return _CANONICAL_ENCODER.encode(value)
+
+
+def hash_canonical_json(text: str) -> str:
+    """Hash a canonical JSON string.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def hash_payload(payload: object) -> str:
+    """Hash a payload by its canonical JSON encoding.
+
+    Returns:
+        str: SHA-256 hex digest, the same for payloads that differ only in key order.
+    """
+    return hash_canonical_json(canonical_json(payload))
+
+
+@dataclass(frozen=True, slots=True)
+class CanonicalPayload:
+    """A payload normalized into plain JSON, with the canonical encoding it was read back from."""
+
+    payload: JsonObject
+    text: str
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 hex digest of the canonical encoding."""
+        return hash_canonical_json(self.text)
+
+
+def canonicalize_payload(payload: object) -> CanonicalPayload:
+    """Normalize a payload into a fresh plain-JSON copy, keeping its canonical encoding for hashing.
+
+    Returns:
+        CanonicalPayload: The copy and its encoding.
+    """
+    text: str = canonical_json(payload)
+    return CanonicalPayload(payload=json.loads(text), text=text)
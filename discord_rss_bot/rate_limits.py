@@ -0,0 +1,540 @@
+"""Per-webhook rate-limit tracking driven by Discord's ``X-RateLimit-*`` headers.
+
+Discord reports the state of each rate-limit bucket on every response:
+
+- ``X-RateLimit-Bucket``: Opaque id shared by routes that count against the same limit.
+- ``X-RateLimit-Limit``: Requests allowed per window.
+- ``X-RateLimit-Remaining``: Requests left in the current window.
+- ``X-RateLimit-Reset-After``: Seconds until the window resets.
+
+``RateLimitManager`` remembers that state per bucket so a request can be
+delayed *before* it would be answered with a 429. Discord reports the same
+bucket id for the same route of every webhook; a bucket is only unique
+together with its major parameter, the webhook id, so state is kept per
+bucket id and webhook id. Waiting only happens for the bucket that is
+exhausted; requests to other webhooks are not held back.
+
+Callers that must not block (the outbox drain) ask for ``RateLimitedError``
+instead of a sleep and reschedule the request themselves. Time spent waiting
+and time requests were deferred are both counted in ``RateLimitStats``.
+
+Some limits cover every webhook at once: Discord's global rate limit and the
+Cloudflare ban that follows too many invalid (401/403/404) requests. For
+those, ``GlobalCircuitBreaker`` pauses all Discord traffic until the reset
+time instead of letting other webhooks make it worse. Tune it with:
+
+- ``DISCORD_BREAKER_INVALID_THRESHOLD``: Invalid responses within
+  ``DISCORD_BREAKER_INVALID_WINDOW`` seconds that open the breaker (default 20 in 60s).
+- ``DISCORD_BREAKER_COOLDOWN``: Seconds traffic is paused after an invalid-request
+  burst or a ban without ``Retry-After`` (default 60). Doubles on each repeat
+  trip, up to 15 minutes.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from dataclasses import field
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from discord_rss_bot.settings import env_float
+from discord_rss_bot.settings import env_int
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_MESSAGE_PATH_RE: re.Pattern[str] = re.compile(r"/messages/[^/]+$")
+_WEBHOOK_PATH_RE: re.Pattern[str] = re.compile(r"^(?P<prefix>.*/webhooks/[^/]+)/[^/]+(?P<rest>.*)$")
+_WEBHOOK_ID_RE: re.Pattern[str] = re.compile(r"/webhooks/(?P<webhook_id>[^/]+)/")
+
+# A bucket id from ``X-RateLimit-Bucket`` and the webhook id it applies to, or a route and "" until Discord
+# has reported the route's bucket.
+type BucketKey = tuple[str, str]
+
+
+def get_rate_limit_route(method: str, url: str) -> str:
+    """Return the route key used to look up a request's rate-limit bucket.
+
+    Edits of different messages on the same webhook share one route, because
+    Discord counts them against the same bucket.
+
+    Returns:
+        str: Route key, e.g. ``"PATCH https://discord.com/api/webhooks/1/token/messages/{message_id}"``.
+    """
+    parsed_url = urlparse(url)
+    path: str = _MESSAGE_PATH_RE.sub("/messages/{message_id}", parsed_url.path.rstrip("/"))
+    clean_url: str = parsed_url._replace(path=path, query="", fragment="").geturl()
+    return f"{method.upper()} {clean_url}"
+
+
+def get_webhook_id(route: str) -> str:
+    """Return the webhook id in a route key, the major parameter of Discord's webhook buckets.
+
+    Returns:
+        str: The webhook id, or an empty string if *route* is not a webhook route.
+    """
+    match: re.Match[str] | None = _WEBHOOK_ID_RE.search(route)
+    return match["webhook_id"] if match else ""
+
+
+def mask_webhook_url(url: str) -> str:
+    """Hide the webhook token so bucket state can be shown in the web UI.
+
+    Returns:
+        str: URL with the token path segment replaced by ``…``.
+    """
+    parsed_url = urlparse(url)
+    match: re.Match[str] | None = _WEBHOOK_PATH_RE.match(parsed_url.path)
+    if match is None:
+        return url
+    return parsed_url._replace(path=f"{match['prefix']}/…{match['rest']}", query="", fragment="").geturl()
+
+
+class RateLimitedError(Exception):
+    """Raised instead of waiting when a request's rate-limit bucket is exhausted."""
+
+    def __init__(  # ruff:ignore[undocumented-public-init]
+        self,
+        route: str,
+        retry_after: float,
+        message: str | None = None,
+    ) -> None:
+        self.route: str = route
+        self.retry_after: float = retry_after
+        super().__init__(message or f"Rate limited on {mask_webhook_url(route)}; retry in {retry_after:.2f}s")
+
+
+class CircuitOpenError(RateLimitedError):
+    """Raised instead of waiting while the global circuit breaker has paused all Discord traffic."""
+
+    def __init__(self, retry_after: float, reason: str) -> None:  # ruff:ignore[undocumented-public-init]
+        self.reason: str = reason
+        super().__init__("*", retry_after, f"Discord traffic is paused ({reason}); retry in {retry_after:.2f}s")
+
+
+def _header_value(headers: Mapping[str, str], name: str) -> str | None:
+    """Return a response header as a stripped string, if present."""
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> float | None:
+    value: str | None = _header_value(headers, name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> int | None:
+    value: float | None = _header_float(headers, name)
+    return int(value) if value is not None else None
+
+
+@dataclass(slots=True)
+class RateLimitBucket:
+    """Last known state of one Discord rate-limit bucket."""
+
+    bucket_id: str
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None
+    routes: set[str] = field(default_factory=set)
+    last_status_code: int | None = None
+    rate_limited_count: int = 0
+
+    def delay(self, now: float) -> float:
+        """Return how long a new request must wait before this bucket allows it."""
+        if self.remaining is None or self.remaining > 0 or self.reset_at is None:
+            return 0.0
+        return max(self.reset_at - now, 0.0)
+
+
+@dataclass(slots=True)
+class RateLimitStats:
+    """Counters describing how much time rate limits cost."""
+
+    rate_limited_responses: int = 0
+    waits: int = 0
+    seconds_waited: float = 0.0
+    deferred_requests: int = 0
+    seconds_deferred: float = 0.0
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Return the counters as a plain dict for templates and logs."""
+        return {
+            "rate_limited_responses": self.rate_limited_responses,
+            "waits": self.waits,
+            "seconds_waited": round(self.seconds_waited, 2),
+            "deferred_requests": self.deferred_requests,
+            "seconds_deferred": round(self.seconds_deferred, 2),
+        }
+
+
+#: Responses Discord counts as invalid requests towards a Cloudflare ban.
+INVALID_REQUEST_STATUS_CODES: frozenset[int] = frozenset({401, 403, 404})
+DEFAULT_BREAKER_INVALID_THRESHOLD: int = 20
+DEFAULT_BREAKER_INVALID_WINDOW: float = 60.0
+DEFAULT_BREAKER_COOLDOWN: float = 60.0
+MAX_BREAKER_COOLDOWN_SECONDS: float = 15 * 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class CircuitBreakerConfig:
+    """Thresholds for the global circuit breaker."""
+
+    invalid_threshold: int = DEFAULT_BREAKER_INVALID_THRESHOLD
+    invalid_window: float = DEFAULT_BREAKER_INVALID_WINDOW
+    cooldown: float = DEFAULT_BREAKER_COOLDOWN
+
+    @classmethod
+    def from_env(cls) -> CircuitBreakerConfig:
+        """Build the breaker thresholds from environment variables.
+
+        Returns:
+            The resolved configuration.
+        """
+        return cls(
+            invalid_threshold=env_int("DISCORD_BREAKER_INVALID_THRESHOLD", DEFAULT_BREAKER_INVALID_THRESHOLD),
+            invalid_window=env_float("DISCORD_BREAKER_INVALID_WINDOW", DEFAULT_BREAKER_INVALID_WINDOW),
+            cooldown=env_float("DISCORD_BREAKER_COOLDOWN", DEFAULT_BREAKER_COOLDOWN),
+        )
+
+
+class GlobalCircuitBreaker:
+    """Pause every Discord request after a global rate limit or a burst of invalid requests.
+
+    The breaker is *closed* while traffic flows and *open* until its reset time.
+    After it reopens for traffic, a successful response resets the cooldown; another
+    burst trips it again for twice as long.
+    """
+
+    def __init__(self, config: CircuitBreakerConfig | None = None) -> None:  # ruff:ignore[undocumented-public-init]
+        self.config: CircuitBreakerConfig = config or CircuitBreakerConfig.from_env()
+        self._lock: threading.Lock = threading.Lock()
+        self._open_until: float = 0.0
+        self._open_until_wall: float = 0.0
+        self._reason: str = ""
+        self._invalid_responses: deque[float] = deque()
+        self._consecutive_trips: int = 0
+        self.trip_count: int = 0
+
+    def remaining(self) -> float:
+        """Return the seconds until traffic may resume (``0.0`` when closed)."""
+        with self._lock:
+            return max(self._open_until - time.monotonic(), 0.0)
+
+    def check(self, *, block: bool = True) -> float:
+        """Wait while the breaker is open.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            CircuitOpenError: If *block* is False and the breaker is open.
+        """
+        waited: float = 0.0
+        while (delay := self.remaining()) > 0:
+            if not block:
+                raise CircuitOpenError(delay, self._reason)
+            logger.warning("Discord traffic is paused (%s); waiting %.2fs", self._reason, delay)
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    def trip(self, seconds: float, reason: str) -> None:
+        """Open the breaker for at least *seconds*."""
+        with self._lock:
+            self._trip(seconds, reason)
+
+    def _trip(self, seconds: float, reason: str) -> None:
+        now: float = time.monotonic()
+        if now + seconds <= self._open_until:
+            return
+
+        self._open_until = now + seconds
+        self._open_until_wall = time.time() + seconds
+        self._reason = reason
+        self.trip_count += 1
+        logger.error("Pausing all Discord traffic for %.1fs: %s", seconds, reason)
+
+    def record(self, status_code: int, *, is_global: bool = False, retry_after: float | None = None) -> None:
+        """Feed a Discord response into the breaker."""
+        with self._lock:
+            now: float = time.monotonic()
+            if 200 <= status_code < 300:  # ruff:ignore[magic-value-comparison]
+                self._consecutive_trips = 0
+                return
+
+            if status_code == 429 and is_global:  # ruff:ignore[magic-value-comparison]
+                seconds: float = retry_after if retry_after is not None else self._next_cooldown()
+                self._trip(seconds, "Discord global rate limit")
+                return
+
+            if status_code not in INVALID_REQUEST_STATUS_CODES:
+                return
+
+            self._invalid_responses.append(now)
+            while self._invalid_responses and self._invalid_responses[0] < now - self.config.invalid_window:
+                self._invalid_responses.popleft()
+
+            if len(self._invalid_responses) >= self.config.invalid_threshold:
+                count: int = len(self._invalid_responses)
+                self._invalid_responses.clear()
+                self._trip(
+                    self._next_cooldown(),
+                    f"{count} invalid requests (401/403/404) in {self.config.invalid_window:.0f}s",
+                )
+
+    def _next_cooldown(self) -> float:
+        self._consecutive_trips += 1
+        return min(self.config.cooldown * 2 ** (self._consecutive_trips - 1), MAX_BREAKER_COOLDOWN_SECONDS)
+
+    def reset(self) -> None:
+        """Close the breaker and forget recent invalid responses."""
+        with self._lock:
+            self._open_until = 0.0
+            self._open_until_wall = 0.0
+            self._reason = ""
+            self._invalid_responses.clear()
+            self._consecutive_trips = 0
+
+    def snapshot(self) -> dict[str, str | int | float | bool | None]:
+        """Return the breaker state for the web UI and health check.
+
+        Returns:
+            dict: ``state`` is ``"open"`` or ``"closed"``.
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            is_open: bool = self._open_until > now
+            return {
+                "state": "open" if is_open else "closed",
+                "reason": self._reason if is_open else "",
+                "retry_in": round(self._open_until - now, 2) if is_open else 0.0,
+                "open_until": self._open_until_wall if is_open else None,
+                "trip_count": self.trip_count,
+                "recent_invalid_responses": len(self._invalid_responses),
+                "invalid_threshold": self.config.invalid_threshold,
+            }
+
+
+class RateLimitManager:
+    """Thread-safe registry of Discord rate-limit buckets.
+
+    Callers wrap each request with ``acquire()`` and ``update()``. ``acquire``
+    reserves a slot in the route's bucket, sleeping only when that bucket is
+    exhausted, and ``update`` records the headers Discord sent back.
+    """
+
+    def __init__(self, breaker: GlobalCircuitBreaker | None = None) -> None:  # ruff:ignore[undocumented-public-init]
+        self.breaker: GlobalCircuitBreaker = breaker or GlobalCircuitBreaker()
+        self._lock: threading.Lock = threading.Lock()
+        self._route_buckets: dict[str, BucketKey] = {}
+        self._buckets: dict[BucketKey, RateLimitBucket] = {}
+        self._stats: RateLimitStats = RateLimitStats()
+
+    def _get_bucket(self, route: str) -> RateLimitBucket:
+        key: BucketKey = self._route_buckets.get(route, (route, ""))
+        bucket: RateLimitBucket | None = self._buckets.get(key)
+        if bucket is None:
+            bucket = RateLimitBucket(bucket_id=key[0], routes={route})
+            self._buckets[key] = bucket
+        return bucket
+
+    def get_delay(self, route: str) -> float:
+        """Return the seconds a request on *route* must wait right now."""
+        with self._lock:
+            return self._get_bucket(route).delay(time.monotonic())
+
+    def reserve(self, route: str) -> float:
+        """Reserve a request slot on *route* without sleeping.
+
+        Returns:
+            float: Seconds to wait before sending; ``0.0`` means a slot was reserved.
+        """
+        with self._lock:
+            bucket: RateLimitBucket = self._get_bucket(route)
+            now: float = time.monotonic()
+            delay: float = bucket.delay(now)
+            if delay > 0:
+                return delay
+
+            if bucket.remaining is not None:
+                if bucket.reset_at is not None and bucket.reset_at <= now and bucket.limit is not None:
+                    # The window has passed; Discord will have refilled the bucket.
+                    bucket.remaining = bucket.limit
+                bucket.remaining = max(bucket.remaining - 1, 0)
+            return 0.0
+
+    def acquire(self, route: str, *, block: bool = True) -> float:
+        """Reserve a slot in *route*'s bucket, waiting for it to reset if it is exhausted.
+
+        Only the calling thread sleeps; other webhooks keep sending. While the global
+        circuit breaker is open, every route waits.
+
+        Args:
+            route: Route key from ``get_rate_limit_route``.
+            block: When False, raise ``RateLimitedError`` instead of sleeping.
+
+        Returns:
+            float: Total seconds spent waiting.
+
+        Raises:
+            RateLimitedError: If *block* is False and the bucket is exhausted or the breaker is open.
+        """
+        waited: float = self.breaker.check(block=block)
+        while (delay := self.reserve(route)) > 0:
+            if not block:
+                raise RateLimitedError(route, delay)
+            logger.debug("Rate limit bucket for %s is exhausted; waiting %.2fs", mask_webhook_url(route), delay)
+            time.sleep(delay)
+            waited += delay
+
+        if waited:
+            with self._lock:
+                self._stats.waits += 1
+                self._stats.seconds_waited += waited
+        return waited
+
+    def record_deferral(self, seconds: float) -> None:
+        """Count a request that was rescheduled instead of waiting for its bucket."""
+        with self._lock:
+            self._stats.deferred_requests += 1
+            self._stats.seconds_deferred += max(seconds, 0.0)
+
+    def stats(self) -> RateLimitStats:
+        """Return a snapshot of the rate-limit counters."""
+        with self._lock:
+            return RateLimitStats(
+                rate_limited_responses=self._stats.rate_limited_responses,
+                waits=self._stats.waits,
+                seconds_waited=self._stats.seconds_waited,
+                deferred_requests=self._stats.deferred_requests,
+                seconds_deferred=self._stats.seconds_deferred,
+            )
+
+    def update(
+        self,
+        route: str,
+        headers: Mapping[str, str],
+        *,
+        status_code: int,
+        retry_after: float | None = None,
+        is_global: bool = False,
+    ) -> None:
+        """Record the bucket state Discord returned for a request on *route*.
+
+        Args:
+            route: Route key from ``get_rate_limit_route``.
+            headers: Response headers.
+            status_code: Response status code.
+            retry_after: Seconds to wait from a 429 response body or ``Retry-After`` header.
+            is_global: Whether a 429 response body said ``"global": true``.
+        """
+        bucket_header: str | None = _header_value(headers, "x-ratelimit-bucket")
+        limit: int | None = _header_int(headers, "x-ratelimit-limit")
+        remaining: int | None = _header_int(headers, "x-ratelimit-remaining")
+        reset_after: float | None = _header_float(headers, "x-ratelimit-reset-after")
+        scope: str | None = _header_value(headers, "x-ratelimit-scope")
+
+        if status_code == 429:  # ruff:ignore[magic-value-comparison]
+            is_global = (
+                is_global
+                or (_header_value(headers, "x-ratelimit-global") or "").lower() == "true"
+                or scope == "global"
+                # Cloudflare bans come without any of Discord's rate-limit headers.
+                or (bucket_header is None and scope is None)
+            )
+        self.breaker.record(status_code, is_global=is_global, retry_after=retry_after)
+
+        with self._lock:
+            now: float = time.monotonic()
+            if bucket_header:
+                key: BucketKey = (bucket_header, get_webhook_id(route))
+                if self._route_buckets.get(route) != key:
+                    self._move_route(route, key)
+
+            bucket: RateLimitBucket = self._get_bucket(route)
+            bucket.last_status_code = status_code
+            if limit is not None:
+                bucket.limit = limit
+            if remaining is not None:
+                bucket.remaining = remaining
+            if reset_after is not None:
+                bucket.reset_at = now + reset_after
+
+            if status_code == 429:  # ruff:ignore[magic-value-comparison]
+                bucket.rate_limited_count += 1
+                self._stats.rate_limited_responses += 1
+                bucket.remaining = 0
+                wait_seconds: float | None = retry_after if retry_after is not None else reset_after
+                if wait_seconds is not None:
+                    bucket.reset_at = max(bucket.reset_at or 0.0, now + wait_seconds)
+
+    def _move_route(self, route: str, key: BucketKey) -> None:
+        """Point *route* at the bucket Discord reported, merging any placeholder state."""
+        previous_key: BucketKey = self._route_buckets.get(route, (route, ""))
+        previous: RateLimitBucket | None = self._buckets.get(previous_key)
+        if previous is not None:
+            previous.routes.discard(route)
+            if not previous.routes:
+                del self._buckets[previous_key]
+
+        self._route_buckets[route] = key
+        bucket: RateLimitBucket = self._buckets.setdefault(key, RateLimitBucket(bucket_id=key[0]))
+        bucket.routes.add(route)
+
+    def snapshot(self) -> list[dict[str, str | int | float | None]]:
+        """Return the state of every known bucket for display in the web UI.
+
+        Returns:
+            list[dict]: One row per bucket, most constrained first.
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            rows: list[dict[str, str | int | float | None]] = [
+                {
+                    "bucket": bucket.bucket_id,
+                    "routes": ", ".join(sorted(mask_webhook_url(route) for route in bucket.routes)),
+                    "limit": bucket.limit,
+                    "remaining": bucket.remaining,
+                    "resets_in": round(max(bucket.reset_at - now, 0.0), 2) if bucket.reset_at is not None else None,
+                    "exhausted": bucket.delay(now) > 0,
+                    "last_status_code": bucket.last_status_code,
+                    "rate_limited_count": bucket.rate_limited_count,
+                }
+                for bucket in self._buckets.values()
+            ]
+
+        rows.sort(key=lambda row: (not row["exhausted"], row["remaining"] if row["remaining"] is not None else 1 << 30))
+        return rows
+
+    def clear(self) -> None:
+        """Forget every bucket and reset the counters."""
+        with self._lock:
+            self._route_buckets.clear()
+            self._buckets.clear()
+            self._stats = RateLimitStats()
+
+
+@lru_cache(maxsize=1)
+def get_rate_limit_manager() -> RateLimitManager:
+    """Get the process-wide rate-limit manager.
+
+    Returns:
+        RateLimitManager: The shared manager.
+    """
+    return RateLimitManager()
@@ -0,0 +1,666 @@
+"""Sent Discord messages, kept so they can be edited when their entry changes.
+
+Each record describes one entry sent to one webhook: the Discord message id,
+the payload it was rendered from and Discord's response. Records are stored in
+the ``sent_webhooks`` table of the state database, keyed by
+``(feed_url, entry_id, webhook_url)``, so saving a record after a send only
+touches that one row.
+
+Payloads are not stored in the records themselves. Each distinct payload is
+stored once, zlib-compressed, in ``sent_webhook_payloads`` under its
+``payload_hash``, and records only keep the hash. An entry sent to several
+webhooks shares one payload, and a record's ``payload_hash`` always matches
+its payload. The store adds the payload back when it loads a record.
+
+Older versions kept every record in one JSON list in the global
+``sent_webhooks`` reader tag. ``SentWebhookStore.import_records`` moves them
+into the table once; see ``discord_rss_bot.feeds.migrate_sent_webhooks_tag``.
+
+The history is compacted in the background (``compact_sent_webhook_history``)
+so it does not grow forever. Tune it with:
+
+- ``SENT_WEBHOOKS_MAX_AGE_DAYS``: Forget messages that were not sent or edited
+  for this many days (default 90). Their entries can no longer be edited.
+- ``SENT_WEBHOOKS_MAX_PER_FEED``: Keep at most this many messages per feed,
+  newest first (default 1000).
+- ``SENT_WEBHOOKS_KEEP_RESPONSES``: Keep Discord's full response of successful
+  sends and edits. By default only the message id and payload are kept.
+
+Feeds that change an entry on every crawl would otherwise edit its message
+over and over, so edits are rate limited per message. An edit that comes too
+soon is held back (``edit_deferred_until``) and later modifications are
+coalesced into it; ``send_deferred_edits`` in ``discord_rss_bot.feeds`` sends
+it once it is due. Tune it with:
+
+- ``SENT_WEBHOOKS_EDIT_DEBOUNCE_MINUTES``: Minimum time between a message being
+  sent or edited and its next edit (default 10).
+- ``SENT_WEBHOOKS_MAX_EDITS_PER_HOUR``: Edits of one message per rolling hour
+  (default 6).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from dataclasses import replace
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from discord_rss_bot.payloads import canonical_json
+from discord_rss_bot.payloads import hash_canonical_json
+from discord_rss_bot.settings import env_bool
+from discord_rss_bot.settings import env_int
+from discord_rss_bot.state_db import get_state_db
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Iterable
+
+    from discord_rss_bot.state_db import StateDatabase
+    from discord_rss_bot.webhook import JsonObject
+    from discord_rss_bot.webhook import JsonValue
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Entries looked up per query; two parameters each, well below SQLite's parameter limit.
+LOOKUP_CHUNK_SIZE: int = 400
+
+DEFAULT_MAX_AGE_DAYS: int = 90
+DEFAULT_MAX_RECORDS_PER_FEED: int = 1000
+DEFAULT_EDIT_DEBOUNCE_MINUTES: int = 10
+DEFAULT_MAX_EDITS_PER_HOUR: int = 6
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    """How much sent message history is kept."""
+
+    max_age_days: int = DEFAULT_MAX_AGE_DAYS
+    max_records_per_feed: int = DEFAULT_MAX_RECORDS_PER_FEED
+    keep_responses: bool = False
+
+    @classmethod
+    def from_env(cls) -> RetentionPolicy:
+        """Build the retention policy from environment variables.
+
+        Returns:
+            The resolved policy.
+        """
+        return cls(
+            max_age_days=env_int("SENT_WEBHOOKS_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS),
+            max_records_per_feed=env_int("SENT_WEBHOOKS_MAX_PER_FEED", DEFAULT_MAX_RECORDS_PER_FEED),
+            keep_responses=env_bool("SENT_WEBHOOKS_KEEP_RESPONSES"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class EditLimits:
+    """How often one sent message may be edited."""
+
+    debounce_minutes: int = DEFAULT_EDIT_DEBOUNCE_MINUTES
+    max_edits_per_hour: int = DEFAULT_MAX_EDITS_PER_HOUR
+
+    @classmethod
+    def from_env(cls) -> EditLimits:
+        """Build the edit limits from environment variables.
+
+        Returns:
+            The resolved limits.
+        """
+        return cls(
+            debounce_minutes=env_int("SENT_WEBHOOKS_EDIT_DEBOUNCE_MINUTES", DEFAULT_EDIT_DEBOUNCE_MINUTES),
+            max_edits_per_hour=env_int("SENT_WEBHOOKS_MAX_EDITS_PER_HOUR", DEFAULT_MAX_EDITS_PER_HOUR),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CompactionStats:
+    """What one compaction of the sent message history removed."""
+
+    expired: int = 0
+    trimmed: int = 0
+    stripped: int = 0
+    moved_payloads: int = 0
+    unreferenced_payloads: int = 0
+    vacuumed: bool = False
+
+
+SENT_WEBHOOK_STATUSES: tuple[str, ...] = ("sent", "failed", "deferred")
+
+
+@dataclass(frozen=True, slots=True)
+class SentWebhookFilter:
+    """Which sent messages to list; empty fields match everything.
+
+    ``since`` and ``until`` bound the time the message was last sent or edited, as UTC ISO 8601 prefixes such
+    as ``2026-05-08``: ``since`` is inclusive and ``until`` exclusive.
+    """
+
+    feed_url: str = ""
+    webhook_url: str = ""
+    status: str = ""
+    since: str = ""
+    until: str = ""
+
+    def to_sql(self) -> tuple[str, dict[str, object]]:
+        """Return the ``WHERE`` clause and its named parameters.
+
+        Returns:
+            tuple[str, dict[str, object]]: The clause, ``1`` if nothing is filtered, and its parameters.
+        """
+        conditions: list[str] = []
+        if self.feed_url:
+            conditions.append("feed_url = :feed_url")
+        if self.webhook_url:
+            conditions.append("webhook_url = :webhook_url")
+        if self.since:
+            conditions.append("last_activity_at >= :since")
+        if self.until:
+            conditions.append("last_activity_at < :until")
+        if self.status == "sent":
+            conditions.append("failed = 0")
+        elif self.status == "failed":
+            conditions.append("failed = 1")
+        elif self.status == "deferred":
+            conditions.append("edit_due_at != ''")
+        parameters: dict[str, object] = {
+            "feed_url": self.feed_url,
+            "webhook_url": self.webhook_url,
+            "since": self.since,
+            "until": self.until,
+        }
+        return " AND ".join(conditions) or "1", parameters
+
+
+@dataclass(frozen=True, slots=True)
+class SentWebhookPage:
+    """One page of sent message summaries, newest first."""
+
+    records: list[JsonObject]
+    next_cursor: str = ""
+
+
+type _Row = tuple[str, str, str, str, str, str, bool, str, str | None, int | None, str]
+
+# Characters of a message's content shown on the sent webhooks page.
+CONTENT_PREVIEW_LENGTH: int = 500
+
+# The compressed payload of a record, loaded next to it. Records without a payload have no payload hash.
+_PAYLOAD_BLOB_COLUMN: str = """
+    (
+        SELECT payload FROM sent_webhook_payloads AS payloads
+        WHERE payloads.payload_hash = sent_webhooks.payload_hash
+    ) AS payload_blob
+"""
+
+# What the sent webhooks page shows of each record. The payload and Discord's response are left out; they are
+# loaded when a row is expanded.
+_SUMMARY_COLUMNS: str = """
+    rowid, feed_url, entry_id, webhook_url, message_id, last_activity_at,
+    json_extract(record, '$.feed_title') AS feed_title,
+    json_extract(record, '$.entry_title') AS entry_title,
+    json_extract(record, '$.entry_link') AS entry_link,
+    json_extract(record, '$.delivery_mode') AS delivery_mode,
+    json_extract(record, '$.last_status_code') AS last_status_code,
+    json_extract(record, '$.last_error') AS last_error,
+    json_extract(record, '$.update_count') AS update_count,
+    json_extract(record, '$.deferred_edit_count') AS deferred_edit_count,
+    NULLIF(edit_due_at, '') AS edit_deferred_until,
+    (
+        SELECT COUNT(*) FROM json_each(record, '$.recent_edit_times') WHERE value > :recent_edit_cutoff
+    ) AS recent_edit_count,
+    content_preview, embed_count
+"""
+
+# Updates the row in place, so records keep their position (rowid) in send order.
+_UPSERT_SQL: str = """
+    INSERT INTO sent_webhooks (
+        feed_url, entry_id, webhook_url, message_id, last_activity_at, edit_due_at, failed, payload_hash,
+        content_preview, embed_count, record
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (feed_url, entry_id, webhook_url) DO UPDATE SET
+        message_id = excluded.message_id,
+        last_activity_at = excluded.last_activity_at,
+        edit_due_at = excluded.edit_due_at,
+        failed = excluded.failed,
+        payload_hash = excluded.payload_hash,
+        content_preview = excluded.content_preview,
+        embed_count = excluded.embed_count,
+        record = excluded.record
+"""
+
+_INSERT_PAYLOAD_SQL: str = "INSERT OR IGNORE INTO sent_webhook_payloads (payload_hash, payload) VALUES (?, ?)"
+
+
+def get_record_key(record: JsonObject) -> tuple[str, str, str] | None:
+    """Return the ``(feed_url, entry_id, webhook_url)`` a record is stored under.
+
+    Returns:
+        tuple[str, str, str] | None: The key, or None if the record is missing one of its parts.
+    """
+    key: list[JsonValue] = [record.get("feed_url"), record.get("entry_id"), record.get("webhook_url")]
+    if not all(isinstance(part, str) and part for part in key):
+        return None
+    return str(key[0]), str(key[1]), str(key[2])
+
+
+def _get_rows(records: Iterable[JsonValue]) -> tuple[list[_Row], dict[str, bytes]]:
+    rows: list[_Row] = []
+    payloads: dict[str, bytes] = {}
+    for record in records:
+        if not isinstance(record, dict) or (key := get_record_key(record)) is None:
+            continue
+        payload: JsonValue = record.get("payload")
+        payload_hash: str = ""
+        if isinstance(payload, dict):
+            text: str = canonical_json(payload)
+            payload_hash = hash_canonical_json(text)
+            if payload_hash not in payloads:
+                payloads[payload_hash] = zlib.compress(text.encode())
+            record = {name: value for name, value in record.items() if name != "payload"}  # ruff:ignore[redefined-loop-name]
+            record["payload_hash"] = payload_hash
+        rows.append(_get_row(record, key, payload_hash, payload if isinstance(payload, dict) else {}))
+    return rows, payloads
+
+
+def _load_record(row: sqlite3.Row) -> JsonObject:
+    record: JsonObject = json.loads(row["record"])
+    if row["payload_blob"] is not None:
+        record["payload"] = json.loads(zlib.decompress(row["payload_blob"]))
+    return record
+
+
+def _get_row(record: JsonObject, key: tuple[str, str, str], payload_hash: str, payload: JsonObject) -> _Row:
+    message_id: JsonValue = record.get("message_id")
+    last_activity_at: JsonValue = record.get("last_updated_at") or record.get("last_sent_at")
+    edit_due_at: JsonValue = record.get("edit_deferred_until")
+    status_code: JsonValue = record.get("last_status_code")
+    content: JsonValue = payload.get("content")
+    embeds: JsonValue = payload.get("embeds")
+    # The last send or edit failed unless Discord answered 2xx and no error was saved.
+    failed: bool = not (
+        isinstance(status_code, int) and 200 <= status_code < 300 and not record.get("last_error")  # ruff:ignore[magic-value-comparison]
+    )
+    return (
+        *key,
+        message_id if isinstance(message_id, str) else "",
+        last_activity_at if isinstance(last_activity_at, str) else "",
+        edit_due_at if isinstance(edit_due_at, str) else "",
+        failed,
+        payload_hash,
+        content[:CONTENT_PREVIEW_LENGTH] if isinstance(content, str) else None,
+        len(embeds) if isinstance(embeds, list) else None,
+        json.dumps(record, default=str),
+    )
+
+
+def _parse_timestamp(value: JsonValue) -> datetime | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def get_recent_edit_times(record: JsonObject, *, now: datetime) -> list[str]:
+    """Return when the record's message was edited during the last hour, oldest first.
+
+    Returns:
+        list[str]: UTC ISO 8601 timestamps.
+    """
+    recent_edit_times: JsonValue = record.get("recent_edit_times")
+    if not isinstance(recent_edit_times, list):
+        return []
+    cutoff: str = (now - timedelta(hours=1)).isoformat()
+    return [edited_at for edited_at in recent_edit_times if isinstance(edited_at, str) and edited_at > cutoff]
+
+
+def get_edit_deferred_until(record: JsonObject, limits: EditLimits, *, now: datetime) -> datetime | None:
+    """Return when the record's message may be edited next, if that is later than *now*.
+
+    Returns:
+        datetime | None: When the edit is due, or None if it may be sent now.
+    """
+    allowed_at: list[datetime] = []
+    if (last_updated_at := _parse_timestamp(record.get("last_updated_at"))) is not None:
+        allowed_at.append(last_updated_at + timedelta(minutes=limits.debounce_minutes))
+
+    recent_edit_times: list[str] = get_recent_edit_times(record, now=now)
+    if len(recent_edit_times) >= limits.max_edits_per_hour:
+        oldest_counted: datetime | None = _parse_timestamp(recent_edit_times[-limits.max_edits_per_hour])
+        if oldest_counted is not None:
+            allowed_at.append(oldest_counted + timedelta(hours=1))
+
+    due_at: datetime | None = max(allowed_at, default=None)
+    return due_at if due_at is not None and due_at > now else None
+
+
+class SentWebhookStore:
+    """Records of sent Discord messages backed by the ``sent_webhooks`` table."""
+
+    def __init__(self, db: StateDatabase) -> None:  # ruff:ignore[undocumented-public-init]
+        self.db: StateDatabase = db
+
+    def get(self, feed_url: str, entry_id: str, webhook_url: str) -> JsonObject | None:
+        """Return the record of an entry sent to a webhook, if there is one."""
+        rows: list[sqlite3.Row] = self.db.query(
+            f"SELECT record, {_PAYLOAD_BLOB_COLUMN} FROM sent_webhooks"  # ruff:ignore[hardcoded-sql-expression]
+            " WHERE feed_url = ? AND entry_id = ? AND webhook_url = ?",
+            (feed_url, entry_id, webhook_url),
+        )
+        return _load_record(rows[0]) if rows else None
+
+    def get_for_entries(self, entry_keys: Iterable[tuple[str, str]]) -> dict[tuple[str, str], list[JsonObject]]:
+        """Return the records of the given ``(feed_url, entry_id)`` pairs, using the primary key index.
+
+        Returns:
+            dict[tuple[str, str], list[JsonObject]]: Records per entry that has any, one per webhook.
+        """
+        keys: list[tuple[str, str]] = list(dict.fromkeys(entry_keys))
+        records: dict[tuple[str, str], list[JsonObject]] = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            chunk: list[tuple[str, str]] = keys[start : start + LOOKUP_CHUNK_SIZE]
+            values: str = ", ".join("(?, ?)" for _ in chunk)
+            sql: str = (
+                f"SELECT feed_url, entry_id, record, {_PAYLOAD_BLOB_COLUMN} FROM sent_webhooks"  # ruff:ignore[hardcoded-sql-expression]
+                f" WHERE (feed_url, entry_id) IN (VALUES {values}) ORDER BY rowid"
+            )
+            for row in self.db.query(sql, tuple(part for key in chunk for part in key)):
+                records.setdefault((row["feed_url"], row["entry_id"]), []).append(_load_record(row))
+        return records
+
+    def get_message_records(self, webhook_url: str, message_id: str) -> list[JsonObject]:
+        """Return every record that points at one Discord message, e.g. the entries packed into it."""
+        rows: list[sqlite3.Row] = self.db.query(
+            f"SELECT record, {_PAYLOAD_BLOB_COLUMN} FROM sent_webhooks"  # ruff:ignore[hardcoded-sql-expression]
+            " WHERE webhook_url = ? AND message_id = ? ORDER BY rowid",
+            (webhook_url, message_id),
+        )
+        return [_load_record(row) for row in rows]
+
+    def get_all(self) -> list[JsonObject]:
+        """Return every record, oldest first."""
+        rows: list[sqlite3.Row] = self.db.query(
+            f"SELECT record, {_PAYLOAD_BLOB_COLUMN} FROM sent_webhooks ORDER BY rowid",  # ruff:ignore[hardcoded-sql-expression]
+        )
+        return [_load_record(row) for row in rows]
+
+    def upsert(self, record: JsonObject) -> None:
+        """Save the record of a sent message, replacing the record of an earlier send of the same entry.
+
+        The earlier record's ``first_sent_at`` and ``update_count`` are kept.
+        """
+        key: tuple[str, str, str] | None = get_record_key(record)
+        if key is None:
+            logger.warning("Not saving a sent webhook record without feed, entry and webhook: %s", record)
+            return
+
+        with self.db.transaction() as connection:
+            row: sqlite3.Row | None = connection.execute(
+                "SELECT record FROM sent_webhooks WHERE feed_url = ? AND entry_id = ? AND webhook_url = ?",
+                key,
+            ).fetchone()
+            if row is not None:
+                existing_record: JsonObject = json.loads(row["record"])
+                record = {
+                    **record,
+                    "first_sent_at": existing_record.get("first_sent_at") or record.get("first_sent_at"),
+                    "update_count": existing_record.get("update_count") or 0,
+                }
+            rows, payloads = _get_rows([record])
+            connection.executemany(_INSERT_PAYLOAD_SQL, payloads.items())
+            connection.executemany(_UPSERT_SQL, rows)
+
+    def save(self, records: Iterable[JsonObject]) -> None:
+        """Overwrite the given records, e.g. after their messages were edited."""
+        rows, payloads = _get_rows(records)
+        with self.db.transaction() as connection:
+            connection.executemany(_INSERT_PAYLOAD_SQL, payloads.items())
+            connection.executemany(_UPSERT_SQL, rows)
+
+    def import_records(self, records: Iterable[JsonValue]) -> int:
+        """Add records from the old ``sent_webhooks`` tag, keeping any record that is already stored.
+
+        Returns:
+            int: Number of records added.
+        """
+        rows, payloads = _get_rows(records)
+        with self.db.transaction() as connection:
+            # Payloads of records that were already stored stay unused until compaction deletes them.
+            connection.executemany(_INSERT_PAYLOAD_SQL, payloads.items())
+            before: int = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO sent_webhooks"
+                " (feed_url, entry_id, webhook_url, message_id, last_activity_at, edit_due_at, failed, payload_hash,"
+                " content_preview, embed_count, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return connection.total_changes - before
+
+    def get_due_edits(self, *, now: datetime | None = None) -> list[tuple[str, str]]:
+        """Return the ``(feed_url, entry_id)`` of entries with a held-back message edit that may be sent now.
+
+        Returns:
+            list[tuple[str, str]]: Entry keys, in send order.
+        """
+        rows: list[sqlite3.Row] = self.db.query(
+            "SELECT feed_url, entry_id FROM sent_webhooks WHERE edit_due_at != '' AND edit_due_at <= ?"
+            " GROUP BY feed_url, entry_id ORDER BY MIN(rowid)",
+            ((now or datetime.now(tz=UTC)).isoformat(),),
+        )
+        return [(row["feed_url"], row["entry_id"]) for row in rows]
+
+    def clear_due_edits(self, *, now: datetime | None = None) -> int:
+        """Forget held-back edits that were due at *now*, e.g. because their entry was deleted.
+
+        Returns:
+            int: Number of records whose held-back edit was dropped.
+        """
+        with self.db.transaction() as connection:
+            return connection.execute(
+                "UPDATE sent_webhooks SET edit_due_at = '', record = json_set(record, '$.edit_deferred_until', '')"
+                " WHERE edit_due_at != '' AND edit_due_at <= ?",
+                ((now or datetime.now(tz=UTC)).isoformat(),),
+            ).rowcount
+
+    def count(self, filters: SentWebhookFilter | None = None) -> int:
+        """Return how many sent messages are stored, optionally only those matching *filters*."""
+        where, parameters = (filters or SentWebhookFilter()).to_sql()
+        return int(self.db.query(f"SELECT COUNT(*) FROM sent_webhooks WHERE {where}", parameters)[0][0])  # ruff:ignore[hardcoded-sql-expression]
+
+    def get_page(
+        self,
+        filters: SentWebhookFilter | None = None,
+        *,
+        starting_after: str = "",
+        limit: int = 50,
+        now: datetime | None = None,
+    ) -> SentWebhookPage:
+        """Return summaries of the newest sent messages matching *filters*, one page at a time.
+
+        Pages are keyset paginated on ``(last_activity_at, rowid)``, so a page costs the same however deep it
+        is and messages sent in the meantime do not shift later pages.
+
+        Args:
+            filters: Which messages to list.
+            starting_after: ``next_cursor`` of the previous page; empty for the first page.
+            limit: Messages per page.
+            now: Current time, used to count the edits of the last hour.
+
+        Returns:
+            SentWebhookPage: The page and the cursor of the next one.
+        """
+        where, parameters = (filters or SentWebhookFilter()).to_sql()
+        parameters = {
+            **parameters,
+            "recent_edit_cutoff": ((now or datetime.now(tz=UTC)) - timedelta(hours=1)).isoformat(),
+            "limit": limit + 1,
+        }
+        last_activity_at, _, rowid = starting_after.rpartition("|")
+        if rowid.isdigit():
+            where = f"{where} AND (last_activity_at, rowid) < (:after_activity_at, :after_rowid)"
+            parameters.update(after_activity_at=last_activity_at, after_rowid=int(rowid))
+
+        rows: list[sqlite3.Row] = self.db.query(
+            f"SELECT {_SUMMARY_COLUMNS} FROM sent_webhooks WHERE {where}"  # ruff:ignore[hardcoded-sql-expression]
+            " ORDER BY last_activity_at DESC, rowid DESC LIMIT :limit",
+            parameters,
+        )
+        records: list[JsonObject] = [dict(row) for row in rows[:limit]]
+        next_cursor: str = ""
+        if len(rows) > limit:
+            last_row: sqlite3.Row = rows[limit - 1]
+            next_cursor = f"{last_row['last_activity_at']}|{last_row['rowid']}"
+        return SentWebhookPage(records=records, next_cursor=next_cursor)
+
+    def get_feed_titles(self) -> dict[str, str]:
+        """Return the title saved with the newest message of every feed that has sent messages.
+
+        Returns:
+            dict[str, str]: Feed title, or the feed URL if no title was saved, per feed URL.
+        """
+        rows: list[sqlite3.Row] = self.db.query(
+            """
+            SELECT feed_url, (
+                SELECT json_extract(record, '$.feed_title') FROM sent_webhooks AS newest
+                WHERE newest.feed_url = feeds.feed_url ORDER BY last_activity_at DESC LIMIT 1
+            ) AS feed_title
+            FROM (SELECT DISTINCT feed_url FROM sent_webhooks) AS feeds
+            """,
+        )
+        return {row["feed_url"]: row["feed_title"] or row["feed_url"] for row in rows}
+
+    def get_storage_stats(self) -> dict[str, int]:
+        """Return how much space the history uses, for the settings page.
+
+        Returns:
+            dict[str, int]: Number and bytes of records, number and compressed bytes of distinct payloads, and
+                size of the whole state database.
+        """
+        row: sqlite3.Row = self.db.query(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM sent_webhooks),
+                (SELECT COALESCE(SUM(LENGTH(record)), 0) FROM sent_webhooks),
+                (SELECT COUNT(*) FROM sent_webhook_payloads),
+                (SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM sent_webhook_payloads)
+            """,
+        )[0]
+        return {
+            "records": int(row[0]),
+            "record_bytes": int(row[1]),
+            "payloads": int(row[2]),
+            "payload_bytes": int(row[3]),
+            "database_bytes": self.db.size_bytes,
+        }
+
+    def compact(self, policy: RetentionPolicy, *, now: datetime | None = None) -> CompactionStats:
+        """Apply a retention policy: drop old records, trim each feed's history and strip response bodies.
+
+        Payloads of records saved before payloads were stored on their own are moved out of the records, and
+        payloads no record uses any more are deleted.
+
+        Returns:
+            CompactionStats: How many records were removed or stripped and how many payloads moved or deleted.
+        """
+        cutoff: datetime = (now or datetime.now(tz=UTC)) - timedelta(days=policy.max_age_days)
+        with self.db.transaction() as connection:
+            rows, payloads = _get_rows(
+                json.loads(row["record"])
+                for row in connection.execute(
+                    "SELECT record FROM sent_webhooks"
+                    " WHERE payload_hash = '' AND json_type(record, '$.payload') = 'object'",
+                )
+            )
+            connection.executemany(_INSERT_PAYLOAD_SQL, payloads.items())
+            connection.executemany(_UPSERT_SQL, rows)
+
+            # Timestamps are stored as UTC ISO 8601 strings, which sort like the times they represent.
+            expired: int = connection.execute(
+                "DELETE FROM sent_webhooks WHERE last_activity_at != '' AND last_activity_at < ?",
+                (cutoff.isoformat(),),
+            ).rowcount
+            trimmed: int = connection.execute(
+                """
+                DELETE FROM sent_webhooks WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY feed_url ORDER BY last_activity_at DESC, rowid DESC
+                        ) AS position
+                        FROM sent_webhooks
+                    )
+                    WHERE position > ?
+                )
+                """,
+                (policy.max_records_per_feed,),
+            ).rowcount
+            stripped: int = 0
+            if not policy.keep_responses:
+                # The message id is already stored separately; the rest of a successful response is only shown
+                # on the sent webhooks page.
+                stripped = connection.execute(
+                    """
+                    UPDATE sent_webhooks
+                    SET record = json_remove(record, '$.discord_response', '$.response_text')
+                    WHERE json_extract(record, '$.last_status_code') BETWEEN 200 AND 299
+                        AND COALESCE(json_extract(record, '$.last_error'), '') = ''
+                        AND (
+                            json_type(record, '$.discord_response') IS NOT NULL
+                            OR json_type(record, '$.response_text') IS NOT NULL
+                        )
+                    """,
+                ).rowcount
+            unreferenced_payloads: int = connection.execute(
+                """
+                DELETE FROM sent_webhook_payloads WHERE NOT EXISTS (
+                    SELECT 1 FROM sent_webhooks WHERE sent_webhooks.payload_hash = sent_webhook_payloads.payload_hash
+                )
+                """,
+            ).rowcount
+
+        stats: CompactionStats = CompactionStats(
+            expired=expired,
+            trimmed=trimmed,
+            stripped=stripped,
+            moved_payloads=len(rows),
+            unreferenced_payloads=unreferenced_payloads,
+        )
+        if any((expired, trimmed, stripped, rows, unreferenced_payloads)):
+            return replace(stats, vacuumed=self.db.vacuum_if_fragmented())
+        return stats
+
+
+def get_sent_webhook_store() -> SentWebhookStore:
+    """Get the sent webhook records stored in the shared state database.
+
+    Returns:
+        SentWebhookStore: The sent webhook store.
+    """
+    return SentWebhookStore(get_state_db())
+
+
+def compact_sent_webhook_history() -> CompactionStats:
+    """Apply the configured retention policy to the sent message history; run by the scheduler.
+
+    Returns:
+        CompactionStats: How many records were removed or stripped.
+    """
+    stats: CompactionStats = get_sent_webhook_store().compact(RetentionPolicy.from_env())
+    if stats.expired or stats.trimmed or stats.stripped or stats.unreferenced_payloads:
+        logger.info(
+            "Compacted sent webhook history: %d expired, %d over the per-feed limit, %d responses dropped,"
+            " %d unused payloads deleted",
+            stats.expired,
+            stats.trimmed,
+            stats.stripped,
+            stats.unreferenced_payloads,
+        )
+    if stats.moved_payloads:
+        logger.info("Moved the payloads of %d sent webhook records into the payload store", stats.moved_payloads)
+    return stats
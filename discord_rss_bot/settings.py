@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import os
 import typing
 from functools import lru_cache
@@ -13,6 +14,8 @@ from reader import make_reader
 if typing.TYPE_CHECKING:
     from reader.types import JSONType
 
+logger: logging.Logger = logging.getLogger(__name__)
+
 data_dir: str = os.getenv("DISCORD_RSS_BOT_DATA_DIR", "").strip() or user_data_dir(
     appname="discord_rss_bot",
     appauthor="TheLovinator",
@@ -25,6 +28,43 @@ data_dir: str = os.getenv("DISCORD_RSS_BOT_DATA_DIR", "").strip() or user_data_d
 extensions_dir: str = os.getenv("EXTENSIONS_DIR", "").strip() or str(Path.cwd() / "extensions")
 
 
+def env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment.
+
+    Returns:
+        The parsed value, or *default* when unset or invalid.
+    """
+    raw: str = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(int(raw), 1)
+    except ValueError:
+        logger.warning("Invalid value for %s: %r, using %s", name, raw, default)
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a non-negative float from the environment.
+
+    Returns:
+        The parsed value, or *default* when unset or invalid.
+    """
+    raw: str = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        logger.warning("Invalid value for %s: %r, using %s", name, raw, default)
+        return default
+
+
+def env_bool(name: str) -> bool:
+    """Return whether an environment flag is switched on."""
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
 # TODO(TheLovinator): Add default things to the database and make the edible.
 default_custom_message: JSONType | str = "{{entry_title}}\n{{entry_link}}"
 default_custom_embed: dict[str, str] = {
@@ -0,0 +1,266 @@
+"""SQLite database for the bot's own delivery state.
+
+The reader database belongs to the ``reader`` library, so state that the bot
+manages itself (the delivery outbox, digest buffer, sent messages, ...) lives in a separate ``state.sqlite``
+file next to it in the data directory.
+
+The schema is versioned with ``PRAGMA user_version``: ``MIGRATIONS[n]`` upgrades
+a database from version ``n`` to ``n + 1``. Append new migrations; never edit
+one that has shipped.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from discord_rss_bot.settings import data_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+MIGRATIONS: list[str] = [
+    # 1: Durable outbox of rendered Discord messages waiting to be sent.
+    """
+    CREATE TABLE outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        feed_url TEXT NOT NULL,
+        entry_id TEXT NOT NULL,
+        webhook_url TEXT NOT NULL,
+        delivery_mode TEXT NOT NULL,
+        thread_id TEXT,
+        request_payload TEXT NOT NULL,
+        message_payload TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL,
+        created_at REAL NOT NULL,
+        last_error TEXT NOT NULL DEFAULT '',
+        UNIQUE (feed_url, entry_id, webhook_url)
+    );
+    CREATE INDEX outbox_next_attempt_at ON outbox (next_attempt_at);
+    CREATE TABLE outbox_files (
+        outbox_id INTEGER NOT NULL REFERENCES outbox (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        filename TEXT NOT NULL,
+        content BLOB NOT NULL,
+        PRIMARY KEY (outbox_id, position)
+    );
+    """,
+    # 2: Messages with the same pack key may be sent together as one multi-embed message.
+    """
+    ALTER TABLE outbox ADD COLUMN pack_key TEXT;
+    """,
+    # 3: Entries of feeds in digest mode, waiting to be sent as one summary message.
+    """
+    CREATE TABLE digest_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        feed_url TEXT NOT NULL,
+        entry_id TEXT NOT NULL,
+        webhook_url TEXT NOT NULL,
+        line TEXT NOT NULL,
+        added_at REAL NOT NULL,
+        UNIQUE (feed_url, entry_id, webhook_url)
+    );
+    """,
+    # 4: Messages that ran out of attempts or that Discord rejected, kept so they can be replayed.
+    """
+    CREATE TABLE dead_letters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        feed_url TEXT NOT NULL,
+        entry_id TEXT NOT NULL,
+        webhook_url TEXT NOT NULL,
+        delivery_mode TEXT NOT NULL,
+        thread_id TEXT,
+        request_payload TEXT NOT NULL,
+        message_payload TEXT NOT NULL,
+        pack_key TEXT,
+        attempts INTEGER NOT NULL,
+        status_code INTEGER,
+        response_body TEXT NOT NULL DEFAULT '',
+        last_error TEXT NOT NULL DEFAULT '',
+        created_at REAL NOT NULL,
+        failed_at REAL NOT NULL
+    );
+    CREATE INDEX dead_letters_feed_url ON dead_letters (feed_url);
+    CREATE INDEX dead_letters_webhook_url ON dead_letters (webhook_url);
+    CREATE TABLE dead_letter_files (
+        dead_letter_id INTEGER NOT NULL REFERENCES dead_letters (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        filename TEXT NOT NULL,
+        content BLOB NOT NULL,
+        PRIMARY KEY (dead_letter_id, position)
+    );
+    """,
+    # 5: Sent Discord messages kept for later edits, previously one JSON list in the global sent_webhooks tag.
+    """
+    CREATE TABLE sent_webhooks (
+        feed_url TEXT NOT NULL,
+        entry_id TEXT NOT NULL,
+        webhook_url TEXT NOT NULL,
+        message_id TEXT NOT NULL DEFAULT '',
+        last_activity_at TEXT NOT NULL DEFAULT '',
+        record TEXT NOT NULL,
+        PRIMARY KEY (feed_url, entry_id, webhook_url)
+    );
+    CREATE INDEX sent_webhooks_message ON sent_webhooks (webhook_url, message_id);
+    CREATE INDEX sent_webhooks_last_activity_at ON sent_webhooks (last_activity_at);
+    """,
+    # 6: When a message edit held back by the edit debounce or budget may be sent.
+    """
+    ALTER TABLE sent_webhooks ADD COLUMN edit_due_at TEXT NOT NULL DEFAULT '';
+    CREATE INDEX sent_webhooks_edit_due_at ON sent_webhooks (edit_due_at) WHERE edit_due_at != '';
+    """,
+    # 7: Page through sent messages newest first, filtered by feed, webhook or whether the last send or edit failed.
+    """
+    ALTER TABLE sent_webhooks ADD COLUMN failed INTEGER NOT NULL DEFAULT 0;
+    UPDATE sent_webhooks SET failed = NOT (
+        COALESCE(json_extract(record, '$.last_status_code'), 0) BETWEEN 200 AND 299
+        AND COALESCE(json_extract(record, '$.last_error'), '') = ''
+    );
+    CREATE INDEX sent_webhooks_feed_activity ON sent_webhooks (feed_url, last_activity_at);
+    CREATE INDEX sent_webhooks_webhook_activity ON sent_webhooks (webhook_url, last_activity_at);
+    CREATE INDEX sent_webhooks_failed_activity ON sent_webhooks (failed, last_activity_at);
+    """,
+    # 8: Payloads of sent messages, compressed and stored once per distinct payload instead of in every record.
+    """
+    CREATE TABLE sent_webhook_payloads (
+        payload_hash TEXT PRIMARY KEY,
+        payload BLOB NOT NULL
+    );
+    ALTER TABLE sent_webhooks ADD COLUMN payload_hash TEXT NOT NULL DEFAULT '';
+    CREATE INDEX sent_webhooks_payload_hash ON sent_webhooks (payload_hash);
+    """,
+    # 9: Find earlier queued messages for the same webhook, which hold back the later ones until they are sent.
+    """
+    CREATE INDEX outbox_webhook_url ON outbox (webhook_url, id);
+    """,
+    # 10: What the sent webhooks page shows of a payload, so listing messages does not decompress every payload.
+    """
+    ALTER TABLE sent_webhooks ADD COLUMN content_preview TEXT;
+    ALTER TABLE sent_webhooks ADD COLUMN embed_count INTEGER;
+    UPDATE sent_webhooks SET
+        content_preview = substr(json_extract(payloads.payload, '$.content'), 1, 500),
+        embed_count = json_array_length(payloads.payload, '$.embeds')
+    FROM (
+        SELECT payload_hash, CAST(zlib_decompress(payload) AS TEXT) AS payload FROM sent_webhook_payloads
+    ) AS payloads
+    WHERE payloads.payload_hash = sent_webhooks.payload_hash;
+    UPDATE sent_webhooks SET
+        content_preview = substr(json_extract(record, '$.payload.content'), 1, 500),
+        embed_count = json_array_length(record, '$.payload.embeds')
+    WHERE payload_hash = '';
+    """,
+]
+
+
+class StateDatabase:
+    """A single SQLite connection shared between threads behind a lock."""
+
+    def __init__(self, path: Path) -> None:  # ruff:ignore[undocumented-public-init]
+        self.path: Path = path
+        self._lock: threading.RLock = threading.RLock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30.0,
+        )
+        self._connection.row_factory = sqlite3.Row
+        # Lets migrations read the compressed payloads of sent messages.
+        self._connection.create_function("zlib_decompress", 1, zlib.decompress, deterministic=True)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._migrate()
+
+    @property
+    def schema_version(self) -> int:
+        """Version of the schema the database has been migrated to."""
+        with self._lock:
+            row: sqlite3.Row = self._connection.execute("PRAGMA user_version").fetchone()
+            return int(row[0])
+
+    def _migrate(self) -> None:
+        with self._lock:
+            version: int = self.schema_version
+            for target_version, script in enumerate(MIGRATIONS[version:], start=version + 1):
+                logger.info("Migrating %s to schema version %d", self.path, target_version)
+                with self.transaction() as connection:
+                    for statement in script.split(";"):
+                        if statement.strip():
+                            connection.execute(statement)
+                    connection.execute(f"PRAGMA user_version = {target_version:d}")
+
+    @contextmanager
+    def transaction(self) -> Generator[sqlite3.Connection]:
+        """Run statements in one write transaction, rolling back on error.
+
+        Yields:
+            The shared connection; do not keep it after the block ends.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def query(self, sql: str, parameters: tuple[object, ...] | dict[str, object] = ()) -> list[sqlite3.Row]:
+        """Run a read-only statement and return every row.
+
+        Returns:
+            list[sqlite3.Row]: The result rows.
+        """
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the database file, not counting the write-ahead log."""
+        with self._lock:
+            page_count: int = self._connection.execute("PRAGMA page_count").fetchone()[0]
+            page_size: int = self._connection.execute("PRAGMA page_size").fetchone()[0]
+            return page_count * page_size
+
+    def vacuum_if_fragmented(self, min_free_ratio: float = 0.25) -> bool:
+        """Rebuild the database file when at least *min_free_ratio* of its pages are unused.
+
+        SQLite keeps the pages of deleted rows for reuse, so the file only shrinks after a ``VACUUM``.
+
+        Returns:
+            bool: True if the file was rebuilt.
+        """
+        with self._lock:
+            page_count: int = self._connection.execute("PRAGMA page_count").fetchone()[0]
+            free_pages: int = self._connection.execute("PRAGMA freelist_count").fetchone()[0]
+            if not page_count or free_pages / page_count < min_free_ratio:
+                return False
+            logger.info("Vacuuming %s: %d of %d pages are unused", self.path, free_pages, page_count)
+            self._connection.execute("VACUUM")
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+@lru_cache(maxsize=1)
+def get_state_db(custom_location: Path | None = None) -> StateDatabase:
+    """Get the bot's state database, creating and migrating it on first use.
+
+    Args:
+        custom_location: The location of the database file.
+
+    Returns:
+        StateDatabase: The shared database.
+    """
+    return StateDatabase(custom_location or Path(data_dir) / "state.sqlite")
@@ -0,0 +1,204 @@
+"""Local stand-in for Discord's webhook API used by delivery tests.
+
+The server keeps one fixed-window rate-limit bucket per webhook id and answers
+with the same ``X-RateLimit-*`` headers Discord sends, including a bucket hash
+shared by every webhook, returning 429 with a ``retry_after`` body once a
+bucket is exhausted. Set ``server_errors`` to answer the next requests for a
+webhook id with 503.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Thread
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+_WEBHOOK_PATH_RE: re.Pattern[str] = re.compile(
+    r"^/api/webhooks/(?P<webhook_id>[^/]+)/(?P<token>[^/?]+)(?:/messages/(?P<message_id>[^/?]+))?",
+)
+
+# Like Discord, every webhook reports the same bucket hash; the webhook id tells the buckets apart.
+WEBHOOK_BUCKET_HASH: str = "webhook-execute"
+
+
+@dataclass(slots=True)
+class _Bucket:
+    count: int = 0
+    reset_at: float = 0.0
+
+
+@dataclass(slots=True)
+class FakeDiscordRequest:
+    """A request received by the fake Discord server."""
+
+    method: str
+    webhook_id: str
+    message_id: str | None
+    payload: dict[str, Any]
+    received_at: float
+    status_code: int
+
+
+@dataclass
+class FakeDiscord:
+    """State shared between the fake Discord server and the test using it."""
+
+    limit: int = 5
+    window: float = 1.0
+    latency: float = 0.0
+    base_url: str = ""
+    server_errors: dict[str, int] = field(default_factory=dict)
+    requests: list[FakeDiscordRequest] = field(default_factory=list)
+    _buckets: dict[str, _Bucket] = field(default_factory=dict)
+    _next_message_id: int = 1
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def webhook_url(self, webhook_id: str | int) -> str:
+        """Return a webhook URL served by this fake."""
+        return f"{self.base_url}/api/webhooks/{webhook_id}/token-{webhook_id}"
+
+    @property
+    def rate_limited(self) -> int:
+        """Number of requests answered with 429."""
+        return sum(1 for request in self.requests if request.status_code == 429)
+
+    def handle(
+        self,
+        method: str,
+        webhook_id: str,
+        message_id: str | None,
+        payload: dict[str, Any],
+    ) -> tuple[int, dict[str, str], dict[str, Any]]:
+        """Apply the bucket for *webhook_id* and build the response.
+
+        Returns:
+            The status code, rate-limit headers, and JSON body.
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            bucket: _Bucket = self._buckets.setdefault(webhook_id, _Bucket())
+            if now >= bucket.reset_at:
+                bucket.count = 0
+                bucket.reset_at = now + self.window
+
+            reset_after: float = max(bucket.reset_at - now, 0.0)
+            headers: dict[str, str] = {
+                "X-RateLimit-Bucket": WEBHOOK_BUCKET_HASH,
+                "X-RateLimit-Limit": str(self.limit),
+                "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+                "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+            }
+
+            if self.server_errors.get(webhook_id, 0) > 0:
+                self.server_errors[webhook_id] -= 1
+                body: dict[str, Any] = {"message": "Service Unavailable"}
+                status_code: int = 503
+            elif bucket.count >= self.limit:
+                headers["X-RateLimit-Remaining"] = "0"
+                headers["X-RateLimit-Scope"] = "user"
+                body = {"message": "You are being rate limited.", "retry_after": reset_after}
+                status_code = 429
+            else:
+                bucket.count += 1
+                headers["X-RateLimit-Remaining"] = str(self.limit - bucket.count)
+                if message_id is None:
+                    message_id = str(self._next_message_id)
+                    self._next_message_id += 1
+                body = {"id": message_id, "webhook_id": webhook_id, **payload}
+                status_code = 200
+
+            self.requests.append(
+                FakeDiscordRequest(
+                    method=method,
+                    webhook_id=webhook_id,
+                    message_id=message_id,
+                    payload=payload,
+                    received_at=now,
+                    status_code=status_code,
+                ),
+            )
+        return status_code, headers, body
+
+
+class _FakeDiscordHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _FakeDiscordServer
+
+    def _handle(self) -> None:
+        length: int = int(self.headers.get("Content-Length", "0"))
+        raw_body: bytes = self.rfile.read(length)
+        match: re.Match[str] | None = _WEBHOOK_PATH_RE.match(self.path)
+        if match is None:
+            self._send(404, {}, {"message": "Unknown Webhook"})
+            return
+
+        payload: dict[str, Any] = {}
+        if self.headers.get("Content-Type", "").startswith("application/json") and raw_body:
+            payload = json.loads(raw_body)
+
+        fake: FakeDiscord = self.server.fake
+        if fake.latency:
+            time.sleep(fake.latency)
+        status_code, headers, body = fake.handle(self.command, match["webhook_id"], match["message_id"], payload)
+        self._send(status_code, headers, body)
+
+    def _send(self, status_code: int, headers: dict[str, str], body: dict[str, Any]) -> None:
+        encoded: bytes = json.dumps(body).encode()
+        self.send_response(status_code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    do_POST = _handle  # ruff:ignore[mixed-case-variable-in-class-scope]
+    do_PATCH = _handle  # ruff:ignore[mixed-case-variable-in-class-scope]
+
+    def log_message(self, _format: str, *_args: str | int) -> None:
+        """Suppress HTTP request logging during tests."""
+
+
+class _FakeDiscordServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: FakeDiscord
+
+
+@contextmanager
+def serve_fake_discord(
+    *,
+    limit: int = 5,
+    window: float = 1.0,
+    latency: float = 0.0,
+) -> Generator[FakeDiscord, None, None]:
+    """Run a fake Discord webhook API while the context is active.
+
+    Yields:
+        The fake's shared state; use ``webhook_url()`` to build URLs pointing at it.
+    """
+    with _FakeDiscordServer(("127.0.0.1", 0), _FakeDiscordHandler) as server:
+        server.fake = FakeDiscord(
+            limit=limit,
+            window=window,
+            latency=latency,
+            base_url=f"http://127.0.0.1:{server.server_port}",
+        )
+        server_thread = Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        try:
+            yield server.fake
+        finally:
+            server.shutdown()
+            server_thread.join()
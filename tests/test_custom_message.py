@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import time
 import typing
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
+from bs4 import BeautifulSoup
+from lxml.etree import HTMLPullParser
 
 from discord_rss_bot.custom_message import CustomEmbed
-from discord_rss_bot.custom_message import format_entry_html_for_discord
+from discord_rss_bot.custom_message import ParsedEntry
+from discord_rss_bot.custom_message import compile_template
 from discord_rss_bot.custom_message import get_custom_message
 from discord_rss_bot.custom_message import get_embed
 from discord_rss_bot.custom_message import get_embed_data
@@ -19,7 +23,10 @@ from discord_rss_bot.custom_message import normalize_message_username
 from discord_rss_bot.custom_message import replace_tags_in_embed
 from discord_rss_bot.custom_message import replace_tags_in_text_message
 from discord_rss_bot.custom_message import save_embed
-from discord_rss_bot.custom_message import try_to_replace
+from discord_rss_bot.html_format import MarkdownCache
+from discord_rss_bot.html_format import MarkdownCacheStats
+from discord_rss_bot.html_format import format_entry_html_for_discord
+from discord_rss_bot.is_url_valid import is_url_valid
 
 if typing.TYPE_CHECKING:
     from reader import Entry
@@ -113,6 +120,169 @@ def test_format_entry_html_for_discord_does_not_preserve_invalid_timestamp_style
     assert invalid_timestamp not in rendered
 
 
+def test_markdown_cache_converts_the_same_html_once_and_evicts_least_recently_used() -> None:
+    cache = MarkdownCache(max_size=2)
+    convert = MagicMock(side_effect=lambda text: text.upper())
+
+    assert cache.get_or_convert("<p>a</p>", convert) == "<P>A</P>"
+    assert cache.get_or_convert("<p>b</p>", convert) == "<P>B</P>"
+    assert cache.get_or_convert("<p>a</p>", convert) == "<P>A</P>"
+    assert cache.get_or_convert("<p>c</p>", convert) == "<P>C</P>"
+    assert cache.get_or_convert("<p>a</p>", convert) == "<P>A</P>"
+    assert cache.get_or_convert("<p>b</p>", convert) == "<P>B</P>"
+
+    assert [call.args[0] for call in convert.call_args_list] == ["<p>a</p>", "<p>b</p>", "<p>c</p>", "<p>b</p>"]
+    assert cache.get_stats() == MarkdownCacheStats(hits=2, misses=4, size=2, max_size=2)
+    assert cache.get_stats().hit_ratio == pytest.approx(1 / 3)
+
+    cache.clear()
+    assert cache.get_stats() == MarkdownCacheStats(hits=0, misses=0, size=0, max_size=2)
+
+
+def test_format_entry_html_for_discord_uses_the_shared_cache() -> None:
+    html_summary: str = "<p>Cached <b>summary</b> for the shared cache test</p>"
+    with patch("discord_rss_bot.html_format.BeautifulSoup", wraps=BeautifulSoup) as mock_beautiful_soup:
+        first: str = format_entry_html_for_discord(html_summary)
+        second: str = format_entry_html_for_discord(html_summary)
+
+    assert first == second == "Cached **summary** for the shared cache test"
+    mock_beautiful_soup.assert_called_once()
+
+
+def test_parsed_entry_parses_each_distinct_html_once() -> None:
+    html: str = '<p>Shared <b>body</b> for the parsed entry test</p><img src="https://example.com/shared.png">'
+    parsed_entry: ParsedEntry = ParsedEntry(summary=html, content=[SimpleNamespace(value=html)])
+
+    with (
+        patch("discord_rss_bot.html_format.BeautifulSoup", wraps=BeautifulSoup) as mock_beautiful_soup,
+        patch("discord_rss_bot.html_format.HTMLPullParser", wraps=HTMLPullParser) as mock_html_pull_parser,
+    ):
+        assert parsed_entry.first_image == "https://example.com/shared.png"
+        assert parsed_entry.html(parsed_entry.summary).markdown == "Shared **body** for the parsed entry test"
+        assert parsed_entry.html(parsed_entry.content).markdown == "Shared **body** for the parsed entry test"
+        assert parsed_entry.image_urls(limit=10) == ["https://example.com/shared.png"]
+
+    mock_beautiful_soup.assert_called_once()
+    mock_html_pull_parser.assert_called_once()
+
+
+def test_get_image_urls_stops_reading_html_once_the_limit_is_reached() -> None:
+    content: str = '<img src="https://example.com/first.jpg">' + "<p>Long post paragraph.</p>" * 5000
+    summary: str = '<img src="https://example.com/summary.jpg">'
+
+    parsers: list[MagicMock] = []
+
+    def make_parser(**kwargs: object) -> MagicMock:
+        parser = MagicMock(wraps=HTMLPullParser(**kwargs))
+        parsers.append(parser)
+        return parser
+
+    with patch("discord_rss_bot.html_format.HTMLPullParser", side_effect=make_parser):
+        assert get_first_image(summary, content) == "https://example.com/first.jpg"
+
+    assert len(parsers) == 1
+    parsers[0].feed.assert_called_once()
+    assert get_image_urls(summary, content) == ["https://example.com/first.jpg", "https://example.com/summary.jpg"]
+
+
+def test_get_image_urls_matches_beautifulsoup_on_tricky_html() -> None:
+    content: str = (
+        '<p>x<IMG SRC="https://example.com/a.jpg?w=1&amp;h=2"><img src><img alt="no source">'
+        '<svg><img src="https://example.com/svg.png"/></svg><img src="https://example.com/a.jpg?w=1&amp;h=2">'
+        '<img src="not a url"><figure><img src="https://example.com/b.jpg" srcset="x 1x"></figure>'
+    )
+
+    assert get_image_urls(None, content) == _get_image_urls_with_beautifulsoup(content)
+    assert get_image_urls(None, content) == [
+        "https://example.com/a.jpg?w=1&h=2",
+        "https://example.com/svg.png",
+        "https://example.com/b.jpg",
+    ]
+
+
+def test_get_image_urls_reads_sources_as_written() -> None:
+    content: str = (
+        '<p>Starts <t:1773461490:R></p><img src="https://example.com/<t:1773461490:R>.png">'
+        '<img src="https://example.com/a.png?q=1&amp;amp;r=2">'
+    )
+
+    assert get_image_urls(None, content) == _get_image_urls_with_beautifulsoup(content)
+    assert get_image_urls(None, content) == [
+        "https://example.com/<t:1773461490:R>.png",
+        "https://example.com/a.png?q=1&amp;r=2",
+    ]
+
+
+def _get_image_urls_with_beautifulsoup(text: str, limit: int | None = None) -> list[str]:
+    """The BeautifulSoup implementation the streaming extractor replaced, kept to compare against.
+
+    Returns:
+        Valid, de-duplicated image URLs.
+    """
+    image_urls: list[str] = []
+    for image in BeautifulSoup(text, features="lxml").find_all("img"):
+        src: str = str(image.attrs.get("src", ""))
+        if is_url_valid(src) and src not in image_urls:
+            image_urls.append(src)
+            if limit is not None and len(image_urls) >= limit:
+                break
+    return image_urls
+
+
+def _make_wordpress_post(paragraphs: int, images: int) -> str:
+    """Build HTML shaped like a long WordPress post: paragraphs with links and figures with srcsets.
+
+    Returns:
+        The post's HTML.
+    """
+    parts: list[str] = []
+    for index in range(paragraphs):
+        parts.append(
+            f'<p>Paragraph {index} with <a href="https://example.com/{index}">a link</a>, <strong>bold</strong> and '
+            f"<em>emphasised</em> text, long enough to look like a real paragraph of a real blog post.</p>",
+        )
+        if index % max(paragraphs // images, 1) == 0:
+            parts.append(
+                f'<figure class="wp-block-image size-large"><img loading="lazy" width="1024" height="576" '
+                f'src="https://example.com/wp-content/uploads/{index}.jpg" alt="" class="wp-image-{index}" '
+                f'srcset="https://example.com/wp-content/uploads/{index}-300x169.jpg 300w, '
+                f'https://example.com/wp-content/uploads/{index}-768x432.jpg 768w" '
+                f'sizes="(max-width: 1024px) 100vw, 1024px" /><figcaption>Caption {index}</figcaption></figure>',
+            )
+    return "".join(parts)
+
+
+@pytest.mark.slow
+def test_benchmark_image_extraction_on_long_posts() -> None:
+    posts: dict[str, str] = {
+        "short post": _make_wordpress_post(paragraphs=10, images=2),
+        "long post": _make_wordpress_post(paragraphs=300, images=30),
+        "very long post": _make_wordpress_post(paragraphs=2000, images=100),
+    }
+    rounds = 5
+
+    for post in posts.values():
+        assert get_image_urls(None, post) == _get_image_urls_with_beautifulsoup(post)
+        assert get_image_urls(None, post, limit=10) == _get_image_urls_with_beautifulsoup(post, limit=10)
+
+    def measure(get_urls: typing.Callable[[str], list[str]], post: str) -> float:
+        started: float = time.perf_counter()
+        for _ in range(rounds):
+            get_urls(post)
+        return time.perf_counter() - started
+
+    for name, post in posts.items():
+        before: float = measure(lambda text: _get_image_urls_with_beautifulsoup(text, limit=1), post)
+        after: float = measure(lambda text: get_image_urls(None, text, limit=1), post)
+        gallery_before: float = measure(lambda text: _get_image_urls_with_beautifulsoup(text, limit=10), post)
+        gallery_after: float = measure(lambda text: get_image_urls(None, text, limit=10), post)
+        print(  # ruff:ignore[print]
+            f"{name} ({len(post) // 1024} KiB), {rounds} rounds: first image {before * 1000:.1f}ms -> "
+            f"{after * 1000:.1f}ms, 10 images {gallery_before * 1000:.1f}ms -> {gallery_after * 1000:.1f}ms",
+        )
+        assert after < before
+
+
 @patch("discord_rss_bot.custom_message.get_custom_message")
 def test_replace_tags_in_text_message_preserves_timestamp_tags(
     mock_get_custom_message: MagicMock,
@@ -152,9 +322,92 @@ def test_replace_tags_in_embed_preserves_timestamp_tags(
         assert timestamp_tag in embed.description
 
 
-def test_try_to_replace_returns_original_message_when_replace_fails() -> None:
-    rendered = try_to_replace(typing.cast("str", None), "{{tag}}", "value")
-    assert rendered is None
+def test_compiled_template_keeps_the_tag_when_its_value_is_not_a_string() -> None:
+    rendered = compile_template("{{tag}} and {{other}}").render({"{{tag}}": None, "{{other}}": "value"})
+    assert rendered == "{{tag}} and value"
+
+
+def _render(template: str, values: dict[str, str]) -> str:
+    return compile_template(template).render(values)
+
+
+def _replace_one_tag_at_a_time(template: str, values: dict[str, str]) -> str:
+    # How tags were replaced before templates were compiled: one full scan of the template per tag.
+    for tag, value in values.items():
+        template = template.replace(tag, value)
+    return template
+
+
+def test_compiled_template_matches_replacing_one_tag_at_a_time() -> None:
+    values: dict[str, str] = {"{{entry_title}}": "Title", "{{entry_link}}": "https://example.com/1", "{{x}}": ""}
+    template = "{{{entry_title}}} [{{entry_title}}]({{entry_link}}) {{unknown}} {{ entry_title }} {{x}}{{x}}\\n"
+
+    assert _render(template, values) == _replace_one_tag_at_a_time(template, values)
+    assert _render(template, values) == "{Title} [Title](https://example.com/1) {{unknown}} {{ entry_title }} \\n"
+    assert compile_template(template) is compile_template(template)
+    assert compile_template("No tags").tags == ()
+    # Values are not searched for tags again.
+    assert _render("{{entry_link}}", {**values, "{{entry_link}}": "{{entry_title}}"}) == "{{entry_title}}"
+
+
+@pytest.mark.slow
+def test_benchmark_compiled_templates_on_long_content() -> None:
+    content: str = "".join(
+        f"Paragraph {index} with **markdown** and [a link](https://example.com/{index}).\n" for index in range(2000)
+    )
+    # Like the built-in tags, about half of the tags come after {{entry_content}}.
+    values: dict[str, str] = {f"{{{{tag_{index}}}}}": f"value {index}" for index in range(14)}
+    values["{{entry_content}}"] = content
+    values.update({f"{{{{tag_{index}}}}}": f"value {index}" for index in range(14, 28)})
+    fields: list[str] = ["{{entry_content}}\\n\\n{{tag_3}} {{tag_7}}", "{{tag_1}}", *["{{tag_2}} - {{tag_5}}"] * 9]
+    rounds = 200
+
+    for field in fields:
+        assert _render(field, values) == _replace_one_tag_at_a_time(field, values)
+
+    def measure(render: typing.Callable[[str, dict[str, str]], str]) -> float:
+        started: float = time.perf_counter()
+        for _ in range(rounds):
+            for field in fields:
+                render(field, values)
+        return time.perf_counter() - started
+
+    before: float = measure(_replace_one_tag_at_a_time)
+    after: float = measure(_render)
+    print(f"{rounds} embeds: one tag at a time {before * 1000:.1f}ms, compiled {after * 1000:.1f}ms")  # ruff:ignore[print]
+    assert after < before
+
+
+@patch("discord_rss_bot.custom_message.run_extensions")
+@patch("discord_rss_bot.custom_message.ParsedHtml")
+def test_replace_tags_only_computes_the_tags_the_template_uses(
+    mock_parsed_html: MagicMock,
+    mock_run_extensions: MagicMock,
+) -> None:
+    entry_ns: SimpleNamespace = make_entry("<p>Summary</p>")
+    entry: Entry = typing.cast("Entry", entry_ns)
+
+    rendered: str = replace_tags_in_text_message(
+        entry, MagicMock(), message_template="{{entry_title}}\\n{{entry_link}}"
+    )
+
+    assert rendered == "Entry Title\nhttps://example.com/entry-1"
+    mock_parsed_html.assert_not_called()
+    mock_run_extensions.assert_not_called()
+
+    mock_parsed_html.return_value.markdown = "Summary"
+    mock_run_extensions.return_value = {"word_count": "1"}
+    rendered = replace_tags_in_text_message(
+        entry,
+        MagicMock(),
+        message_template="{{entry_summary}} {{entry_text}} {{word_count}} {{word_count}}",
+    )
+
+    assert rendered == "Summary Summary 1 1"
+    mock_parsed_html.assert_called_once_with("<p>Summary</p>")
+    mock_parsed_html.return_value.iter_image_sources.assert_not_called()
+    mock_run_extensions.assert_called_once()
+    assert mock_run_extensions.call_args.kwargs == {"variables": ["word_count"]}
 
 
 @patch("discord_rss_bot.custom_message.get_custom_message")
@@ -175,6 +428,25 @@ def test_replace_tags_in_text_message_uses_last_content_item_and_unescapes_newli
     assert "\n" in rendered
 
 
+@patch("discord_rss_bot.custom_message.get_custom_message")
+def test_images_and_content_come_from_the_same_last_content_item(mock_get_custom_message: MagicMock) -> None:
+    mock_get_custom_message.return_value = "{{image_1}} {{entry_content}}"
+    entry_ns: SimpleNamespace = make_entry("")
+    entry_ns.content = [
+        SimpleNamespace(value='<p>Old revision</p><img src="https://example.com/old.png">'),
+        SimpleNamespace(value='<p>New revision</p><img src="https://example.com/new.png">'),
+    ]
+    entry: Entry = typing.cast("Entry", entry_ns)
+    parsed_entry: ParsedEntry = ParsedEntry.from_entry(entry)
+
+    with patch("discord_rss_bot.html_format.BeautifulSoup", wraps=BeautifulSoup) as mock_beautiful_soup:
+        rendered: str = replace_tags_in_text_message(entry, reader=MagicMock(), parsed_entry=parsed_entry)
+
+    assert rendered == "https://example.com/new.png New revision"
+    assert parsed_entry.image_urls(limit=10) == ["https://example.com/new.png"]
+    mock_beautiful_soup.assert_called_once()
+
+
 @patch("discord_rss_bot.custom_message.get_custom_message")
 def test_replace_tags_in_text_message_skips_non_string_replacement_values(
     mock_get_custom_message: MagicMock,
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from discord_rss_bot import feeds
+from discord_rss_bot.delivery import deliver_concurrently
+from discord_rss_bot.delivery import get_delivery_workers
+from discord_rss_bot.delivery import partition_by_key
+from discord_rss_bot.rate_limits import RateLimitManager
+from tests.fake_discord import serve_fake_discord
+
+
+def test_partition_by_key_keeps_order_within_each_key() -> None:
+    jobs = [("a", 1), ("b", 2), ("a", 3), ("c", 4), ("b", 5)]
+
+    assert partition_by_key(jobs) == {"a": [1, 3], "b": [2, 5], "c": [4]}
+
+
+def test_deliver_concurrently_preserves_order_per_webhook() -> None:
+    delivered: dict[str, list[int]] = {}
+    lock = threading.Lock()
+
+    def deliver(key: str, job: int) -> None:
+        time.sleep(0.001 * (job % 3))
+        with lock:
+            delivered.setdefault(key, []).append(job)
+
+    jobs = [(f"webhook-{job % 4}", job) for job in range(40)]
+    stats = deliver_concurrently(jobs, deliver, max_workers=4)
+
+    assert stats.delivered == 40
+    assert stats.lanes == 4
+    for key, order in delivered.items():
+        assert order == [job for job_key, job in jobs if job_key == key]
+
+
+def test_deliver_concurrently_drains_webhooks_in_parallel() -> None:
+    barrier = threading.Barrier(3, timeout=5)
+
+    def deliver(_key: str, _job: str) -> None:
+        # Only returns if all three lanes are running at the same time.
+        barrier.wait()
+
+    stats = deliver_concurrently([("a", "x"), ("b", "y"), ("c", "z")], deliver, max_workers=3)
+
+    assert stats.delivered == 3
+    assert stats.workers == 3
+
+
+def test_deliver_concurrently_keeps_going_after_a_failure() -> None:
+    delivered: list[str] = []
+
+    def deliver(_key: str, job: str) -> None:
+        if job == "bad":
+            msg = "boom"
+            raise ValueError(msg)
+        delivered.append(job)
+
+    stats = deliver_concurrently([("a", "first"), ("a", "bad"), ("a", "last")], deliver, max_workers=1)
+
+    assert delivered == ["first", "last"]
+    assert (stats.delivered, stats.failed) == (2, 1)
+
+
+def test_deliver_concurrently_with_one_worker_runs_on_calling_thread() -> None:
+    threads: set[str] = set()
+
+    def deliver(_key: str, _job: int) -> None:
+        threads.add(threading.current_thread().name)
+
+    stats = deliver_concurrently([("a", 1), ("b", 2)], deliver, max_workers=1)
+
+    assert threads == {threading.current_thread().name}
+    assert stats.workers == 1
+
+
+def test_get_delivery_workers_reads_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DISCORD_DELIVERY_WORKERS", "12")
+    assert get_delivery_workers() == 12
+
+    monkeypatch.setenv("DISCORD_DELIVERY_WORKERS", "0")
+    assert get_delivery_workers() == 1
+
+
+@pytest.mark.slow
+def test_benchmark_concurrent_delivery_against_fake_discord() -> None:
+    webhooks, entries_per_webhook = 8, 5
+
+    def run(workers: int) -> float:
+        with (
+            serve_fake_discord(limit=100, latency=0.02) as fake,
+            patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=RateLimitManager()),
+        ):
+            jobs = [
+                (fake.webhook_url(webhook), f"{webhook}:{index}")
+                for index in range(entries_per_webhook)
+                for webhook in range(webhooks)
+            ]
+
+            def deliver(url: str, content: str) -> None:
+                feeds.request_discord_webhook(
+                    "POST",
+                    url,
+                    payload={"content": content},
+                    params={"wait": "true"},
+                    files=None,
+                    timeout=5.0,
+                    rate_limit_retry=False,
+                )
+
+            stats = deliver_concurrently(jobs, deliver, max_workers=workers)
+
+        assert stats.delivered == webhooks * entries_per_webhook
+        for webhook in range(webhooks):
+            received = [r.payload["content"] for r in fake.requests if r.webhook_id == str(webhook)]
+            assert received == [f"{webhook}:{index}" for index in range(entries_per_webhook)]
+        print(f"workers={workers}: {stats.per_second:.1f} messages/s")  # ruff:ignore[print]
+        return stats.per_second
+
+    sequential = run(1)
+    concurrent = run(webhooks)
+
+    assert concurrent > sequential * 2
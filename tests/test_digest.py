@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from discord_rss_bot import feeds
+from discord_rss_bot.digest import DEFAULT_DIGEST_ENTRY_TEMPLATE
+from discord_rss_bot.digest import DigestBuffer
+from discord_rss_bot.digest import DigestEntry
+from discord_rss_bot.digest import DigestSettings
+from discord_rss_bot.digest import get_digest_settings
+from discord_rss_bot.digest import is_digest_due
+from discord_rss_bot.digest import render_digest_message
+from discord_rss_bot.outbox import Outbox
+from discord_rss_bot.state_db import StateDatabase
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+FEED_URL = "https://example.com/feed.xml"
+WEBHOOK_URL = "https://discord.com/api/webhooks/1/a"
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Iterator[StateDatabase]:
+    database = StateDatabase(tmp_path / "state.sqlite")
+    yield database
+    database.close()
+
+
+def _reader(tags: dict[str, object] | None = None, *, updates_enabled: bool = True) -> MagicMock:
+    reader = MagicMock()
+    reader.get_tag.side_effect = lambda _resource, key, default: (tags or {}).get(key, default)
+    reader.get_feed.return_value = SimpleNamespace(
+        url=FEED_URL,
+        title="Example &amp; Co",
+        link="https://example.com",
+        updates_enabled=updates_enabled,
+        authors_str="",
+    )
+    return reader
+
+
+def test_get_digest_settings_reads_and_clamps_tags() -> None:
+    reader = _reader({"digest_interval": "15", "digest_max_entries": 5000, "digest_message": "  "})
+
+    settings = get_digest_settings(reader, FEED_URL)
+
+    assert settings.interval_minutes == 15
+    assert settings.max_entries == 100
+    assert settings.entry_template == DEFAULT_DIGEST_ENTRY_TEMPLATE
+    assert settings.message_template == DigestSettings().message_template
+
+
+def test_is_digest_due_after_interval_or_max_entries() -> None:
+    settings = DigestSettings(interval_minutes=10, max_entries=3)
+    entries = [DigestEntry(id=1, feed_url=FEED_URL, entry_id="a", webhook_url=WEBHOOK_URL, line="a", added_at=1000.0)]
+
+    assert not is_digest_due([], settings, now=5000.0)
+    assert not is_digest_due(entries, settings, now=1599.0)
+    assert is_digest_due(entries, settings, now=1600.0)
+    assert is_digest_due(entries * 3, settings, now=1000.0)
+
+
+def test_render_digest_message_leaves_out_lines_that_do_not_fit() -> None:
+    settings = DigestSettings(message_template="{{feed_title}} ({{digest_count}})\\n{{digest_entries}}")
+    lines = [f"- entry {index}" for index in range(5)]
+
+    full = render_digest_message(settings, lines, feed_title="Feed", feed_url=FEED_URL, feed_link="", max_length=4000)
+    assert full == "Feed (5)\n- entry 0\n- entry 1\n- entry 2\n- entry 3\n- entry 4"
+
+    short = render_digest_message(settings, lines, feed_title="Feed", feed_url=FEED_URL, feed_link="", max_length=42)
+    assert short == "Feed (5)\n- entry 0\n- entry 1\n...and 3 more"
+
+
+def test_digest_buffer_flush_moves_entries_to_outbox_atomically(db: StateDatabase) -> None:
+    buffer = DigestBuffer(db)
+    outbox = Outbox(db)
+    assert buffer.add(feed_url=FEED_URL, entry_id="a", webhook_url=WEBHOOK_URL, line="- a")
+    assert not buffer.add(feed_url=FEED_URL, entry_id="a", webhook_url=WEBHOOK_URL, line="- a")
+    assert buffer.add(feed_url=FEED_URL, entry_id="b", webhook_url=WEBHOOK_URL, line="- b")
+
+    [entries] = buffer.get_pending().values()
+    message_id = buffer.flush(
+        entries,
+        outbox,
+        request_payload={"content": "- a\n- b"},
+        message_payload={"content": "- a\n- b", "embeds": [], "attachments": []},
+    )
+
+    assert message_id is not None
+    assert buffer.count() == 0
+    [message] = outbox.get_all()
+    assert message.delivery_mode == "digest"
+    assert message.request_payload == {"content": "- a\n- b"}
+
+
+def test_flush_due_digests_queues_one_message_per_due_feed(db: StateDatabase) -> None:
+    buffer = DigestBuffer(db)
+    outbox = Outbox(db)
+    reader = _reader({"digest_interval": 10, "digest_max_entries": 2})
+    for index in range(3):
+        buffer.add(feed_url=FEED_URL, entry_id=f"entry-{index}", webhook_url=WEBHOOK_URL, line=f"- {index}", now=0.0)
+
+    assert feeds.flush_due_digests(reader, outbox=outbox, buffer=buffer, now=1.0) == 2
+
+    assert buffer.count() == 0
+    contents = [message.request_payload["content"] for message in outbox.get_all()]
+    assert contents == ["**Example & Co**: 2 new entries\n- 0\n- 1", "**Example & Co**: 1 new entries\n- 2"]
+
+
+def test_flush_due_digests_waits_for_interval_and_paused_feeds(db: StateDatabase) -> None:
+    buffer = DigestBuffer(db)
+    outbox = Outbox(db)
+    buffer.add(feed_url=FEED_URL, entry_id="entry-0", webhook_url=WEBHOOK_URL, line="- 0", now=0.0)
+
+    assert feeds.flush_due_digests(_reader({"digest_interval": 10}), outbox=outbox, buffer=buffer, now=599.0) == 0
+    assert feeds.flush_due_digests(_reader(updates_enabled=False), outbox=outbox, buffer=buffer, now=9999.0) == 0
+    assert buffer.count() == 1
+
+    removed_feed_reader = _reader()
+    removed_feed_reader.get_feed.return_value = None
+    assert feeds.flush_due_digests(removed_feed_reader, outbox=outbox, buffer=buffer, now=9999.0) == 0
+    assert buffer.count() == 0
+    assert outbox.count() == 0
+
+
+def test_buffer_entry_for_digest_renders_entry_line(db: StateDatabase) -> None:
+    buffer = DigestBuffer(db)
+    entry = MagicMock()
+    entry.id = "entry-1"
+    entry.feed.url = FEED_URL
+    entry.feed.updates_enabled = True
+
+    with patch("discord_rss_bot.feeds.replace_tags_in_text_message", return_value="- [Title](<link>)") as mock_render:
+        assert feeds.buffer_entry_for_digest(WEBHOOK_URL, entry, _reader(), buffer=buffer)
+
+    assert mock_render.call_args.kwargs["message_template"] == DEFAULT_DIGEST_ENTRY_TEMPLATE
+    [[pending]] = buffer.get_pending().values()
+    assert pending.line == "- [Title](<link>)"
+
+
+def test_get_entry_delivery_mode_supports_digest() -> None:
+    entry = MagicMock()
+
+    assert feeds.get_entry_delivery_mode(_reader({"delivery_mode": "digest"}), entry) == "digest"
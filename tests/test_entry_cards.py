@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from reader import make_reader
+
+from discord_rss_bot import entry_cards
+from discord_rss_bot.entry_cards import EntryCard
+from discord_rss_bot.entry_cards import FeedTagVersions
+from discord_rss_bot.entry_cards import get_entry_card
+from discord_rss_bot.entry_cards import get_entry_card_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from reader import Entry
+    from reader import Reader
+
+FEED_URL = "https://example.com/cards.xml"
+OTHER_FEED_URL = "https://example.com/other-cards.xml"
+
+
+@pytest.fixture
+def reader() -> Iterator[Reader]:
+    reader: Reader = make_reader(":memory:")
+    for feed_url in (FEED_URL, OTHER_FEED_URL):
+        reader.add_feed(feed_url)
+        reader.set_tag(feed_url, "custom_message", "{{entry_title}}: {{entry_summary}}")  # pyright: ignore[reportArgumentType]
+        reader.add_entry({
+            "feed_url": feed_url,
+            "id": "entry-1",
+            "title": "Patch notes",
+            "summary": '<p>Balance <b>changes</b></p><img src="https://example.com/patch.png">',
+        })
+    get_entry_card_cache().clear()
+    yield reader
+    get_entry_card_cache().clear()
+    reader.close()
+
+
+def _render_cards(reader: Reader) -> dict[str, EntryCard]:
+    cards: dict[str, EntryCard] = {}
+    for entry in reader.get_entries():
+        cards[entry.feed_url] = get_entry_card(entry, reader, FeedTagVersions.from_reader(reader, entry.feed))
+    return cards
+
+
+def test_entry_card_is_rendered_once_until_the_entry_or_feed_tags_change(reader: Reader) -> None:
+    with patch.object(entry_cards, "render_entry_card", wraps=entry_cards.render_entry_card) as mock_render:
+        first: dict[str, EntryCard] = _render_cards(reader)
+        second: dict[str, EntryCard] = _render_cards(reader)
+
+    assert first == second
+    assert first[FEED_URL] == EntryCard(
+        text="Patch notes: Balance **changes**",
+        first_image="https://example.com/patch.png",
+        is_blacklisted=False,
+        is_whitelisted=False,
+    )
+    assert mock_render.call_count == 2
+
+    entry: Entry = reader.get_entry((FEED_URL, "entry-1"))
+    reader.set_tag(FEED_URL, "custom_message", "{{entry_title}}")  # pyright: ignore[reportArgumentType]
+    with patch.object(entry_cards, "render_entry_card", wraps=entry_cards.render_entry_card) as mock_render:
+        cards: dict[str, EntryCard] = _render_cards(reader)
+
+    # Only the feed whose message changed is rendered again.
+    mock_render.assert_called_once()
+    assert mock_render.call_args.args[0] == entry
+    assert cards[FEED_URL].text == "Patch notes"
+    assert cards[OTHER_FEED_URL] == first[OTHER_FEED_URL]
+
+
+def test_entry_card_follows_saved_filters_and_entry_updates(reader: Reader) -> None:
+    _render_cards(reader)
+
+    reader.set_tag(FEED_URL, "blacklist_title", "patch")  # pyright: ignore[reportArgumentType]
+    cards: dict[str, EntryCard] = _render_cards(reader)
+    assert cards[FEED_URL].is_blacklisted
+    assert not cards[OTHER_FEED_URL].is_blacklisted
+
+    reader.delete_entry((OTHER_FEED_URL, "entry-1"))
+    reader.add_entry({"feed_url": OTHER_FEED_URL, "id": "entry-1", "title": "Hotfix", "summary": "<p>Fixed</p>"})
+    cards = _render_cards(reader)
+    assert cards[OTHER_FEED_URL] == EntryCard(
+        text="Hotfix: Fixed",
+        first_image="",
+        is_blacklisted=False,
+        is_whitelisted=False,
+    )
+
+
+def test_entry_card_follows_entry_state_its_message_uses(reader: Reader) -> None:
+    reader.set_tag(FEED_URL, "custom_message", "{{entry_title}} read={{entry_read}} important={{entry_important}}")  # pyright: ignore[reportArgumentType]
+    first: dict[str, EntryCard] = _render_cards(reader)
+    assert first[FEED_URL].text == "Patch notes read=False important=False"
+
+    for feed_url in (FEED_URL, OTHER_FEED_URL):
+        reader.mark_entry_as_read((feed_url, "entry-1"))
+        reader.mark_entry_as_important((feed_url, "entry-1"))
+    with patch.object(entry_cards, "render_entry_card", wraps=entry_cards.render_entry_card) as mock_render:
+        cards: dict[str, EntryCard] = _render_cards(reader)
+
+    # The other feed's message uses no state tags, so its card is still cached.
+    mock_render.assert_called_once()
+    assert cards[FEED_URL].text == "Patch notes read=True important=True"
+    assert cards[OTHER_FEED_URL] == first[OTHER_FEED_URL]
+
+
+def test_feed_tag_versions_ignore_reader_tags_and_split_filters_from_templates(reader: Reader) -> None:
+    before: FeedTagVersions = FeedTagVersions.from_reader(reader, reader.get_feed(FEED_URL))
+
+    reader.set_tag(FEED_URL, ".reader.update", {"interval": 30})
+    assert FeedTagVersions.from_reader(reader, reader.get_feed(FEED_URL)) == before
+
+    reader.set_tag(FEED_URL, "regex_whitelist_title", "^Patch")  # pyright: ignore[reportArgumentType]
+    after: FeedTagVersions = FeedTagVersions.from_reader(reader, reader.get_feed(FEED_URL))
+    assert after.template_version == before.template_version
+    assert after.filter_version != before.filter_version
+    assert after.whitelist_values["regex_title"] == "^Patch"
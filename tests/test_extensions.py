@@ -451,6 +451,41 @@ class BadPlugin(FeedExtension):
     assert result == {"good_var": "ok"}
 
 
+def test_run_extensions_only_runs_extensions_providing_requested_variables(
+    mock_reader: MagicMock,
+    mock_entry: SimpleNamespace,
+    mock_feed: SimpleNamespace,
+    temp_extensions_dir: str,
+) -> None:
+    """Extensions that declare none of the requested variables are not run."""
+    plugin_code: str = """
+from discord_rss_bot.extensions.base import FeedExtension
+
+class WordCountPlugin(FeedExtension):
+    name = "word_count"
+    provides_variables = ["word_count"]
+    def process_entry(self, entry, reader):
+        return {"word_count": "3"}
+
+class ReadingTimePlugin(FeedExtension):
+    name = "reading_time"
+    provides_variables = ["reading_time"]
+    def process_entry(self, entry, reader):
+        raise AssertionError("reading_time is not used by the template")
+
+class UndeclaredPlugin(FeedExtension):
+    name = "undeclared"
+    def process_entry(self, entry, reader):
+        return {"anything": "yes"}
+"""
+    (Path(temp_extensions_dir) / "selective.py").write_text(plugin_code)
+    discover_plugins(force=True)
+
+    set_enabled_extensions_for_feed(mock_reader, mock_feed.url, ["word_count", "reading_time", "undeclared"])
+    result: dict[str, str] = run_extensions(mock_entry, mock_reader, variables=["word_count"])  # type: ignore[arg-type]
+    assert result == {"word_count": "3", "anything": "yes"}
+
+
 # ---------------------------------------------------------------------------
 # Tests: tag replacement integration (custom_message.py)
 # ---------------------------------------------------------------------------
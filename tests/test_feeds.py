@@ -3,16 +3,20 @@ from __future__ import annotations
 import asyncio
 import os
 import tempfile
+import threading
 from datetime import UTC
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import LiteralString
 from typing import cast
+from unittest.mock import ANY
 from unittest.mock import MagicMock
 from unittest.mock import call
 from unittest.mock import patch
 
 import pytest
+from lxml.etree import HTMLPullParser
 from reader import EntryNotFoundError
 from reader import Feed
 from reader import FeedExistsError
@@ -22,6 +26,7 @@ from reader import StorageError
 from reader import make_reader
 
 from discord_rss_bot import feeds
+from discord_rss_bot.custom_message import ParsedEntry
 from discord_rss_bot.extensions.steam import extract_app_id
 from discord_rss_bot.extensions.youtube import is_youtube_feed_url
 from discord_rss_bot.feeds import JsonObject
@@ -39,6 +44,20 @@ from discord_rss_bot.feeds import send_entry_to_discord
 from discord_rss_bot.feeds import send_to_discord
 from discord_rss_bot.feeds import set_entry_as_read
 from discord_rss_bot.feeds import truncate_webhook_message
+from discord_rss_bot.sent_webhooks import SentWebhookStore
+from discord_rss_bot.state_db import StateDatabase
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def sent_webhook_store(tmp_path: Path) -> Iterator[SentWebhookStore]:
+    db = StateDatabase(tmp_path / "state.sqlite")
+    store = SentWebhookStore(db)
+    with patch("discord_rss_bot.feeds.get_sent_webhook_store", return_value=store):
+        yield store
+    db.close()
 
 
 def get_test_webhook_components(webhook: feeds.DiscordWebhook) -> list[feeds.JsonValue]:
@@ -752,8 +771,8 @@ def test_create_embed_webhook_uses_media_gallery_for_entry_images(
     assert isinstance(gallery, dict)
     assert gallery["type"] == 12
     mock_fetch_ttvdrops_campaign_media_items.assert_called_once_with(entry)
+    # Like the embed's tags, the gallery reads only the last content item.
     assert gallery["items"] == [
-        {"media": {"url": "https://example.com/content-1.jpg"}, "description": "Entry title"},
         {"media": {"url": "https://example.com/content-2.jpg"}, "description": "Entry title"},
         {"media": {"url": "https://example.com/summary.jpg"}, "description": "Entry title"},
     ]
@@ -820,7 +839,47 @@ def test_create_embed_webhook_can_limit_media_gallery_to_first_image(
     assert isinstance(gallery, dict)
     mock_fetch_ttvdrops_campaign_media_items.assert_called_once_with(entry)
     assert gallery["items"] == [
-        {"media": {"url": "https://example.com/content-1.jpg"}, "description": "Entry title"},
+        {"media": {"url": "https://example.com/content-2.jpg"}, "description": "Entry title"},
+    ]
+
+
+@patch("discord_rss_bot.feeds.fetch_ttvdrops_campaign_media_items", return_value=[])
+@patch("discord_rss_bot.feeds.replace_tags_in_embed")
+def test_create_embed_webhook_shares_parsed_html_between_embed_and_media_gallery(
+    mock_replace_tags_in_embed: MagicMock,
+    mock_fetch_ttvdrops_campaign_media_items: MagicMock,
+) -> None:
+    reader = MagicMock()
+    reader.get_tag.side_effect = lambda resource, key, default=None: {  # ruff:ignore[unused-lambda-argument]
+        "media_gallery_image_limit": 10,
+        "webhook_text_length_limit": 4000,
+    }.get(key, default)
+    body: str = (
+        '<p>Shared body</p><img src="https://example.com/shared-1.jpg"><img src="https://example.com/shared-2.jpg">'
+    )
+    entry = MagicMock()
+    entry.id = "entry-1"
+    entry.title = "Entry title"
+    entry.summary = body
+    entry.content = [MagicMock(value=body)]
+
+    def render_embed(**kwargs: object) -> feeds.CustomEmbed:
+        parsed_entry = kwargs["parsed_entry"]
+        assert isinstance(parsed_entry, ParsedEntry)
+        return feeds.CustomEmbed(description="Entry body", image_url=parsed_entry.first_image)
+
+    mock_replace_tags_in_embed.side_effect = render_embed
+
+    with patch("discord_rss_bot.html_format.HTMLPullParser", wraps=HTMLPullParser) as mock_html_pull_parser:
+        webhook = feeds.create_embed_webhook("https://discord.com/api/webhooks/123/abc", entry, reader)
+
+    mock_html_pull_parser.assert_called_once()
+    mock_fetch_ttvdrops_campaign_media_items.assert_called_once_with(entry)
+    gallery = get_test_webhook_components(webhook)[1]
+    assert isinstance(gallery, dict)
+    assert gallery["items"] == [
+        {"media": {"url": "https://example.com/shared-1.jpg"}, "description": "Entry title"},
+        {"media": {"url": "https://example.com/shared-2.jpg"}, "description": "Entry title"},
     ]
 
 
@@ -1152,6 +1211,42 @@ def test_send_entry_to_discord_uses_screenshot_mode(
     mock_execute_webhook.assert_called_once_with(screenshot_webhook, entry, reader=reader)
 
 
+@patch("discord_rss_bot.feeds.buffer_entry_for_digest")
+@patch("discord_rss_bot.feeds.get_entry_delivery_mode")
+@patch("discord_rss_bot.feeds.create_text_webhook")
+@patch("discord_rss_bot.feeds.execute_webhook")
+def test_send_entry_to_discord_sends_digest_feed_entry_as_text_message(
+    mock_execute_webhook: MagicMock,
+    mock_create_text_webhook: MagicMock,
+    mock_get_entry_delivery_mode: MagicMock,
+    mock_buffer_entry_for_digest: MagicMock,
+) -> None:
+    reader = MagicMock()
+    entry = MagicMock()
+    entry.feed.url = "https://example.com/feed.xml"
+    entry.feed_url = "https://example.com/feed.xml"
+
+    reader.get_tag.side_effect = lambda resource, key, default=None: {  # ruff:ignore[unused-lambda-argument]
+        "webhook": "https://discord.com/api/webhooks/123/abc",
+    }.get(key, default)
+
+    mock_get_entry_delivery_mode.return_value = "digest"
+    text_webhook = MagicMock()
+    mock_create_text_webhook.return_value = text_webhook
+
+    assert send_entry_to_discord(entry, reader) is None
+
+    # A manual send posts the entry right away instead of adding it to the feed's next digest.
+    mock_create_text_webhook.assert_called_once_with(
+        "https://discord.com/api/webhooks/123/abc",
+        entry,
+        reader=reader,
+        use_default_message_on_empty=False,
+    )
+    mock_execute_webhook.assert_called_once_with(text_webhook, entry, reader=reader)
+    mock_buffer_entry_for_digest.assert_not_called()
+
+
 @patch("discord_rss_bot.feeds.get_reader")
 @patch("discord_rss_bot.feeds.get_custom_message")
 @patch("discord_rss_bot.feeds.replace_tags_in_text_message")
@@ -1404,18 +1499,22 @@ def test_execute_webhook_logs_error_on_bad_status(
     mock_send_webhook_message: MagicMock,
     mock_logger: MagicMock,
 ) -> None:
-    webhook = MagicMock()
-    webhook.json = {"content": "test"}
+    webhook = feeds.DiscordWebhook(url="https://discord.com/api/webhooks/1/a", content="test")
     mock_send_webhook_message.return_value = MagicMock(status_code=500, text="fail")
     reader = MagicMock()
     entry = MagicMock()
     entry.id = "entry-8"
     entry.feed.url = "https://example.com/feed.xml"
     entry.feed.updates_enabled = True
+    outbox = MagicMock()
 
-    execute_webhook(webhook, entry, reader)
+    with patch("discord_rss_bot.feeds.get_outbox", return_value=outbox):
+        execute_webhook(webhook, entry, reader)
 
     mock_logger.error.assert_called_once()
+    outbox.add_dead_letter.assert_called_once()
+    assert outbox.add_dead_letter.call_args.kwargs["entry_id"] == "entry-8"
+    assert outbox.add_dead_letter.call_args.kwargs["status_code"] == 500
 
 
 @patch.object(feeds, "logger")
@@ -1438,13 +1537,13 @@ def test_execute_webhook_logs_info_on_success(
 
 
 @patch("discord_rss_bot.feeds.send_webhook_message")
-def test_execute_webhook_records_sent_webhook_message(mock_send_webhook_message: MagicMock) -> None:
+def test_execute_webhook_records_sent_webhook_message(
+    mock_send_webhook_message: MagicMock,
+    sent_webhook_store: SentWebhookStore,
+) -> None:
     webhook_url = "https://discord.com/api/webhooks/123/abc"
-    state: dict[str, feeds.JsonValue] = {}
 
     def get_tag(_resource: str | tuple[()], key: str, default: feeds.JsonValue = None) -> feeds.JsonValue:
-        if key == "sent_webhooks":
-            return state.get("sent_webhooks", default)
         if key == "save_sent_webhooks":
             return True
         if key == "webhook":
@@ -1453,12 +1552,8 @@ def test_execute_webhook_records_sent_webhook_message(mock_send_webhook_message:
             return "text"
         return default
 
-    def set_tag(_resource: str | tuple[()], key: str, value: feeds.JsonValue) -> None:
-        state[key] = value
-
     reader = MagicMock()
     reader.get_tag.side_effect = get_tag
-    reader.set_tag.side_effect = set_tag
 
     entry = MagicMock()
     entry.id = "entry-1"
@@ -1480,8 +1575,7 @@ def test_execute_webhook_records_sent_webhook_message(mock_send_webhook_message:
 
     execute_webhook(webhook, entry, reader)
 
-    records = state["sent_webhooks"]
-    assert isinstance(records, list)
+    records = sent_webhook_store.get_all()
     assert len(records) == 1
     assert isinstance(records[0], dict)
     assert records[0]["feed_url"] == "https://example.com/feed.xml"
@@ -1524,8 +1618,9 @@ def test_execute_webhook_does_not_record_when_feed_tracking_disabled(mock_send_w
     reader.set_tag.assert_not_called()
 
 
-@patch("discord_rss_bot.feeds.httpx2.request")
-def test_send_webhook_message_posts_components_with_httpx2(mock_request: MagicMock) -> None:
+@patch("discord_rss_bot.feeds.get_discord_http_client")
+def test_send_webhook_message_posts_components_with_httpx2(mock_get_client: MagicMock) -> None:
+    mock_request: MagicMock = mock_get_client.return_value.request
     response = MagicMock(status_code=200, text='{"id": "message-1"}')
     mock_request.return_value = response
     components: list[feeds.JsonValue] = [
@@ -1556,8 +1651,9 @@ def test_send_webhook_message_posts_components_with_httpx2(mock_request: MagicMo
     }
 
 
-@patch("discord_rss_bot.feeds.httpx2.request")
-def test_send_webhook_message_uploads_files_as_multipart(mock_request: MagicMock) -> None:
+@patch("discord_rss_bot.feeds.get_discord_http_client")
+def test_send_webhook_message_uploads_files_as_multipart(mock_get_client: MagicMock) -> None:
+    mock_request: MagicMock = mock_get_client.return_value.request
     response = MagicMock(status_code=200, text='{"id": "message-2"}')
     mock_request.return_value = response
     webhook = feeds.DiscordWebhook(url="https://discord.com/api/webhooks/123/abc", content="Entry link")
@@ -1574,11 +1670,14 @@ def test_send_webhook_message_uploads_files_as_multipart(mock_request: MagicMock
 
 
 @patch("discord_rss_bot.feeds.time.sleep")
-@patch("discord_rss_bot.feeds.httpx2.request")
+@patch("discord_rss_bot.feeds.get_rate_limit_manager")
+@patch("discord_rss_bot.feeds.get_discord_http_client")
 def test_request_discord_webhook_retries_rate_limit_with_httpx2(
-    mock_request: MagicMock,
+    mock_get_client: MagicMock,
+    mock_get_manager: MagicMock,
     mock_sleep: MagicMock,
 ) -> None:
+    mock_request: MagicMock = mock_get_client.return_value.request
     rate_limited_response = MagicMock(status_code=429, headers={})
     rate_limited_response.json.return_value = {"retry_after": 0.25}
     success_response = MagicMock(status_code=200)
@@ -1605,10 +1704,15 @@ def test_request_discord_webhook_retries_rate_limit_with_httpx2(
     assert result is success_response
     assert mock_request.call_args_list == [request_call, request_call]
     mock_sleep.assert_called_once_with(0.25)
+    # The retry waits for the bucket and the circuit breaker like the first attempt did.
+    mock_manager: MagicMock = mock_get_manager.return_value
+    assert mock_manager.acquire.call_args_list == [call(ANY, block=True), call(ANY, block=True)]
+    assert [update.kwargs["retry_after"] for update in mock_manager.update.call_args_list] == [0.25, None]
 
 
-@patch("discord_rss_bot.feeds.httpx2.request")
-def test_edit_sent_webhook_message_patches_message_with_httpx2(mock_request: MagicMock) -> None:
+@patch("discord_rss_bot.feeds.get_discord_http_client")
+def test_edit_sent_webhook_message_patches_message_with_httpx2(mock_get_client: MagicMock) -> None:
+    mock_request: MagicMock = mock_get_client.return_value.request
     response = MagicMock(status_code=200, text='{"id": "message-3"}')
     mock_request.return_value = response
     payload: JsonObject = {"content": "Updated entry"}
@@ -1636,33 +1740,27 @@ def test_edit_sent_webhook_message_patches_message_with_httpx2(mock_request: Mag
 def test_update_sent_webhooks_for_modified_entries_edits_changed_payload(
     mock_create_webhook_for_entry: MagicMock,
     mock_edit_sent_webhook_message: MagicMock,
+    sent_webhook_store: SentWebhookStore,
 ) -> None:
     webhook_url = "https://discord.com/api/webhooks/123/abc"
     old_payload: JsonObject = {"content": "Old title", "embeds": [], "attachments": []}
-    state: dict[str, feeds.JsonValue] = {
-        "sent_webhooks": [
-            {
-                "feed_url": "https://example.com/feed.xml",
-                "entry_id": "entry-3",
-                "webhook_url": webhook_url,
-                "message_id": "message-3",
-                "payload": old_payload,
-                "payload_hash": feeds.hash_webhook_payload(old_payload),
-                "update_count": 0,
-            },  # pyright: ignore[reportAssignmentType, reportArgumentType]
-        ],
-    }
+    sent_webhook_store.save([
+        {
+            "feed_url": "https://example.com/feed.xml",
+            "entry_id": "entry-3",
+            "webhook_url": webhook_url,
+            "message_id": "message-3",
+            "payload": old_payload,
+            "payload_hash": feeds.hash_webhook_payload(old_payload),
+            "update_count": 0,
+        },
+    ])
 
     def get_tag(_resource: str | tuple[()], key: str, default: feeds.JsonValue = None) -> feeds.JsonValue:
-        if key == "sent_webhooks":
-            return state["sent_webhooks"]
         if key == "save_sent_webhooks":
             return True
         return default
 
-    def set_tag(_resource: str | tuple[()], key: str, value: feeds.JsonValue) -> None:
-        state[key] = value
-
     entry = MagicMock()
     entry.id = "entry-3"
     entry.title = "New title"
@@ -1673,7 +1771,6 @@ def test_update_sent_webhooks_for_modified_entries_edits_changed_payload(
 
     reader = MagicMock()
     reader.get_tag.side_effect = get_tag
-    reader.set_tag.side_effect = set_tag
     reader.get_entry.return_value = entry
 
     webhook = MagicMock()
@@ -1695,9 +1792,7 @@ def test_update_sent_webhooks_for_modified_entries_edits_changed_payload(
     mock_edit_sent_webhook_message.assert_called_once()
     edit_payload = mock_edit_sent_webhook_message.call_args.kwargs["payload"]
     assert edit_payload == {"content": "New title"}
-    records = state["sent_webhooks"]
-    assert isinstance(records, list)
-    assert isinstance(records[0], dict)
+    records = sent_webhook_store.get_all()
     assert isinstance(records[0]["payload"], dict)
     assert records[0]["payload"]["content"] == "New title"
     assert records[0]["discord_response"] == {"id": "message-3"}
@@ -1893,3 +1988,314 @@ def test_update_feeds_and_collect_modified_entries_only_returns_modified_entries
 
     assert modified_entries == [("https://example.com/feed.xml", "modified")]
     assert reader.after_entry_update_hooks == []
+
+
+@patch("discord_rss_bot.feeds.edit_sent_webhook_message")
+@patch("discord_rss_bot.feeds.create_webhook_for_entry")
+def test_update_sent_webhook_record_rebuilds_packed_message(
+    mock_create_webhook_for_entry: MagicMock,
+    mock_edit_sent_webhook_message: MagicMock,
+) -> None:
+    def packed_record(entry_id: str, description: str, pack_index: int) -> feeds.SentWebhookRecord:
+        payload: JsonObject = {"content": "", "embeds": [{"description": description}], "attachments": []}
+        return {
+            "feed_url": "https://example.com/feed.xml",
+            "entry_id": entry_id,
+            "webhook_url": "https://discord.com/api/webhooks/123/abc",
+            "message_id": "message-packed",
+            "payload": payload,
+            "payload_hash": feeds.hash_webhook_payload(payload),
+            "pack_index": pack_index,
+            "pack_size": 3,
+            "update_count": 0,
+        }
+
+    records = [packed_record("entry-0", "First", 0), packed_record("entry-1", "Second", 1)]
+    records.append(packed_record("entry-2", "Third", 2))
+
+    entry = MagicMock()
+    entry.id = "entry-1"
+    entry.feed.title = "Example feed"
+    entry.updated = None
+    webhook = MagicMock()
+    webhook.json = {"embeds": [{"description": "Second, edited"}]}
+    mock_create_webhook_for_entry.return_value = (webhook, "embed")
+
+    response = MagicMock()
+    response.status_code = 200
+    response.text = '{"id": "message-packed"}'
+    response.json.return_value = {"id": "message-packed"}
+    mock_edit_sent_webhook_message.return_value = response
+
+    updated_record, record_changed, message_was_edited = feeds.update_sent_webhook_record_for_entry(
+        MagicMock(),
+        entry,
+        records[1],
+        records=records,
+    )
+
+    assert (record_changed, message_was_edited) == (True, True)
+    edit_payload = mock_edit_sent_webhook_message.call_args.kwargs["payload"]
+    assert edit_payload["embeds"] == [
+        {"description": "First"},
+        {"description": "Second, edited"},
+        {"description": "Third"},
+    ]
+    assert cast("JsonObject", updated_record["payload"])["embeds"] == [{"description": "Second, edited"}]
+
+    # Without the other entries' records the message cannot be rebuilt, so it is left alone.
+    mock_edit_sent_webhook_message.reset_mock()
+    updated_record, record_changed, message_was_edited = feeds.update_sent_webhook_record_for_entry(
+        MagicMock(),
+        entry,
+        records[1],
+        records=records[:2],
+    )
+
+    assert (record_changed, message_was_edited) == (True, False)
+    mock_edit_sent_webhook_message.assert_not_called()
+    assert updated_record["last_error"]
+
+
+@patch("discord_rss_bot.feeds.edit_sent_webhook_message")
+@patch("discord_rss_bot.feeds.create_webhook_for_entry")
+def test_update_sent_webhooks_for_modified_entries_edits_packed_message_with_earlier_edits(
+    mock_create_webhook_for_entry: MagicMock,
+    mock_edit_sent_webhook_message: MagicMock,
+    sent_webhook_store: SentWebhookStore,
+) -> None:
+    feed_url = "https://example.com/feed.xml"
+    for index, description in enumerate(["First", "Second"]):
+        payload: JsonObject = {"content": "", "embeds": [{"description": description}], "attachments": []}
+        sent_webhook_store.save([
+            {
+                "feed_url": feed_url,
+                "entry_id": f"entry-{index}",
+                "webhook_url": "https://discord.com/api/webhooks/123/abc",
+                "message_id": "message-packed",
+                "payload": payload,
+                "payload_hash": feeds.hash_webhook_payload(payload),
+                "pack_index": index,
+                "pack_size": 2,
+                "update_count": 0,
+            },
+        ])
+    sent_webhook_store.save([{"feed_url": feed_url, "entry_id": "unrelated", "webhook_url": "https://x"}])
+
+    def get_entry(key: tuple[str, str]) -> MagicMock:
+        entry = MagicMock()
+        entry.id = key[1]
+        entry.updated = None
+        return entry
+
+    def render(_webhook_url: str, entry: MagicMock, *_args: object, **_kwargs: object) -> tuple[MagicMock, str]:
+        webhook = MagicMock()
+        webhook.json = {"embeds": [{"description": f"{entry.id} edited"}]}
+        return webhook, "embed"
+
+    reader = MagicMock()
+    reader.get_entry.side_effect = get_entry
+    reader.get_tag.side_effect = lambda _resource, key, default: key == "save_sent_webhooks" or default
+    mock_create_webhook_for_entry.side_effect = render
+    response = MagicMock()
+    response.status_code = 200
+    response.text = '{"id": "message-packed"}'
+    response.json.return_value = {"id": "message-packed"}
+    mock_edit_sent_webhook_message.return_value = response
+
+    updated_count = feeds.update_sent_webhooks_for_modified_entries(
+        reader,
+        [(feed_url, "entry-0"), (feed_url, "entry-1"), (feed_url, "never-sent")],
+    )
+
+    assert updated_count == 2
+    assert reader.get_entry.call_count == 2
+    last_edit_payload = mock_edit_sent_webhook_message.call_args.kwargs["payload"]
+    assert last_edit_payload["embeds"] == [{"description": "entry-0 edited"}, {"description": "entry-1 edited"}]
+    assert [record.get("update_count") for record in sent_webhook_store.get_all()] == [1, 1, None]
+
+
+@patch("discord_rss_bot.feeds.edit_sent_webhook_message")
+@patch("discord_rss_bot.feeds.create_webhook_for_entry")
+def test_update_sent_webhooks_for_modified_entries_edits_webhooks_concurrently(
+    mock_create_webhook_for_entry: MagicMock,
+    mock_edit_sent_webhook_message: MagicMock,
+    sent_webhook_store: SentWebhookStore,
+) -> None:
+    feed_url = "https://example.com/feed.xml"
+    webhook_urls = ["https://discord.com/api/webhooks/1/a", "https://discord.com/api/webhooks/2/b"]
+    old_payload: JsonObject = {"content": "Old", "embeds": [], "attachments": []}
+    sent_webhook_store.save(
+        {
+            "feed_url": feed_url,
+            "entry_id": f"entry-{index}",
+            "webhook_url": webhook_urls[index],
+            "message_id": f"message-{index}",
+            "payload": old_payload,
+            "payload_hash": feeds.hash_webhook_payload(old_payload),
+        }
+        for index in range(2)
+    )
+
+    def get_entry(key: tuple[str, str]) -> MagicMock:
+        entry = MagicMock()
+        entry.id = key[1]
+        entry.updated = None
+        return entry
+
+    def render(_webhook_url: str, entry: MagicMock, *_args: object, **_kwargs: object) -> tuple[MagicMock, str]:
+        webhook = MagicMock()
+        webhook.json = {"content": f"{entry.id} edited", "embeds": [], "attachments": []}
+        return webhook, "text"
+
+    # Both edits must be in flight at once for the barrier to open.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def edit(**_kwargs: object) -> MagicMock:
+        barrier.wait()
+        response = MagicMock()
+        response.status_code = 200
+        response.text = "{}"
+        response.json.return_value = {}
+        return response
+
+    reader = MagicMock()
+    reader.get_entry.side_effect = get_entry
+    reader.get_tag.side_effect = lambda _resource, key, default: key == "save_sent_webhooks" or default
+    mock_create_webhook_for_entry.side_effect = render
+    mock_edit_sent_webhook_message.side_effect = edit
+
+    with patch.object(sent_webhook_store, "save", wraps=sent_webhook_store.save) as mock_save:
+        updated_count = feeds.update_sent_webhooks_for_modified_entries(
+            reader,
+            [(feed_url, "entry-0"), (feed_url, "entry-1")],
+        )
+
+    assert updated_count == 2
+    mock_save.assert_called_once()
+    assert [record["update_count"] for record in sent_webhook_store.get_all()] == [1, 1]
+
+
+@patch("discord_rss_bot.feeds.edit_sent_webhook_message")
+@patch("discord_rss_bot.feeds.create_webhook_for_entry")
+def test_update_sent_webhooks_for_modified_entries_keeps_the_thread_id_to_the_rendered_webhook(
+    mock_create_webhook_for_entry: MagicMock,
+    mock_edit_sent_webhook_message: MagicMock,
+    sent_webhook_store: SentWebhookStore,
+) -> None:
+    feed_url = "https://example.com/feed.xml"
+    webhook_urls = ["https://discord.com/api/webhooks/1/a", "https://discord.com/api/webhooks/2/b"]
+    old_payload: JsonObject = {"content": "Old", "embeds": [], "attachments": []}
+    sent_webhook_store.save(
+        {
+            "feed_url": feed_url,
+            "entry_id": "entry-1",
+            "webhook_url": webhook_url,
+            "message_id": f"message-{index}",
+            "payload": old_payload,
+            "payload_hash": feeds.hash_webhook_payload(old_payload),
+        }
+        for index, webhook_url in enumerate(webhook_urls)
+    )
+
+    entry = MagicMock()
+    entry.id = "entry-1"
+    entry.updated = None
+    reader = MagicMock()
+    reader.get_entry.return_value = entry
+    reader.get_tag.side_effect = lambda _resource, key, default: key == "save_sent_webhooks" or default
+    webhook = feeds.DiscordWebhook(url=webhook_urls[0], content="Edited", thread_id="123")
+    mock_create_webhook_for_entry.return_value = (webhook, "text")
+    response = MagicMock()
+    response.status_code = 200
+    response.text = "{}"
+    response.json.return_value = {}
+    mock_edit_sent_webhook_message.return_value = response
+
+    assert feeds.update_sent_webhooks_for_modified_entries(reader, [(feed_url, "entry-1")]) == 2
+
+    mock_create_webhook_for_entry.assert_called_once()
+    thread_ids = {
+        edit.kwargs["webhook_url"]: edit.kwargs["webhook"].thread_id
+        for edit in mock_edit_sent_webhook_message.call_args_list
+    }
+    assert thread_ids == {webhook_urls[0]: "123", webhook_urls[1]: None}
+    assert webhook.thread_id == "123"
+
+
+@patch("discord_rss_bot.feeds.edit_sent_webhook_message")
+@patch("discord_rss_bot.feeds.create_webhook_for_entry")
+def test_update_sent_webhooks_for_modified_entries_holds_back_edits_of_recent_messages(
+    mock_create_webhook_for_entry: MagicMock,
+    mock_edit_sent_webhook_message: MagicMock,
+    sent_webhook_store: SentWebhookStore,
+) -> None:
+    feed_url = "https://example.com/feed.xml"
+    old_payload: JsonObject = {"content": "Old", "embeds": [], "attachments": []}
+    sent_webhook_store.save([
+        {
+            "feed_url": feed_url,
+            "entry_id": "entry-1",
+            "webhook_url": "https://discord.com/api/webhooks/1/a",
+            "message_id": "message-1",
+            "payload": old_payload,
+            "payload_hash": feeds.hash_webhook_payload(old_payload),
+            "last_updated_at": datetime.now(tz=UTC).isoformat(),
+        },
+    ])
+    entry = MagicMock()
+    entry.id = "entry-1"
+    entry.updated = None
+    reader = MagicMock()
+    reader.get_entry.return_value = entry
+    reader.get_tag.side_effect = lambda _resource, key, default: key == "save_sent_webhooks" or default
+    content = iter(["Edited once", "Edited twice"])
+
+    def render(*_args: object, **_kwargs: object) -> tuple[MagicMock, str]:
+        webhook = MagicMock()
+        webhook.json = {"content": next(content), "embeds": [], "attachments": []}
+        return webhook, "text"
+
+    mock_create_webhook_for_entry.side_effect = render
+    response = MagicMock()
+    response.status_code = 200
+    response.text = "{}"
+    response.json.return_value = {}
+    mock_edit_sent_webhook_message.return_value = response
+
+    # Two changes right after the message was sent are coalesced instead of edited.
+    assert feeds.update_sent_webhooks_for_modified_entries(reader, [(feed_url, "entry-1")]) == 0
+    assert feeds.send_deferred_edits(reader) == 0
+    mock_edit_sent_webhook_message.assert_not_called()
+    record = sent_webhook_store.get_all()[0]
+    assert record["deferred_edit_count"] == 1
+    assert record["edit_deferred_until"]
+
+    # Once the debounce window has passed, the latest rendering is sent in a single edit.
+    sent_webhook_store.save([{**record, "edit_deferred_until": "2000-01-01T00:00:00+00:00", "last_updated_at": ""}])
+    assert feeds.send_deferred_edits(reader) == 1
+
+    mock_edit_sent_webhook_message.assert_called_once()
+    assert mock_edit_sent_webhook_message.call_args.kwargs["payload"] == {"content": "Edited twice"}
+    record = sent_webhook_store.get_all()[0]
+    assert not record["edit_deferred_until"]
+    assert record["update_count"] == 1
+    assert len(cast("list[str]", record["recent_edit_times"])) == 1
+    assert sent_webhook_store.get_due_edits() == []
+
+
+def test_message_edit_payload_leaves_saved_payload_and_shared_embeds_untouched() -> None:
+    embed: JsonObject = {"description": "New", "image": {"url": ""}}
+    payload: JsonObject = {"content": "", "embeds": [embed], "attachments": [], "username": "Feed"}
+    previous_image: JsonObject = {"url": "https://example.com/old.png"}
+    record: JsonObject = {"payload": {"content": "", "embeds": [{"image": previous_image}], "attachments": []}}
+
+    edit_payload = feeds.get_webhook_message_edit_payload(payload, record)
+
+    assert edit_payload == {"content": "", "embeds": [{"description": "New", "image": previous_image}]}
+    assert payload == {"content": "", "embeds": [embed], "attachments": [], "username": "Feed"}
+    assert embed == {"description": "New", "image": {"url": ""}}
+
+    text_payload: JsonObject = {"content": "Text", "embeds": [], "attachments": []}
+    assert feeds.get_webhook_message_edit_payload(text_payload, {"payload": {"content": "Old"}}) == {"content": "Text"}
+    assert text_payload == {"content": "Text", "embeds": [], "attachments": []}
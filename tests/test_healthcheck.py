@@ -67,3 +67,22 @@ def test_healthcheck_timeout(capsys: pytest.CaptureFixture) -> None:
     assert exc_info.value.code == 1
     captured = capsys.readouterr()
     assert "Healthcheck failed" in captured.err
+
+
+def test_healthcheck_reports_paused_discord_traffic(capsys: pytest.CaptureFixture) -> None:
+    """Test that healthcheck stays healthy but reports an open circuit breaker."""
+    mock_response = MagicMock()
+    mock_response.ok = True
+    mock_response.json.return_value = {
+        "status": "degraded",
+        "discord_circuit": {"state": "open", "reason": "Discord global rate limit", "retry_in": 12.5},
+    }
+
+    with (
+        patch("discord_rss_bot.healthcheck.requests.get", return_value=mock_response),
+        pytest.raises(SystemExit) as exc_info,
+    ):
+        healthcheck()
+
+    assert exc_info.value.code == 0
+    assert "Discord traffic is paused: Discord global rate limit" in capsys.readouterr().err
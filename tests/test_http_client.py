@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Thread
+from typing import TYPE_CHECKING
+
+import httpx2
+import pytest
+
+from discord_rss_bot import http_client
+from discord_rss_bot.http_client import DiscordHttpClient
+from discord_rss_bot.http_client import DiscordHttpConfig
+from discord_rss_bot.http_client import close_discord_http_client
+from discord_rss_bot.http_client import get_discord_http_client
+from discord_rss_bot.http_client import get_discord_http_stats
+from discord_rss_bot.http_client import open_discord_http_client
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Answer every request with a small JSON body over a persistent HTTP/1.1 connection."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        """Consume the request body and return a fake Discord message."""
+        length: int = int(self.headers.get("Content-Length", "0"))
+        self.rfile.read(length)
+        body: bytes = b'{"id": "message-1"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, _format: str, *_args: str | int) -> None:
+        """Suppress HTTP request logging during tests."""
+
+
+@contextmanager
+def _serve_keep_alive() -> Generator[str, None, None]:
+    """Serve a keep-alive endpoint while the context is active.
+
+    Yields:
+        The endpoint URL.
+    """
+    with ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler) as server:
+        server_thread = Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_port}/api/webhooks/123/abc"
+        finally:
+            server.shutdown()
+            server_thread.join()
+
+
+def test_discord_http_client_reuses_keep_alive_connection() -> None:
+    client = DiscordHttpClient(DiscordHttpConfig())
+    try:
+        with _serve_keep_alive() as url:
+            for _ in range(3):
+                response = client.request("POST", url, json={"content": "hello"}, timeout=5.0)
+                assert response.status_code == 200
+    finally:
+        client.close()
+
+    stats = client.stats()
+    assert stats.requests == 3
+    assert stats.new_connections == 1
+    assert stats.reused_connections == 2
+    assert stats.reuse_ratio == pytest.approx(2 / 3)
+
+
+def test_discord_http_client_counts_transport_errors() -> None:
+    def raise_connect_error(request: httpx2.Request) -> httpx2.Response:
+        msg = "boom"
+        raise httpx2.ConnectError(msg, request=request)
+
+    client = DiscordHttpClient(DiscordHttpConfig(), transport=httpx2.MockTransport(raise_connect_error))
+    with pytest.raises(httpx2.ConnectError):
+        client.request("POST", "https://discord.com/api/webhooks/123/abc", json={})
+    client.close()
+
+    assert client.stats().errors == 1
+
+
+def test_discord_http_config_reads_pool_limits_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DISCORD_HTTP_MAX_CONNECTIONS", "4")
+    monkeypatch.setenv("DISCORD_HTTP_MAX_KEEPALIVE_CONNECTIONS", "8")
+    monkeypatch.setenv("DISCORD_HTTP_KEEPALIVE_EXPIRY", "12.5")
+    monkeypatch.setenv("DISCORD_HTTP2", "true")
+    monkeypatch.setattr(http_client, "find_spec", lambda _name: None)
+
+    config = DiscordHttpConfig.from_env()
+
+    assert config.max_connections == 4
+    assert config.max_keepalive_connections == 4  # Capped to max_connections.
+    assert config.keepalive_expiry == pytest.approx(12.5)
+    assert config.http2 is False  # h2 is not installed.
+
+
+def test_discord_http_config_ignores_invalid_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DISCORD_HTTP_MAX_CONNECTIONS", "lots")
+
+    assert DiscordHttpConfig.from_env().max_connections == http_client.DEFAULT_MAX_CONNECTIONS
+
+
+def test_shared_client_lifecycle() -> None:
+    close_discord_http_client()
+
+    opened = open_discord_http_client()
+    assert get_discord_http_client() is opened
+    assert open_discord_http_client() is opened
+
+    close_discord_http_client()
+    assert opened.is_closed
+    assert get_discord_http_stats().requests == 0
+
+    reopened = get_discord_http_client()
+    assert reopened is not opened
+    assert not reopened.is_closed
+    close_discord_http_client()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import json
 import re
@@ -18,19 +19,26 @@ import pytest
 from fastapi.testclient import TestClient
 from reader import FeedExistsError
 from reader import FeedNotFoundError
+from reader import make_reader
 
 import discord_rss_bot.main as main_module
 from discord_rss_bot import feeds
 from discord_rss_bot.main import app
 from discord_rss_bot.main import create_html_for_feed
 from discord_rss_bot.main import get_reader_dependency
+from discord_rss_bot.outbox import Outbox
+from discord_rss_bot.rate_limits import RateLimitManager
+from discord_rss_bot.sent_webhooks import SentWebhookStore
+from discord_rss_bot.state_db import StateDatabase
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
     from httpx2 import Response
     from reader import Entry
     from reader import Reader
+    from starlette.responses import StreamingResponse
 
     from discord_rss_bot.feeds import JsonValue
 
@@ -239,6 +247,65 @@ def test_create_feed_suggests_autodiscovered_links() -> None:
     assert f'value="{webhook_name}"' in response.text
 
 
+def test_healthz_reports_discord_circuit() -> None:
+    """Test that /healthz reports the circuit breaker and outbox size."""
+    manager = RateLimitManager()
+    with patch("discord_rss_bot.main.get_rate_limit_manager", return_value=manager):
+        response: Response = client.get("/healthz")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+        assert response.json()["discord_circuit"]["state"] == "closed"
+        assert isinstance(response.json()["outbox_count"], int)
+
+        manager.breaker.trip(30.0, "Discord global rate limit")
+        response = client.get("/healthz")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"
+    assert response.json()["discord_circuit"]["reason"] == "Discord global rate limit"
+
+
+def test_failed_deliveries_page_replays_filtered_messages(tmp_path: Path) -> None:
+    """Test that /failed_deliveries lists dead letters and replays them back into the outbox."""
+    db = StateDatabase(tmp_path / "state.sqlite")
+    outbox = Outbox(db)
+    for index, webhook_url in enumerate([
+        "https://discord.com/api/webhooks/1/a",
+        "https://discord.com/api/webhooks/2/b",
+    ]):
+        outbox.add_dead_letter(
+            feed_url="https://example.com/feed.xml",
+            entry_id=f"entry-{index}",
+            webhook_url=webhook_url,
+            delivery_mode="text",
+            request_payload={"content": f"Failed message {index}"},
+            message_payload={"content": f"Failed message {index}"},
+            error="404: Unknown Webhook",
+            status_code=404,
+            response_body='{"message": "Unknown Webhook"}',
+        )
+
+    try:
+        with patch("discord_rss_bot.main.get_outbox", return_value=outbox):
+            response: Response = client.get("/failed_deliveries")
+            assert response.status_code == 200, f"/failed_deliveries failed: {response.text}"
+            assert "Failed message 0" in response.text
+            assert "Failed message 1" in response.text
+
+            response = client.post(
+                url="/failed_deliveries/replay",
+                data={"webhook_url": "https://discord.com/api/webhooks/2/b"},
+                follow_redirects=False,
+            )
+            assert response.status_code == 303, f"/failed_deliveries/replay failed: {response.text}"
+            assert "Queued+1+message" in response.headers["location"]
+
+        assert [message.entry_id for message in outbox.get_all()] == ["entry-1"]
+        assert [dead_letter.entry_id for dead_letter in outbox.get_dead_letters()] == ["entry-0"]
+    finally:
+        db.close()
+
+
 def test_get() -> None:
     """Test the /create_feed page."""
     # Ensure webhook exists for this test regardless of test order.
@@ -340,7 +407,7 @@ def test_feed_page_shows_steam_thumbnail_hint_for_steam_feeds() -> None:
     app.dependency_overrides[get_reader_dependency] = lambda: stub
 
     try:
-        with patch("discord_rss_bot.main.create_html_for_feed", return_value=""):
+        with patch("discord_rss_bot.main.iter_entry_cards_html", return_value=[]):
             response: Response = client.get(url="/feed", params={"feed_url": stub.feed.url})
 
         assert response.status_code == 200, f"/feed failed: {response.text}"
@@ -428,7 +495,7 @@ def test_feed_page_with_percent_encoded_url(encoded_url: str) -> None:
     app.dependency_overrides[get_reader_dependency] = lambda: stub
 
     try:
-        with patch("discord_rss_bot.main.create_html_for_feed", return_value=""):
+        with patch("discord_rss_bot.main.iter_entry_cards_html", return_value=[]):
             response: Response = client.get(url="/feed", params={"feed_url": encoded_url})
 
         assert response.status_code == 200, f"/feed failed: {response.text}"
@@ -850,6 +917,102 @@ def test_set_feed_save_sent_webhooks_route_updates_stored_tag() -> None:
         app.dependency_overrides = {}
 
 
+def test_set_feed_pack_embeds_route_updates_stored_tag() -> None:
+    @dataclass(slots=True)
+    class DummyFeed:
+        url: str
+        title: str
+
+    class StubReader:
+        def __init__(self) -> None:
+            self.feed = DummyFeed(url="https://example.com/feed.xml", title="Example")
+            self.tags: dict[tuple[str, str], bool] = {}
+
+        def get_feed(self, feed_url: str) -> DummyFeed:
+            assert feed_url == self.feed.url
+            return self.feed
+
+        def set_tag(self, resource: str, key: str, value: bool) -> None:  # ruff:ignore[boolean-type-hint-positional-argument]
+            self.tags[resource, key] = value
+
+    stub_reader = StubReader()
+    app.dependency_overrides[get_reader_dependency] = lambda: stub_reader
+
+    try:
+        with patch("discord_rss_bot.main.commit_state_change"):
+            response: Response = client.post(
+                url="/set_feed_pack_embeds",
+                data={"feed_url": stub_reader.feed.url, "enabled": "true"},
+                follow_redirects=False,
+            )
+
+        assert response.status_code == 303, f"/set_feed_pack_embeds failed: {response.text}"
+        assert stub_reader.tags[stub_reader.feed.url, "pack_embeds"] is True
+    finally:
+        app.dependency_overrides = {}
+
+
+def test_add_and_remove_feed_extra_webhook_routes_update_stored_tag() -> None:
+    @dataclass(slots=True)
+    class DummyFeed:
+        url: str
+        title: str
+
+    class StubReader:
+        def __init__(self) -> None:
+            self.feed = DummyFeed(url="https://example.com/feed.xml", title="Example")
+            self.tags: dict[tuple[object, str], object] = {
+                ((), "webhooks"): [{"name": "Mirror", "url": "https://discord.com/api/webhooks/2/b"}],
+            }
+
+        def get_feed(self, feed_url: str) -> DummyFeed:
+            if feed_url != self.feed.url:
+                raise FeedNotFoundError(feed_url)
+            return self.feed
+
+        def get_tag(self, resource: object, key: str, default: object) -> object:
+            return self.tags.get((resource, key), default)
+
+        def set_tag(self, resource: object, key: str, value: object) -> None:
+            self.tags[resource, key] = value
+
+        def delete_tag(self, resource: object, key: str, *, missing_ok: bool = False) -> None:
+            assert missing_ok
+            self.tags.pop((resource, key), None)
+
+    stub_reader = StubReader()
+    app.dependency_overrides[get_reader_dependency] = lambda: stub_reader
+
+    try:
+        with patch("discord_rss_bot.main.commit_state_change"):
+            response: Response = client.post(
+                url="/add_feed_extra_webhook",
+                data={"feed_url": stub_reader.feed.url, "webhook_dropdown": "Mirror", "username": " Bot "},
+                follow_redirects=False,
+            )
+            assert response.status_code == 303, f"/add_feed_extra_webhook failed: {response.text}"
+            assert stub_reader.tags[stub_reader.feed.url, "extra_webhooks"] == [
+                {"url": "https://discord.com/api/webhooks/2/b", "username": "Bot", "avatar_url": ""},
+            ]
+
+            response = client.post(
+                url="/add_feed_extra_webhook",
+                data={"feed_url": stub_reader.feed.url, "webhook_dropdown": "Unknown"},
+                follow_redirects=False,
+            )
+            assert response.status_code == 404
+
+            response = client.post(
+                url="/remove_feed_extra_webhook",
+                data={"feed_url": stub_reader.feed.url, "webhook_url": "https://discord.com/api/webhooks/2/b"},
+                follow_redirects=False,
+            )
+            assert response.status_code == 303, f"/remove_feed_extra_webhook failed: {response.text}"
+            assert (stub_reader.feed.url, "extra_webhooks") not in stub_reader.tags
+    finally:
+        app.dependency_overrides = {}
+
+
 def test_set_feed_media_gallery_image_limit_route_updates_stored_tag() -> None:
     @dataclass(slots=True)
     class DummyFeed:
@@ -920,66 +1083,73 @@ def test_set_feed_webhook_text_length_limit_route_updates_stored_tag() -> None:
         app.dependency_overrides = {}
 
 
-def test_sent_webhooks_view_shows_saved_records() -> None:
-    @dataclass(slots=True)
-    class DummyFeed:
-        url: str
-        title: str
-
+def test_sent_webhooks_view_shows_saved_records(tmp_path: Path) -> None:
     sent_webhook_url = "https://discord.com/api/webhooks/123/abc"
     sent_feed_url = "https://example.com/feed.xml"
 
     class StubReader:
-        def __init__(self) -> None:
-            self.feed = DummyFeed(url=sent_feed_url, title="Example feed")
-
+        # Feed titles come from the saved records, so the page does not list every feed.
         def get_tag(
             self,
             resource: str | tuple[()],
             key: str,
             default: feeds.JsonValue = None,
         ) -> feeds.JsonValue:
-            if resource == () and key == "sent_webhooks":
-                return [
-                    {
-                        "feed_url": sent_feed_url,
-                        "feed_title": "Example feed",
-                        "entry_id": "entry-1",
-                        "entry_title": "Fixed typo",
-                        "entry_link": "https://example.com/entry-1",
-                        "webhook_url": sent_webhook_url,
-                        "message_id": "message-1",
-                        "delivery_mode": "text",
-                        "payload": {"content": "Fixed typo", "embeds": [], "attachments": []},
-                        "discord_response": {"id": "message-1", "channel_id": "channel-1"},
-                        "response_text": '{"id": "message-1", "channel_id": "channel-1"}',
-                        "last_updated_at": "2026-05-08T12:00:00+00:00",
-                        "last_status_code": 200,
-                        "update_count": 1,
-                    },
-                ]
             if resource == () and key == "webhooks":
                 return [{"name": "Main", "url": sent_webhook_url}]
             return default
 
-        def get_feeds(self) -> list[DummyFeed]:
-            return [self.feed]
-
+    db = StateDatabase(tmp_path / "state.sqlite")
+    store = SentWebhookStore(db)
+    store.save([
+        {
+            "feed_url": sent_feed_url,
+            "feed_title": "Example feed",
+            "entry_id": "entry-1",
+            "entry_title": "Fixed typo",
+            "entry_link": "https://example.com/entry-1",
+            "webhook_url": sent_webhook_url,
+            "message_id": "message-1",
+            "delivery_mode": "text",
+            "payload": {"content": "Fixed typo", "embeds": [], "attachments": []},
+            "discord_response": {"id": "message-1", "channel_id": "channel-1"},
+            "response_text": '{"id": "message-1", "channel_id": "channel-1"}',
+            "last_updated_at": "2026-05-08T12:00:00+00:00",
+            "last_status_code": 200,
+            "update_count": 1,
+        },
+    ])
     app.dependency_overrides[get_reader_dependency] = StubReader
 
     try:
-        response: Response = client.get(url="/sent_webhooks")
+        with patch("discord_rss_bot.main.get_sent_webhook_store", return_value=store):
+            response: Response = client.get(url="/sent_webhooks")
+            record_response: Response = client.get(
+                url="/sent_webhooks/record",
+                params={"feed_url": sent_feed_url, "entry_id": "entry-1", "webhook_url": sent_webhook_url},
+            )
+            missing_response: Response = client.get(
+                url="/sent_webhooks/record",
+                params={"feed_url": sent_feed_url, "entry_id": "entry-2", "webhook_url": sent_webhook_url},
+            )
 
         assert response.status_code == 200, f"/sent_webhooks failed: {response.text}"
         assert "Fixed typo" in response.text
         assert "message-1" in response.text
-        assert "channel-1" in response.text
-        assert sent_webhook_url not in response.text
+        assert "1 edit" in response.text
         assert "HTTP 200" in response.text
         assert "Example feed" in response.text
         assert "Main" in response.text
+        # The saved payload and response are only loaded when a row is expanded.
+        assert "channel-1" not in response.text
+        assert "/sent_webhooks/record?" in response.text
+
+        assert record_response.status_code == 200, f"/sent_webhooks/record failed: {record_response.text}"
+        assert "channel-1" in record_response.text
+        assert missing_response.status_code == 404
     finally:
         app.dependency_overrides = {}
+        db.close()
 
 
 def test_set_global_screenshot_layout_stores_value() -> None:
@@ -1762,6 +1932,8 @@ def test_create_html_marks_entries_from_another_feed(monkeypatch: pytest.MonkeyP
         summary: str = "Summary"
         content: list[DummyContent] = field(default_factory=lambda: [DummyContent("Content")])
         published: None = None
+        updated: None = None
+        last_updated: None = None
 
         def __post_init__(self) -> None:
             if self.original_feed_url is None:
@@ -1777,17 +1949,19 @@ def test_create_html_marks_entries_from_another_feed(monkeypatch: pytest.MonkeyP
     )
 
     monkeypatch.setattr(
-        "discord_rss_bot.main.replace_tags_in_text_message",
+        "discord_rss_bot.entry_cards.replace_tags_in_text_message",
         lambda _entry, **_kwargs: "Rendered content",
     )
-    monkeypatch.setattr("discord_rss_bot.main.entry_is_blacklisted", lambda _entry, **_kwargs: False)
-    monkeypatch.setattr("discord_rss_bot.main.entry_is_whitelisted", lambda _entry, **_kwargs: False)
 
     same_feed_entry_typed: Entry = cast("Entry", same_feed_entry)
     other_feed_entry_typed: Entry = cast("Entry", other_feed_entry)
 
+    # No saved filters, so neither entry is marked as blacklisted or whitelisted.
+    reader = MagicMock()
+    reader.get_tags.return_value = []
+
     html: str = create_html_for_feed(
-        reader=MagicMock(),
+        reader=reader,
         current_feed_url=selected_feed_url,
         entries=[
             same_feed_entry_typed,
@@ -2072,10 +2246,10 @@ def test_webhook_entries_sort_newest_and_non_null_published_first() -> None:
 
     observed_order: list[str] = []
 
-    def capture_entries(*, reader: Reader, entries: list[Entry], current_feed_url: str = "") -> str:
+    def capture_entries(*, reader: Reader, entries: list[Entry], current_feed_url: str = "") -> list[str]:
         del reader, current_feed_url
         observed_order.extend(entry.id for entry in entries)
-        return ""
+        return []
 
     app.dependency_overrides[get_reader_dependency] = StubReader
     try:
@@ -2084,7 +2258,7 @@ def test_webhook_entries_sort_newest_and_non_null_published_first() -> None:
                 "discord_rss_bot.main.get_data_from_hook_url",
                 return_value=main_module.WebhookInfo(custom_name=webhook_name, url=webhook_url),
             ),
-            patch("discord_rss_bot.main.create_html_for_feed", side_effect=capture_entries),
+            patch("discord_rss_bot.main.iter_entry_cards_html", side_effect=capture_entries),
         ):
             response: Response = client.get(
                 url="/webhook_entries",
@@ -3959,3 +4133,167 @@ class TestMassNav:
         response: Response = client.get("/")
         assert response.status_code == 200
         assert "/mass" in response.text, f"Expected /mass link in navbar: {response.text}"
+
+
+def test_set_feed_digest_settings_route_updates_stored_tags() -> None:
+    @dataclass(slots=True)
+    class DummyFeed:
+        url: str
+        title: str
+
+    class StubReader:
+        def __init__(self) -> None:
+            self.feed = DummyFeed(url="https://example.com/feed.xml", title="Example")
+            self.tags: dict[tuple[str, str], object] = {("https://example.com/feed.xml", "digest_message"): "old"}
+
+        def get_feed(self, feed_url: str) -> DummyFeed:
+            assert feed_url == self.feed.url
+            return self.feed
+
+        def set_tag(self, resource: str, key: str, value: object) -> None:
+            self.tags[resource, key] = value
+
+        def delete_tag(self, resource: str, key: str, *, missing_ok: bool = False) -> None:
+            assert missing_ok
+            self.tags.pop((resource, key), None)
+
+    stub_reader = StubReader()
+    app.dependency_overrides[get_reader_dependency] = lambda: stub_reader
+
+    try:
+        with patch("discord_rss_bot.main.commit_state_change"):
+            response: Response = client.post(
+                url="/set_feed_digest_settings",
+                data={
+                    "feed_url": stub_reader.feed.url,
+                    "interval": "30",
+                    "max_entries": "500",
+                    "entry_template": "* {{entry_title}}",
+                    "message_template": "",
+                },
+                follow_redirects=False,
+            )
+
+        assert response.status_code == 303, f"/set_feed_digest_settings failed: {response.text}"
+        assert stub_reader.tags == {
+            (stub_reader.feed.url, "digest_interval"): 30,
+            (stub_reader.feed.url, "digest_max_entries"): 100,
+            (stub_reader.feed.url, "digest_entry_template"): "* {{entry_title}}",
+        }
+    finally:
+        app.dependency_overrides = {}
+
+
+def test_sent_webhooks_view_filters_and_pages(tmp_path: Path) -> None:
+    class StubReader:
+        def get_tag(self, _resource: str | tuple[()], _key: str, default: feeds.JsonValue = None) -> feeds.JsonValue:
+            return default
+
+    db = StateDatabase(tmp_path / "state.sqlite")
+    store = SentWebhookStore(db)
+    store.save(
+        {
+            "feed_url": "https://example.com/feed.xml",
+            "entry_id": f"entry-{index:02d}",
+            "entry_title": f"Title {index:02d}",
+            "webhook_url": "https://discord.com/api/webhooks/123/abc",
+            "message_id": f"message-{index}",
+            "last_sent_at": f"2026-05-{index:02d}T12:00:00+00:00",
+            "last_status_code": 200 if index % 2 else 404,
+            "last_error": "" if index % 2 else "Unknown Webhook",
+        }
+        for index in range(1, 21)
+    )
+    app.dependency_overrides[get_reader_dependency] = StubReader
+
+    try:
+        with (
+            patch("discord_rss_bot.main.get_sent_webhook_store", return_value=store),
+            patch("discord_rss_bot.main.SENT_WEBHOOKS_PAGE_SIZE", 3),
+        ):
+            response: Response = client.get(
+                url="/sent_webhooks",
+                params={"status": "failed", "since": "2026-05-03", "until": "2026-05-16"},
+            )
+            assert response.status_code == 200, f"/sent_webhooks failed: {response.text}"
+            assert "7 saved messages" in response.text
+            assert [title in response.text for title in ("Title 16", "Title 14", "Title 12", "Title 10")] == [
+                True,
+                True,
+                True,
+                False,
+            ]
+
+            next_page_url = re.search(r'href="(/sent_webhooks\?[^"]*starting_after=[^"]*)"', response.text)
+            assert next_page_url is not None
+            next_page: Response = client.get(url=next_page_url.group(1).replace("&amp;", "&"))
+
+        assert next_page.status_code == 200, f"/sent_webhooks next page failed: {next_page.text}"
+        assert "Title 10" in next_page.text
+        assert "Title 06" in next_page.text
+        assert "Title 12" not in next_page.text
+        assert "Title 04" not in next_page.text
+        assert "Title 11" not in next_page.text
+    finally:
+        app.dependency_overrides = {}
+        db.close()
+
+
+def test_feed_page_streams_entry_cards_inside_the_page(tmp_path: Path) -> None:
+    reader: Reader = make_reader(str(tmp_path / "streamed.sqlite"))
+    streamed_feed_url = "https://example.com/streamed.xml"
+    reader.add_feed(streamed_feed_url)
+    for index in range(3):
+        reader.add_entry({"feed_url": streamed_feed_url, "id": f"streamed-{index}", "title": f"Streamed {index}"})
+
+    app.dependency_overrides[get_reader_dependency] = lambda: reader
+    try:
+        response: Response = client.get(url="/feed", params={"feed_url": streamed_feed_url})
+    finally:
+        app.dependency_overrides = {}
+        reader.close()
+
+    assert response.status_code == 200, f"/feed failed: {response.text}"
+    assert response.headers["content-type"].startswith("text/html")
+    assert main_module.ENTRY_CARDS_MARKER not in response.text
+    assert all(f"<h2>Streamed {index}</h2>" in response.text for index in range(3))
+    assert response.text.rstrip().endswith("</html>")
+
+
+def test_stream_page_with_entry_cards_sends_the_page_before_rendering_cards() -> None:
+    rendered: list[str] = []
+
+    def render_cards() -> Iterator[str]:
+        for index in range(2):
+            rendered.append(f"card {index}")
+            yield f"<div>card {index}</div>"
+        msg = "extension failed"
+        raise RuntimeError(msg)
+
+    async def read_body(response: StreamingResponse) -> list[str]:
+        chunks: list[str] = []
+        async for chunk in response.body_iterator:
+            if not chunks:
+                # The page shell is sent before the first card is rendered.
+                assert rendered == []
+            chunks.append(chunk if isinstance(chunk, str) else bytes(chunk).decode())
+        return chunks
+
+    request = MagicMock(url="http://testserver/feed")
+    with patch.object(
+        main_module.templates,
+        "get_template",
+        return_value=main_module.templates.env.from_string("<main>{{ title }}<pre>{{ html|safe }}</pre></main>"),
+    ):
+        response: StreamingResponse = main_module.stream_page_with_entry_cards(
+            request,
+            "feed.html",
+            {"title": "Feed"},
+            render_cards(),
+        )
+    chunks: list[str] = asyncio.run(read_body(response))
+
+    assert chunks[0] == "<main>Feed<pre>"
+    assert chunks[-1] == "</pre></main>"
+    assert "".join(chunks[1:3]) == "<div>card 0</div><div>card 1</div>"
+    assert "Failed to render the rest of the entries" in chunks[3]
@@ -0,0 +1,499 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from discord_rss_bot import feeds
+from discord_rss_bot.outbox import BACKOFF_MAX_SECONDS
+from discord_rss_bot.outbox import Outbox
+from discord_rss_bot.outbox import get_backoff_seconds
+from discord_rss_bot.packing import get_pack_key
+from discord_rss_bot.rate_limits import RateLimitManager
+from discord_rss_bot.state_db import MIGRATIONS
+from discord_rss_bot.state_db import StateDatabase
+from discord_rss_bot.webhook import DiscordWebhook
+from discord_rss_bot.webhook import WebhookFile
+from tests.fake_discord import serve_fake_discord
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def outbox(tmp_path: Path) -> Iterator[Outbox]:
+    db = StateDatabase(tmp_path / "state.sqlite")
+    yield Outbox(db)
+    db.close()
+
+
+def _enqueue(outbox: Outbox, webhook_url: str, entry_id: str, *, now: float | None = None) -> int | None:
+    return outbox.enqueue(
+        feed_url="https://example.com/feed.xml",
+        entry_id=entry_id,
+        webhook_url=webhook_url,
+        delivery_mode="text",
+        request_payload={"content": entry_id},
+        message_payload={"content": entry_id, "embeds": [], "attachments": []},
+        now=now,
+    )
+
+
+def test_state_database_is_migrated_to_latest_schema(tmp_path: Path) -> None:
+    db = StateDatabase(tmp_path / "state.sqlite")
+    assert db.schema_version == len(MIGRATIONS)
+    db.close()
+
+    # Reopening an up-to-date database does not run the migrations again.
+    reopened = StateDatabase(tmp_path / "state.sqlite")
+    assert reopened.schema_version == len(MIGRATIONS)
+    reopened.close()
+
+
+def test_get_backoff_seconds_doubles_up_to_the_cap() -> None:
+    assert get_backoff_seconds(0) == 0
+    assert get_backoff_seconds(1) == 30
+    assert get_backoff_seconds(2) == 60
+    assert get_backoff_seconds(3) == 120
+    assert get_backoff_seconds(50) == BACKOFF_MAX_SECONDS
+
+
+def test_outbox_round_trips_payload_and_files(outbox: Outbox) -> None:
+    message_id = outbox.enqueue(
+        feed_url="https://example.com/feed.xml",
+        entry_id="entry-1",
+        webhook_url="https://discord.com/api/webhooks/1/a",
+        delivery_mode="screenshot",
+        request_payload={"content": "hello"},
+        message_payload={"content": "hello", "embeds": [], "attachments": []},
+        thread_id="99",
+        files=[WebhookFile(filename="entry.png", content=b"\x89PNG")],
+    )
+
+    [message] = outbox.get_due()
+    assert message.id == message_id
+    assert message.request_payload == {"content": "hello"}
+    assert message.files == (WebhookFile(filename="entry.png", content=b"\x89PNG"),)
+
+    webhook = message.to_webhook()
+    assert webhook.url == "https://discord.com/api/webhooks/1/a"
+    assert webhook.thread_id == "99"
+    assert webhook.files == [WebhookFile(filename="entry.png", content=b"\x89PNG")]
+
+
+def test_outbox_queues_an_entry_once_per_webhook(outbox: Outbox) -> None:
+    assert _enqueue(outbox, "https://discord.com/api/webhooks/1/a", "entry-1") is not None
+    assert _enqueue(outbox, "https://discord.com/api/webhooks/1/a", "entry-1") is None
+    assert _enqueue(outbox, "https://discord.com/api/webhooks/2/b", "entry-1") is not None
+    assert outbox.count() == 2
+
+
+def test_outbox_survives_restart(tmp_path: Path) -> None:
+    db = StateDatabase(tmp_path / "state.sqlite")
+    _enqueue(Outbox(db), "https://discord.com/api/webhooks/1/a", "entry-1")
+    db.close()
+
+    reopened = StateDatabase(tmp_path / "state.sqlite")
+    assert [message.entry_id for message in Outbox(reopened).get_due()] == ["entry-1"]
+    reopened.close()
+
+
+def test_mark_failed_backs_off_exponentially(outbox: Outbox) -> None:
+    message_id = _enqueue(outbox, "https://discord.com/api/webhooks/1/a", "entry-1", now=1000.0)
+    assert message_id is not None
+
+    assert outbox.mark_failed(message_id, "500: boom", now=1000.0) == pytest.approx(1030.0)
+    assert outbox.get_due(now=1029.0) == []
+    assert outbox.mark_failed(message_id, "500: boom", now=1030.0) == pytest.approx(1090.0)
+
+    [message] = outbox.get_due(now=1090.0)
+    assert message.attempts == 2
+    assert message.last_error == "500: boom"
+
+    outbox.mark_sent(message_id)
+    assert outbox.count() == 0
+
+
+def test_mark_failed_moves_message_to_dead_letters_after_max_attempts(tmp_path: Path) -> None:
+    db = StateDatabase(tmp_path / "state.sqlite")
+    outbox = Outbox(db, max_attempts=2)
+    message_id = outbox.enqueue(
+        feed_url="https://example.com/feed.xml",
+        entry_id="entry-1",
+        webhook_url="https://discord.com/api/webhooks/1/a",
+        delivery_mode="screenshot",
+        request_payload={"content": "hello"},
+        message_payload={"content": "hello", "embeds": [], "attachments": []},
+        files=[WebhookFile(filename="entry.png", content=b"\x89PNG")],
+        now=1000.0,
+    )
+    assert message_id is not None
+
+    assert outbox.mark_failed(message_id, "500: boom", status_code=500, now=1000.0) == pytest.approx(1030.0)
+    assert outbox.mark_failed(message_id, "500: boom", status_code=500, response_body="boom", now=1030.0) is None
+    assert outbox.count() == 0
+
+    [dead_letter] = outbox.get_dead_letters()
+    assert (dead_letter.attempts, dead_letter.status_code, dead_letter.response_body) == (2, 500, "boom")
+    assert dead_letter.failed_at == pytest.approx(1030.0)
+
+    assert outbox.replay_dead_letters(now=2000.0) == 1
+    assert outbox.count_dead_letters() == 0
+    [message] = outbox.get_due(now=2000.0)
+    assert message.attempts == 0
+    assert message.files == (WebhookFile(filename="entry.png", content=b"\x89PNG"),)
+    db.close()
+
+
+def test_replay_and_delete_dead_letters_by_filter(outbox: Outbox) -> None:
+    webhooks = ["https://discord.com/api/webhooks/1/a", "https://discord.com/api/webhooks/2/b"]
+    for index, webhook_url in enumerate([*webhooks, webhooks[0]]):
+        outbox.add_dead_letter(
+            feed_url="https://example.com/feed.xml",
+            entry_id=f"entry-{index}",
+            webhook_url=webhook_url,
+            delivery_mode="text",
+            request_payload={"content": f"entry-{index}"},
+            message_payload={"content": f"entry-{index}"},
+            error="404: Unknown Webhook",
+            status_code=404,
+        )
+    _enqueue(outbox, webhooks[0], "entry-2")
+
+    assert outbox.count_dead_letters(webhook_url=webhooks[0]) == 2
+    # entry-2 is already queued again, so replaying drops its dead letter instead of sending it twice.
+    assert outbox.replay_dead_letters(webhook_url=webhooks[0]) == 1
+    assert [message.entry_id for message in outbox.get_all()] == ["entry-2", "entry-0"]
+
+    [remaining] = outbox.get_dead_letters()
+    assert outbox.delete_dead_letters(ids=[]) == 0
+    assert outbox.delete_dead_letters(ids=[remaining.id]) == 1
+    assert outbox.count_dead_letters() == 0
+
+
+def test_enqueue_entry_for_delivery_stores_rendered_webhook(outbox: Outbox) -> None:
+    reader = MagicMock()
+    entry = MagicMock()
+    entry.id = "entry-1"
+    entry.feed.url = "https://example.com/feed.xml"
+    entry.feed.updates_enabled = True
+    webhook = DiscordWebhook(url="https://discord.com/api/webhooks/1/a", content="Rendered")
+
+    with (
+        patch("discord_rss_bot.feeds.create_webhook_for_entry", return_value=(webhook, "text")),
+        patch("discord_rss_bot.feeds.run_modify_webhook", side_effect=lambda webhook, *_args: webhook),
+    ):
+        message_id = feeds.enqueue_entry_for_delivery(webhook.url, entry, reader, outbox=outbox)
+
+    [message] = outbox.get_due()
+    assert message.id == message_id
+    assert message.delivery_mode == "text"
+    assert message.request_payload == {"content": "Rendered"}
+    assert message.message_payload == {"content": "Rendered", "embeds": [], "attachments": []}
+
+
+def test_enqueue_entry_for_delivery_renders_once_for_every_target(outbox: Outbox) -> None:
+    reader = MagicMock()
+    entry = MagicMock()
+    entry.id = "entry-1"
+    entry.feed.url = "https://example.com/feed.xml"
+    entry.feed.updates_enabled = True
+    webhook = DiscordWebhook(url="https://discord.com/api/webhooks/1/a", content="Rendered", username="Feed")
+    extra_targets = (
+        feeds.WebhookTarget(url="https://discord.com/api/webhooks/2/b"),
+        feeds.WebhookTarget(url="https://discord.com/api/webhooks/3/c", username="Mirror"),
+    )
+
+    with (
+        patch("discord_rss_bot.feeds.create_webhook_for_entry", return_value=(webhook, "text")) as render,
+        patch("discord_rss_bot.feeds.run_modify_webhook", side_effect=lambda webhook, *_args: webhook),
+    ):
+        feeds.enqueue_entry_for_delivery(webhook.url, entry, reader, outbox=outbox, extra_targets=extra_targets)
+
+    render.assert_called_once()
+    messages = {message.webhook_url: message for message in outbox.get_all()}
+    assert list(messages) == [webhook.url, *(target.url for target in extra_targets)]
+    assert messages[webhook.url].request_payload["username"] == "Feed"
+    assert messages[extra_targets[0].url].request_payload["username"] == "Feed"
+    assert messages[extra_targets[1].url].request_payload["username"] == "Mirror"
+    assert messages[extra_targets[1].url].message_payload == messages[webhook.url].message_payload
+
+
+def test_enqueue_entry_for_delivery_keeps_the_thread_id_to_the_main_webhook(outbox: Outbox) -> None:
+    reader = MagicMock()
+    reader.get_tag.side_effect = lambda _resource, key, default: key == "pack_embeds" or default
+    entry = MagicMock()
+    entry.id = "entry-1"
+    entry.feed.url = "https://example.com/feed.xml"
+    entry.feed.updates_enabled = True
+    webhook = DiscordWebhook(url="https://discord.com/api/webhooks/1/a")
+    webhook.json["embeds"] = [{"description": "Rendered"}]
+    extra_target = feeds.WebhookTarget(url="https://discord.com/api/webhooks/2/b")
+
+    def set_thread(webhook: DiscordWebhook, *_args: object) -> DiscordWebhook:
+        webhook.thread_id = "123"
+        return webhook
+
+    with (
+        patch("discord_rss_bot.feeds.create_webhook_for_entry", return_value=(webhook, "embed")),
+        patch("discord_rss_bot.feeds.run_modify_webhook", side_effect=set_thread),
+    ):
+        feeds.enqueue_entry_for_delivery(webhook.url, entry, reader, outbox=outbox, extra_targets=(extra_target,))
+
+    messages = {message.webhook_url: message for message in outbox.get_all()}
+    assert messages[webhook.url].thread_id == "123"
+    assert messages[extra_target.url].thread_id is None
+    assert messages[extra_target.url].pack_key == get_pack_key(
+        messages[extra_target.url].request_payload,
+        thread_id=None,
+        has_files=False,
+    )
+
+
+def test_get_extra_webhook_targets_skips_invalid_and_duplicate_targets() -> None:
+    main_webhook = "https://discord.com/api/webhooks/1/a"
+    tags = {
+        "webhook": main_webhook,
+        "extra_webhooks": [
+            {"url": main_webhook},
+            {"url": "https://discord.com/api/webhooks/2/b", "username": "Mirror"},
+            {"url": "https://discord.com/api/webhooks/2/b"},
+            {"url": "not a url"},
+            {"url": "https://discord.com/api/webhooks/3/c", "avatar_url": "not a url"},
+            "https://discord.com/api/webhooks/4/d",
+        ],
+    }
+    reader = MagicMock()
+    reader.get_tag.side_effect = lambda _resource, key, default: tags.get(key, default)
+
+    assert feeds.get_extra_webhook_targets(reader, "https://example.com/feed.xml") == [
+        feeds.WebhookTarget(url="https://discord.com/api/webhooks/2/b", username="Mirror"),
+        feeds.WebhookTarget(url="https://discord.com/api/webhooks/3/c"),
+    ]
+
+
+def test_enqueue_entry_for_delivery_skips_paused_feed(outbox: Outbox) -> None:
+    entry = MagicMock()
+    entry.feed.updates_enabled = False
+
+    webhook_url = "https://discord.com/api/webhooks/1/a"
+    assert feeds.enqueue_entry_for_delivery(webhook_url, entry, MagicMock(), outbox=outbox) is None
+    assert outbox.count() == 0
+
+
+def test_drain_outbox_sends_due_messages_in_order(outbox: Outbox) -> None:
+    reader = MagicMock()
+    reader.get_entry.return_value = None
+
+    with (
+        serve_fake_discord() as fake,
+        patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=RateLimitManager()),
+    ):
+        for index in range(3):
+            _enqueue(outbox, fake.webhook_url(1), f"one-{index}")
+        _enqueue(outbox, fake.webhook_url(2), "two-0")
+
+        stats = feeds.drain_outbox(reader, outbox=outbox)
+
+    assert stats is not None
+    assert (stats.delivered, stats.failed) == (4, 0)
+    assert outbox.count() == 0
+    assert [r.payload["content"] for r in fake.requests if r.webhook_id == "1"] == ["one-0", "one-1", "one-2"]
+
+
+def test_drain_outbox_holds_back_later_messages_after_a_failure(outbox: Outbox) -> None:
+    reader = MagicMock()
+
+    with (
+        serve_fake_discord() as fake,
+        patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=RateLimitManager()),
+    ):
+        broken_webhook = f"{fake.base_url}/api/unknown/1/a"
+        _enqueue(outbox, broken_webhook, "first")
+        _enqueue(outbox, broken_webhook, "second")
+        _enqueue(outbox, fake.webhook_url(2), "other")
+
+        stats = feeds.drain_outbox(reader, outbox=outbox)
+
+    assert stats is not None
+    assert (stats.delivered, stats.failed) == (1, 2)
+    remaining = {message.entry_id: message for message in outbox.get_all()}
+    assert "first" not in remaining  # Discord will not accept it on a retry either.
+    assert remaining["second"].attempts == 0  # Not attempted, so it cannot overtake "first".
+    assert "other" not in remaining
+
+    [dead_letter] = outbox.get_dead_letters()
+    assert (dead_letter.entry_id, dead_letter.status_code, dead_letter.attempts) == ("first", 404, 1)
+    assert "Unknown Webhook" in dead_letter.response_body
+
+
+def test_get_due_holds_back_messages_queued_behind_a_backing_off_message(outbox: Outbox) -> None:
+    first_id = _enqueue(outbox, "https://discord.com/api/webhooks/1/a", "first", now=1000.0)
+    _enqueue(outbox, "https://discord.com/api/webhooks/1/a", "second", now=1000.0)
+    _enqueue(outbox, "https://discord.com/api/webhooks/2/b", "other", now=1000.0)
+    assert first_id is not None
+
+    outbox.mark_failed(first_id, "503: Service Unavailable", now=1000.0)
+
+    assert [message.entry_id for message in outbox.get_due(now=1000.0)] == ["other"]
+    assert [message.entry_id for message in outbox.get_due(now=1030.0)] == ["first", "second", "other"]
+
+
+def test_drain_outbox_delivers_a_retried_message_before_later_ones(outbox: Outbox) -> None:
+    with (
+        serve_fake_discord() as fake,
+        patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=RateLimitManager()),
+    ):
+        fake.server_errors["1"] = 1
+        first_id = _enqueue(outbox, fake.webhook_url(1), "first")
+        _enqueue(outbox, fake.webhook_url(1), "second")
+        assert first_id is not None
+
+        feeds.drain_outbox(MagicMock(), outbox=outbox)
+        # "first" is backing off, so "second" keeps waiting behind it in the next drain too.
+        feeds.drain_outbox(MagicMock(), outbox=outbox)
+        assert [r.status_code for r in fake.requests] == [503]
+
+        outbox.defer(first_id, time.time(), reason="Retry now")
+        stats = feeds.drain_outbox(MagicMock(), outbox=outbox)
+
+    assert stats is not None
+    assert (stats.delivered, stats.failed) == (2, 0)
+    assert outbox.count() == 0
+    assert [(r.payload["content"], r.status_code) for r in fake.requests] == [
+        ("first", 503),
+        ("first", 200),
+        ("second", 200),
+    ]
+
+
+def test_drain_outbox_requeues_exhausted_bucket_instead_of_sleeping(outbox: Outbox) -> None:
+    manager = RateLimitManager()
+    with (
+        serve_fake_discord(limit=1, window=5.0) as fake,
+        patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=manager),
+    ):
+        for index in range(3):
+            _enqueue(outbox, fake.webhook_url(1), f"entry-{index}")
+
+        started = time.monotonic()
+        feeds.drain_outbox(MagicMock(), outbox=outbox)
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 2  # The 5s bucket reset was not slept through.
+    assert fake.rate_limited == 0
+    remaining = outbox.get_all()
+    assert [message.entry_id for message in remaining] == ["entry-1", "entry-2"]
+    assert remaining[0].attempts == 0
+    assert remaining[0].next_attempt_at > time.time() + 3
+    assert remaining[1].next_attempt_at <= time.time()  # Waits behind entry-1 rather than being rescheduled.
+    assert manager.stats().deferred_requests == 1
+
+
+def test_drain_outbox_requeues_429_with_retry_after(outbox: Outbox) -> None:
+    with serve_fake_discord(limit=1, window=5.0) as fake:
+        # Another client already used up the bucket, so this process only learns about it from a 429.
+        with patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=RateLimitManager()):
+            feeds.request_discord_webhook(
+                "POST",
+                fake.webhook_url(1),
+                payload={"content": "elsewhere"},
+                params={},
+                files=None,
+                timeout=5.0,
+                rate_limit_retry=False,
+            )
+
+        manager = RateLimitManager()
+        _enqueue(outbox, fake.webhook_url(1), "entry-0")
+        with patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=manager):
+            feeds.drain_outbox(MagicMock(), outbox=outbox)
+
+    [message] = outbox.get_all()
+    assert message.attempts == 0
+    assert message.last_error.startswith("Rate limited")
+    assert message.next_attempt_at > time.time() + 3
+    assert fake.rate_limited == 1
+    assert manager.stats().rate_limited_responses == 1
+    assert manager.stats().deferred_requests == 1
+
+
+def test_drain_outbox_skips_while_the_circuit_breaker_is_open(outbox: Outbox) -> None:
+    manager = RateLimitManager()
+    manager.breaker.trip(30.0, "Discord global rate limit")
+
+    with (
+        serve_fake_discord() as fake,
+        patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=manager),
+    ):
+        _enqueue(outbox, fake.webhook_url(1), "entry-0")
+        assert feeds.drain_outbox(MagicMock(), outbox=outbox) is None
+
+    assert fake.requests == []
+    assert outbox.count() == 1
+
+
+def test_drain_outbox_packs_consecutive_embed_messages(outbox: Outbox) -> None:
+    reader = MagicMock()
+    reader.get_entry.side_effect = lambda key, _default: SimpleNamespace(id=key[1])
+
+    with (
+        serve_fake_discord() as fake,
+        patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=RateLimitManager()),
+        patch("discord_rss_bot.feeds.upsert_sent_webhook_record") as mock_upsert,
+    ):
+        for index in range(3):
+            outbox.enqueue(
+                feed_url="https://example.com/feed.xml",
+                entry_id=f"entry-{index}",
+                webhook_url=fake.webhook_url(1),
+                delivery_mode="embed",
+                request_payload={"embeds": [{"description": f"entry-{index}"}]},
+                message_payload={"content": "", "embeds": [{"description": f"entry-{index}"}], "attachments": []},
+                pack_key="key",
+            )
+        _enqueue(outbox, fake.webhook_url(1), "unpacked")
+
+        stats = feeds.drain_outbox(reader, outbox=outbox)
+
+    assert stats is not None
+    assert (stats.delivered, stats.failed) == (2, 0)
+    assert outbox.count() == 0
+    [packed, unpacked] = fake.requests
+    assert packed.payload["embeds"] == [{"description": f"entry-{index}"} for index in range(3)]
+    assert unpacked.payload == {"content": "unpacked"}
+    assert [(call.args[1].id, call.kwargs) for call in mock_upsert.call_args_list] == [
+        ("entry-0", {"pack_index": 0, "pack_size": 3}),
+        ("entry-1", {"pack_index": 1, "pack_size": 3}),
+        ("entry-2", {"pack_index": 2, "pack_size": 3}),
+        ("unpacked", {"pack_index": None, "pack_size": None}),
+    ]
+
+
+def test_enqueue_entry_for_delivery_sets_pack_key_for_opted_in_embed_feeds(outbox: Outbox) -> None:
+    reader = MagicMock()
+    reader.get_tag.side_effect = lambda _resource, key, default: key == "pack_embeds" or default
+    entry = MagicMock()
+    entry.id = "entry-1"
+    entry.feed.url = "https://example.com/feed.xml"
+    entry.feed.updates_enabled = True
+    webhook = DiscordWebhook(url="https://discord.com/api/webhooks/1/a", username="Feed")
+    webhook.json["embeds"] = [{"description": "Rendered"}]
+
+    with (
+        patch("discord_rss_bot.feeds.create_webhook_for_entry", return_value=(webhook, "embed")),
+        patch("discord_rss_bot.feeds.run_modify_webhook", side_effect=lambda webhook, *_args: webhook),
+    ):
+        feeds.enqueue_entry_for_delivery(webhook.url, entry, reader, outbox=outbox)
+        reader.get_tag.side_effect = lambda _resource, _key, default: default
+        entry.id = "entry-2"
+        feeds.enqueue_entry_for_delivery(webhook.url, entry, reader, outbox=outbox)
+
+    [packed, unpacked] = outbox.get_all()
+    assert packed.pack_key is not None
+    assert unpacked.pack_key is None
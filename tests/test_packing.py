@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from discord_rss_bot.outbox import OutboxMessage
+from discord_rss_bot.packing import MAX_EMBEDS_PER_MESSAGE
+from discord_rss_bot.packing import combine_payloads
+from discord_rss_bot.packing import get_embed_text_length
+from discord_rss_bot.packing import get_pack_key
+from discord_rss_bot.packing import pack_messages
+
+if TYPE_CHECKING:
+    from discord_rss_bot.webhook import JsonObject
+
+
+def _message(message_id: int, description: str, pack_key: str | None = "key") -> OutboxMessage:
+    payload: JsonObject = {"embeds": [{"description": description}], "username": "Feed"}
+    return OutboxMessage(
+        id=message_id,
+        feed_url="https://example.com/feed.xml",
+        entry_id=f"entry-{message_id}",
+        webhook_url="https://discord.com/api/webhooks/1/a",
+        delivery_mode="embed",
+        thread_id=None,
+        request_payload=payload,
+        message_payload=payload,
+        attempts=0,
+        next_attempt_at=0.0,
+        created_at=0.0,
+        last_error="",
+        pack_key=pack_key,
+    )
+
+
+def test_get_embed_text_length_counts_the_fields_discord_limits() -> None:
+    embed: JsonObject = {
+        "title": "abc",
+        "description": "defg",
+        "footer": {"text": "hi", "icon_url": "https://example.com/icon.png"},
+        "author": {"name": "me", "url": "https://example.com"},
+        "fields": [{"name": "n", "value": "value"}],
+        "image": {"url": "https://example.com/image.png"},
+    }
+
+    assert get_embed_text_length(embed) == 3 + 4 + 2 + 2 + 1 + 5
+
+
+def test_get_pack_key_only_accepts_plain_embed_messages() -> None:
+    payload: JsonObject = {"embeds": [{"description": "a"}], "username": "Feed"}
+
+    key = get_pack_key(payload, thread_id=None, has_files=False)
+    assert key is not None
+    assert get_pack_key({"embeds": [{"description": "b"}], "username": "Feed"}, thread_id=None, has_files=False) == key
+    assert get_pack_key(payload, thread_id="99", has_files=False) != key
+    assert get_pack_key({**payload, "username": "Other"}, thread_id=None, has_files=False) != key
+
+    assert get_pack_key(payload, thread_id=None, has_files=True) is None
+    assert get_pack_key({**payload, "content": "hello"}, thread_id=None, has_files=False) is None
+    assert get_pack_key({"components": [], "flags": 32768}, thread_id=None, has_files=False) is None
+    assert get_pack_key({"embeds": []}, thread_id=None, has_files=False) is None
+
+
+def test_pack_messages_keeps_order_and_respects_discord_limits() -> None:
+    messages = [_message(index, "x") for index in range(12)]
+
+    batches = pack_messages(messages)
+
+    assert [len(batch) for batch in batches] == [MAX_EMBEDS_PER_MESSAGE, 2]
+    assert [message.id for batch in batches for message in batch] == list(range(12))
+
+    long_messages = [_message(index, "x" * 2500) for index in range(3)]
+    assert [len(batch) for batch in pack_messages(long_messages)] == [2, 1]  # 3 * 2500 > 6000 characters.
+
+
+def test_pack_messages_only_packs_consecutive_messages_with_the_same_key() -> None:
+    messages = [
+        _message(1, "a"),
+        _message(2, "b"),
+        _message(3, "c", pack_key=None),
+        _message(4, "d"),
+        _message(5, "e", pack_key="other"),
+        _message(6, "f", pack_key=None),
+        _message(7, "g", pack_key=None),
+    ]
+
+    assert [[message.id for message in batch] for batch in pack_messages(messages)] == [[1, 2], [3], [4], [5], [6], [7]]
+
+
+def test_combine_payloads_merges_embeds_in_order() -> None:
+    combined = combine_payloads([
+        {"embeds": [{"description": "a"}], "username": "Feed"},
+        {"embeds": [{"description": "b"}], "username": "Feed"},
+    ])
+
+    assert combined == {"username": "Feed", "embeds": [{"description": "a"}, {"description": "b"}]}
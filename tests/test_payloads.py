@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import TYPE_CHECKING
+from typing import cast
+
+import pytest
+
+from discord_rss_bot import feeds
+from discord_rss_bot.payloads import canonical_json
+from discord_rss_bot.payloads import canonicalize_payload
+from discord_rss_bot.payloads import hash_payload
+from discord_rss_bot.webhook import DiscordWebhook
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from discord_rss_bot.webhook import JsonObject
+    from discord_rss_bot.webhook import JsonValue
+
+
+def _legacy_hash(payload: JsonObject) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+def test_canonicalize_payload_returns_a_plain_json_copy() -> None:
+    nested: dict[str, object] = {"b": (1, 2), "a": object.__name__}
+    payload: dict[str, object] = {"embeds": [nested], "content": "x"}
+
+    canonical = canonicalize_payload(payload)
+
+    assert canonical.text == '{"content":"x","embeds":[{"a":"object","b":[1,2]}]}'
+    assert canonical.payload == {"content": "x", "embeds": [{"a": "object", "b": [1, 2]}]}
+    assert cast("list[object]", canonical.payload["embeds"])[0] is not nested
+    assert canonical.digest == hash_payload(payload) == hash_payload({"content": "x", "embeds": [nested]})
+
+
+def test_hash_payload_matches_hashes_already_saved_with_sent_messages() -> None:
+    payload: JsonObject = {"content": "Ünïcode", "embeds": [{"title": "t", "color": 1}], "attachments": []}
+    assert hash_payload(payload) == _legacy_hash(payload)
+    assert canonical_json(payload) == json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+def test_get_webhook_payloads_normalizes_and_hashes_once() -> None:
+    webhook = DiscordWebhook(url="https://discord.com/api/webhooks/1/a", content="Hello", flags=1 << 15)
+
+    payloads = feeds.get_webhook_payloads(webhook)
+
+    assert payloads.request == {"content": "Hello", "flags": 1 << 15}
+    assert payloads.message == {"attachments": [], "content": "Hello", "embeds": [], "flags": 1 << 15}
+    assert payloads.message_hash == feeds.hash_webhook_payload(payloads.message)
+    assert feeds.get_webhook_request_payload(webhook) == payloads.request
+    assert feeds.get_webhook_message_payload(webhook) == payloads.message
+
+
+def _components(count: int) -> list[JsonValue]:
+    return [
+        {
+            "type": 17,
+            "components": [
+                {"type": 10, "content": f"Section {index} " + "text " * 40},
+                {"type": 12, "items": [{"media": {"url": f"https://example.com/{index}.png"}}]},
+                {"type": 1, "components": [{"type": 2, "style": 5, "label": "Open", "url": "https://example.com"}]},
+            ],
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.mark.slow
+def test_benchmark_single_pass_payload_normalization() -> None:
+    webhook = DiscordWebhook(url="https://discord.com/api/webhooks/1/a", flags=1 << 15, components=_components(40))
+    rounds = 500
+
+    def round_trips() -> str:
+        # What a send used to cost: a round trip for each payload, then another encode for the hash.
+        raw: JsonObject = {key: webhook.json[key] for key in feeds.MESSAGE_PAYLOAD_KEYS if key in webhook.json}
+        request: JsonObject = json.loads(json.dumps(raw, default=str))
+        message: JsonObject = json.loads(json.dumps(request, default=str))
+        message = {"content": "", "embeds": [], "attachments": [], **message}
+        message = json.loads(json.dumps(message, default=str))
+        return _legacy_hash(message)
+
+    def single_pass() -> str:
+        return feeds.get_webhook_payloads(webhook).message_hash
+
+    assert round_trips() == single_pass()
+
+    def measure(normalize: Callable[[], str]) -> float:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            normalize()
+        return time.perf_counter() - started
+
+    before = measure(round_trips)
+    after = measure(single_pass)
+    print(f"{rounds} payloads: round trips {before * 1000:.1f}ms, single pass {after * 1000:.1f}ms")  # ruff:ignore[print]
+    assert after < before
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import time
+from threading import Thread
+from unittest.mock import patch
+
+import httpx2
+import pytest
+
+from discord_rss_bot import feeds
+from discord_rss_bot.rate_limits import CircuitBreakerConfig
+from discord_rss_bot.rate_limits import CircuitOpenError
+from discord_rss_bot.rate_limits import GlobalCircuitBreaker
+from discord_rss_bot.rate_limits import RateLimitedError
+from discord_rss_bot.rate_limits import RateLimitManager
+from discord_rss_bot.rate_limits import get_rate_limit_route
+from discord_rss_bot.rate_limits import mask_webhook_url
+from tests.fake_discord import serve_fake_discord
+
+
+def _send(url: str, content: str) -> int:
+    response = feeds.request_discord_webhook(
+        "POST",
+        url,
+        payload={"content": content},
+        params={"wait": "true"},
+        files=None,
+        timeout=5.0,
+        rate_limit_retry=False,
+    )
+    return response.status_code
+
+
+def test_get_rate_limit_route_groups_message_edits() -> None:
+    first = get_rate_limit_route("patch", "https://discord.com/api/webhooks/1/token/messages/10?thread_id=5")
+    second = get_rate_limit_route("PATCH", "https://discord.com/api/webhooks/1/token/messages/11")
+
+    assert first == second == "PATCH https://discord.com/api/webhooks/1/token/messages/{message_id}"
+    assert get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/token?wait=true") == (
+        "POST https://discord.com/api/webhooks/1/token"
+    )
+
+
+def test_mask_webhook_url_hides_token() -> None:
+    assert (
+        mask_webhook_url("POST https://discord.com/api/webhooks/1/secret")
+        == "POST https://discord.com/api/webhooks/1/…"
+    )
+    assert mask_webhook_url("https://discord.com/api/webhooks/1/secret/messages/2") == (
+        "https://discord.com/api/webhooks/1/…/messages/2"
+    )
+
+
+def test_exhausted_bucket_only_delays_its_own_route() -> None:
+    manager = RateLimitManager()
+    exhausted_route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/a")
+    other_route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/2/b")
+
+    manager.update(
+        exhausted_route,
+        httpx2.Headers({"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "5"}),
+        status_code=200,
+    )
+
+    assert manager.get_delay(exhausted_route) > 4
+    assert manager.reserve(other_route) == 0
+    assert manager.get_delay(other_route) == 0
+
+
+def test_webhooks_reporting_the_same_bucket_hash_keep_separate_buckets() -> None:
+    manager = RateLimitManager()
+    exhausted_route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/a")
+    other_route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/2/b")
+    headers = {"X-RateLimit-Bucket": "h", "X-RateLimit-Limit": "5", "X-RateLimit-Reset-After": "2"}
+
+    manager.update(other_route, httpx2.Headers({**headers, "X-RateLimit-Remaining": "4"}), status_code=200)
+    manager.update(exhausted_route, httpx2.Headers({**headers, "X-RateLimit-Remaining": "0"}), status_code=200)
+
+    assert manager.get_delay(exhausted_route) > 1
+    assert manager.get_delay(other_route) == 0
+    assert manager.reserve(other_route) == 0
+    assert sorted(row["remaining"] for row in manager.snapshot()) == [0, 3]
+
+
+def test_routes_reporting_same_bucket_share_state() -> None:
+    manager = RateLimitManager()
+    send_route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/a")
+    edit_route = get_rate_limit_route("PATCH", "https://discord.com/api/webhooks/1/a/messages/9")
+    headers = httpx2.Headers({"X-RateLimit-Bucket": "shared", "X-RateLimit-Limit": "2", "X-RateLimit-Remaining": "1"})
+
+    manager.update(send_route, headers, status_code=200)
+    manager.update(edit_route, headers, status_code=200)
+
+    assert manager.reserve(send_route) == 0
+    assert manager.get_delay(edit_route) == 0  # Reset-After unknown, so there is nothing to wait for.
+    snapshot = manager.snapshot()
+    assert len(snapshot) == 1
+    assert snapshot[0]["bucket"] == "shared"
+    assert snapshot[0]["remaining"] == 0
+    assert snapshot[0]["routes"] == (
+        "PATCH https://discord.com/api/webhooks/1/…/messages/{message_id}, POST https://discord.com/api/webhooks/1/…"
+    )
+
+
+def test_rate_limited_response_blocks_bucket_for_retry_after() -> None:
+    manager = RateLimitManager()
+    route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/a")
+
+    manager.update(route, httpx2.Headers(), status_code=429, retry_after=2.0)
+
+    assert manager.get_delay(route) == pytest.approx(2.0, abs=0.1)
+    assert manager.snapshot()[0]["rate_limited_count"] == 1
+
+
+def test_request_discord_webhook_stays_under_fake_discord_limit() -> None:
+    manager = RateLimitManager()
+    with (
+        serve_fake_discord(limit=2, window=0.3) as fake,
+        patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=manager),
+    ):
+        url = fake.webhook_url(1)
+        started = time.monotonic()
+        statuses = [_send(url, f"message {index}") for index in range(5)]
+        elapsed = time.monotonic() - started
+
+    assert statuses == [200] * 5
+    assert fake.rate_limited == 0
+    assert elapsed >= 0.5  # Two full windows were waited out instead of hitting 429.
+
+
+def test_other_webhooks_keep_sending_while_one_bucket_waits() -> None:
+    manager = RateLimitManager()
+    with (
+        serve_fake_discord(limit=1, window=1.0) as fake,
+        patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=manager),
+    ):
+        slow_url = fake.webhook_url(1)
+        assert _send(slow_url, "fills the bucket") == 200
+
+        waiting_sender = Thread(target=_send, args=(slow_url, "waits for reset"))
+        waiting_sender.start()
+
+        started = time.monotonic()
+        assert _send(fake.webhook_url(2), "different webhook") == 200
+        other_webhook_elapsed = time.monotonic() - started
+
+        waiting_sender.join(timeout=5)
+
+    assert other_webhook_elapsed < 0.5
+    assert fake.rate_limited == 0
+    assert [request.webhook_id for request in fake.requests] == ["1", "2", "1"]
+
+
+def test_acquire_without_blocking_raises_and_counts_nothing() -> None:
+    manager = RateLimitManager()
+    route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/a")
+    manager.update(route, httpx2.Headers(), status_code=429, retry_after=3.0)
+
+    with pytest.raises(RateLimitedError) as exc_info:
+        manager.acquire(route, block=False)
+
+    assert exc_info.value.retry_after == pytest.approx(3.0, abs=0.1)
+    stats = manager.stats()
+    assert stats.rate_limited_responses == 1
+    assert stats.waits == 0
+
+
+def test_blocking_acquire_records_time_waited() -> None:
+    manager = RateLimitManager()
+    route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/a")
+    manager.update(route, httpx2.Headers(), status_code=429, retry_after=0.05)
+
+    waited = manager.acquire(route)
+
+    assert waited > 0
+    assert manager.stats().waits == 1
+    assert manager.stats().seconds_waited == pytest.approx(waited)
+
+    manager.record_deferral(2.5)
+    assert manager.stats().as_dict()["seconds_deferred"] == pytest.approx(2.5)
+
+
+def test_global_rate_limit_opens_breaker_for_every_route() -> None:
+    manager = RateLimitManager(GlobalCircuitBreaker(CircuitBreakerConfig()))
+    route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/a")
+    other_route = get_rate_limit_route("POST", "https://discord.com/api/webhooks/2/b")
+
+    manager.update(
+        route,
+        httpx2.Headers({"X-RateLimit-Global": "true", "X-RateLimit-Scope": "global"}),
+        status_code=429,
+        retry_after=4.0,
+    )
+
+    assert manager.breaker.remaining() == pytest.approx(4.0, abs=0.1)
+    with pytest.raises(CircuitOpenError) as exc_info:
+        manager.acquire(other_route, block=False)
+    assert exc_info.value.reason == "Discord global rate limit"
+    assert manager.breaker.snapshot()["state"] == "open"
+
+
+def test_retry_after_global_rate_limit_waits_for_breaker_and_records_global_again() -> None:
+    manager = RateLimitManager(GlobalCircuitBreaker(CircuitBreakerConfig()))
+    url = "https://discord.com/api/webhooks/1/a"
+    headers = {"X-RateLimit-Bucket": "abc"}
+    responses = [
+        httpx2.Response(429, headers=headers, json={"retry_after": 0.05, "global": True}),
+        httpx2.Response(429, headers=headers, json={"retry_after": 5.0, "global": True}),
+    ]
+
+    def request(*_args: object, **_kwargs: object) -> httpx2.Response:
+        response = responses.pop(0)
+        if responses:
+            # Another webhook hit a longer global rate limit while this request waited.
+            manager.breaker.trip(0.3, "Discord global rate limit")
+        return response
+
+    with (
+        patch("discord_rss_bot.feeds.get_rate_limit_manager", return_value=manager),
+        patch("discord_rss_bot.feeds.get_discord_http_client") as mock_client,
+    ):
+        mock_client.return_value.request.side_effect = request
+        started = time.monotonic()
+        response = feeds.request_discord_webhook(
+            "POST",
+            url,
+            payload={"content": "retry"},
+            params={},
+            files=None,
+            timeout=5.0,
+            rate_limit_retry=True,
+        )
+        elapsed = time.monotonic() - started
+
+    assert response.status_code == 429
+    assert elapsed >= 0.3  # The retry waited for the breaker, not only for the first retry_after.
+    assert manager.breaker.remaining() == pytest.approx(5.0, abs=0.1)
+    assert manager.stats().rate_limited_responses == 2
+
+
+def test_cloudflare_ban_without_rate_limit_headers_opens_breaker() -> None:
+    breaker = GlobalCircuitBreaker(CircuitBreakerConfig(cooldown=30.0))
+    manager = RateLimitManager(breaker)
+
+    manager.update(get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/a"), {}, status_code=429)
+
+    assert breaker.remaining() == pytest.approx(30.0, abs=0.1)
+
+
+def test_per_route_rate_limit_does_not_open_breaker() -> None:
+    manager = RateLimitManager(GlobalCircuitBreaker(CircuitBreakerConfig()))
+
+    manager.update(
+        get_rate_limit_route("POST", "https://discord.com/api/webhooks/1/a"),
+        httpx2.Headers({"X-RateLimit-Bucket": "abc", "X-RateLimit-Scope": "user", "X-RateLimit-Remaining": "0"}),
+        status_code=429,
+        retry_after=1.0,
+    )
+
+    assert manager.breaker.remaining() == 0
+    assert manager.breaker.snapshot()["state"] == "closed"
+
+
+def test_invalid_request_burst_opens_breaker_with_growing_cooldown() -> None:
+    breaker = GlobalCircuitBreaker(CircuitBreakerConfig(invalid_threshold=3, invalid_window=60.0, cooldown=10.0))
+
+    for status_code in (404, 401):
+        breaker.record(status_code)
+    assert breaker.remaining() == 0
+
+    breaker.record(403)
+    assert breaker.remaining() == pytest.approx(10.0, abs=0.1)
+    assert "3 invalid requests" in str(breaker.snapshot()["reason"])
+
+    breaker.reset()
+    for _ in range(3):
+        breaker.record(404)
+    assert breaker.remaining() == pytest.approx(10.0, abs=0.1)  # reset() also clears the repeat count.
+
+    with breaker._lock:  # ruff:ignore[private-member-access]
+        breaker._open_until = 0.0  # ruff:ignore[private-member-access]
+    for _ in range(3):
+        breaker.record(404)
+    assert breaker.remaining() == pytest.approx(20.0, abs=0.1)
+
+    breaker.record(200)
+    with breaker._lock:  # ruff:ignore[private-member-access]
+        breaker._open_until = 0.0  # ruff:ignore[private-member-access]
+    for _ in range(3):
+        breaker.record(404)
+    assert breaker.remaining() == pytest.approx(10.0, abs=0.1)  # A success resets the doubling.
+    assert breaker.trip_count == 4
+
+
+def test_circuit_breaker_config_reads_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DISCORD_BREAKER_INVALID_THRESHOLD", "5")
+    monkeypatch.setenv("DISCORD_BREAKER_INVALID_WINDOW", "30")
+    monkeypatch.setenv("DISCORD_BREAKER_COOLDOWN", "120")
+
+    assert CircuitBreakerConfig.from_env() == CircuitBreakerConfig(
+        invalid_threshold=5,
+        invalid_window=30.0,
+        cooldown=120.0,
+    )
+
+
+def test_circuit_breaker_config_defaults_without_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("DISCORD_BREAKER_INVALID_THRESHOLD", "DISCORD_BREAKER_INVALID_WINDOW", "DISCORD_BREAKER_COOLDOWN"):
+        monkeypatch.delenv(name, raising=False)
+
+    assert CircuitBreakerConfig.from_env() == CircuitBreakerConfig()
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from discord_rss_bot import feeds
+from discord_rss_bot.sent_webhooks import DEFAULT_MAX_AGE_DAYS
+from discord_rss_bot.sent_webhooks import DEFAULT_MAX_RECORDS_PER_FEED
+from discord_rss_bot.sent_webhooks import LOOKUP_CHUNK_SIZE
+from discord_rss_bot.sent_webhooks import EditLimits
+from discord_rss_bot.sent_webhooks import RetentionPolicy
+from discord_rss_bot.sent_webhooks import SentWebhookFilter
+from discord_rss_bot.sent_webhooks import SentWebhookStore
+from discord_rss_bot.sent_webhooks import get_edit_deferred_until
+from discord_rss_bot.state_db import StateDatabase
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from discord_rss_bot.webhook import JsonObject
+    from discord_rss_bot.webhook import JsonValue
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[SentWebhookStore]:
+    db = StateDatabase(tmp_path / "state.sqlite")
+    yield SentWebhookStore(db)
+    db.close()
+
+
+def _record(entry_id: str, webhook_url: str = "https://discord.com/api/webhooks/1/a", **extra: JsonValue) -> JsonObject:
+    return {
+        "feed_url": "https://example.com/feed.xml",
+        "entry_id": entry_id,
+        "webhook_url": webhook_url,
+        "message_id": f"message-{entry_id}",
+        **extra,
+    }
+
+
+def test_upsert_replaces_record_but_keeps_its_history(store: SentWebhookStore) -> None:
+    store.upsert(_record("entry-1", first_sent_at="2026-01-01T00:00:00+00:00", update_count=0))
+    store.save([_record("entry-1", first_sent_at="2026-01-01T00:00:00+00:00", update_count=3)])
+    store.upsert(_record("entry-1", first_sent_at="2026-02-01T00:00:00+00:00", update_count=0))
+    store.upsert(_record("entry-1", webhook_url="https://discord.com/api/webhooks/2/b"))
+
+    assert store.count() == 2
+    record = store.get("https://example.com/feed.xml", "entry-1", "https://discord.com/api/webhooks/1/a")
+    assert record is not None
+    assert record["first_sent_at"] == "2026-01-01T00:00:00+00:00"
+    assert record["update_count"] == 3
+
+
+def test_upsert_skips_records_without_a_key(store: SentWebhookStore) -> None:
+    store.upsert({"feed_url": "https://example.com/feed.xml", "message_id": "message-1"})
+    assert store.count() == 0
+
+
+def test_migrate_sent_webhooks_tag_moves_records_once(store: SentWebhookStore) -> None:
+    store.save([_record("entry-1", message_id="already-stored")])
+    tags: dict[str, object] = {"sent_webhooks": [_record("entry-1"), _record("entry-2"), "not a record"]}
+    reader = MagicMock()
+    reader.get_tag.side_effect = lambda _resource, key, default: tags.get(key, default)
+    reader.delete_tag.side_effect = lambda _resource, key, **_kwargs: tags.pop(key)
+
+    assert feeds.migrate_sent_webhooks_tag(reader, store) == 1
+    assert "sent_webhooks" not in tags
+    assert [record["message_id"] for record in store.get_all()] == ["already-stored", "message-entry-2"]
+
+    assert feeds.migrate_sent_webhooks_tag(reader, store) == 0
+
+
+def test_get_for_entries_returns_only_requested_entries(store: SentWebhookStore) -> None:
+    store.save(_record(f"entry-{index}") for index in range(LOOKUP_CHUNK_SIZE + 10))
+    store.save([_record("entry-1", webhook_url="https://discord.com/api/webhooks/2/b")])
+
+    feed_url = "https://example.com/feed.xml"
+    wanted = [(feed_url, "entry-1"), (feed_url, f"entry-{LOOKUP_CHUNK_SIZE + 5}"), (feed_url, "missing")]
+    records = store.get_for_entries([*wanted, *((feed_url, str(index)) for index in range(LOOKUP_CHUNK_SIZE))])
+
+    assert set(records) == set(wanted[:2])
+    assert [record["webhook_url"] for record in records[feed_url, "entry-1"]] == [
+        "https://discord.com/api/webhooks/1/a",
+        "https://discord.com/api/webhooks/2/b",
+    ]
+
+
+def test_retention_policy_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert RetentionPolicy.from_env() == RetentionPolicy(DEFAULT_MAX_AGE_DAYS, DEFAULT_MAX_RECORDS_PER_FEED, False)
+
+    monkeypatch.setenv("SENT_WEBHOOKS_MAX_AGE_DAYS", "7")
+    monkeypatch.setenv("SENT_WEBHOOKS_MAX_PER_FEED", "50")
+    monkeypatch.setenv("SENT_WEBHOOKS_KEEP_RESPONSES", "true")
+    assert RetentionPolicy.from_env() == RetentionPolicy(max_age_days=7, max_records_per_feed=50, keep_responses=True)
+
+
+def test_compact_expires_trims_and_strips_records(store: SentWebhookStore) -> None:
+    response: JsonObject = {"discord_response": {"id": "1", "channel_id": "2"}, "response_text": "{}"}
+    store.save([
+        _record("old", last_sent_at="2026-01-01T00:00:00+00:00"),
+        *(_record(f"entry-{day}", last_sent_at=f"2026-03-{day:02d}T00:00:00+00:00") for day in range(1, 5)),
+        _record("sent", last_sent_at="2026-03-10T00:00:00+00:00", last_status_code=200, last_error="", **response),
+        _record("failed", last_sent_at="2026-03-11T00:00:00+00:00", last_status_code=200, last_error="x", **response),
+    ])
+
+    stats = store.compact(
+        RetentionPolicy(max_age_days=30, max_records_per_feed=4),
+        now=datetime(2026, 3, 15, tzinfo=UTC),
+    )
+
+    assert (stats.expired, stats.trimmed, stats.stripped) == (1, 2, 1)
+    records = {record["entry_id"]: record for record in store.get_all()}
+    assert list(records) == ["entry-3", "entry-4", "sent", "failed"]
+    assert "discord_response" not in records["sent"]
+    assert "response_text" not in records["sent"]
+    assert records["sent"]["message_id"] == "message-sent"
+    assert records["failed"]["discord_response"] == response["discord_response"]
+
+    stats = store.compact(RetentionPolicy(max_age_days=30, max_records_per_feed=4, keep_responses=True))
+    assert (stats.expired, stats.trimmed, stats.stripped) == (4, 0, 0)
+
+
+def test_compact_shrinks_the_database_file(store: SentWebhookStore) -> None:
+    store.save(
+        _record(f"entry-{index}", last_sent_at="2026-01-01T00:00:00+00:00", payload={"content": os.urandom(2000).hex()})
+        for index in range(500)
+    )
+    size_before = store.get_storage_stats()["database_bytes"]
+
+    stats = store.compact(RetentionPolicy(max_age_days=1), now=datetime(2026, 3, 1, tzinfo=UTC))
+
+    assert (stats.expired, stats.unreferenced_payloads) == (500, 500)
+    assert stats.vacuumed
+    assert store.get_storage_stats() == {
+        "records": 0,
+        "record_bytes": 0,
+        "payloads": 0,
+        "payload_bytes": 0,
+        "database_bytes": store.db.size_bytes,
+    }
+    assert store.db.size_bytes < size_before / 10
+
+
+def test_payloads_are_stored_once_compressed_and_loaded_with_their_records(store: SentWebhookStore) -> None:
+    payload: JsonObject = {"content": "Hello " * 200, "embeds": [{"title": "Entry", "color": 1}], "attachments": []}
+    store.save([
+        _record("entry-1", payload=payload),
+        _record("entry-1", webhook_url="https://discord.com/api/webhooks/2/b", payload=payload),
+        _record("entry-2", payload={**payload, "content": "Other"}),
+    ])
+
+    stats = store.get_storage_stats()
+    assert (stats["records"], stats["payloads"]) == (3, 2)
+    assert stats["payload_bytes"] < len(json.dumps(payload)) / 5
+    assert "payload" not in json.loads(store.db.query("SELECT record FROM sent_webhooks")[0]["record"])
+
+    record = store.get("https://example.com/feed.xml", "entry-1", "https://discord.com/api/webhooks/2/b")
+    assert record is not None
+    assert record["payload"] == payload
+    assert record["payload_hash"] == feeds.hash_webhook_payload(payload)
+    assert [record["payload"] for record in store.get_all()] == [payload, payload, {**payload, "content": "Other"}]
+    # Listing messages reads the preview columns; payloads are only decompressed when a row is expanded.
+    with patch("discord_rss_bot.sent_webhooks.zlib.decompress") as mock_decompress:
+        summary = store.get_page().records[0]
+    mock_decompress.assert_not_called()
+    assert (summary["content_preview"], summary["embed_count"]) == ("Other", 1)
+
+    # Editing one message leaves the payload it shared with the other in place; the old one of entry-2 goes.
+    store.save([_record("entry-1", payload={**payload, "content": "Edited"})])
+    store.save([_record("entry-2", payload={**payload, "content": "Edited"})])
+    assert store.compact(RetentionPolicy()).unreferenced_payloads == 1
+    assert store.get_storage_stats()["payloads"] == 2
+    assert [record["payload"]["content"] for record in store.get_all()] == ["Edited", "Hello " * 200, "Edited"]
+
+
+def test_compact_moves_payloads_out_of_older_records(store: SentWebhookStore) -> None:
+    payload: JsonObject = {"content": "Hello", "embeds": []}
+    record = _record("entry-1", last_sent_at="2026-03-01T00:00:00+00:00", payload=payload, payload_hash="old")
+    with store.db.transaction() as connection:
+        connection.execute(
+            "INSERT INTO sent_webhooks (feed_url, entry_id, webhook_url, last_activity_at, record)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (record["feed_url"], record["entry_id"], record["webhook_url"], record["last_sent_at"], json.dumps(record)),
+        )
+
+    stats = store.compact(RetentionPolicy(), now=datetime(2026, 3, 2, tzinfo=UTC))
+
+    assert stats.moved_payloads == 1
+    assert store.get_page().records[0]["content_preview"] == "Hello"
+    assert store.get_storage_stats()["payloads"] == 1
+    assert store.get_all() == [{**record, "payload_hash": feeds.hash_webhook_payload(payload)}]
+    assert store.compact(RetentionPolicy(), now=datetime(2026, 3, 2, tzinfo=UTC)).moved_payloads == 0
+
+
+def test_migration_fills_the_preview_of_stored_and_inline_payloads(tmp_path: Path) -> None:
+    db = StateDatabase(tmp_path / "state.sqlite")
+    store = SentWebhookStore(db)
+    store.save([_record("stored", payload={"content": "Stored", "embeds": [{}, {}]})])
+    inline = _record("inline", payload={"content": "Inline", "embeds": []})
+    with db.transaction() as connection:
+        connection.execute(
+            "INSERT INTO sent_webhooks (feed_url, entry_id, webhook_url, record) VALUES (?, ?, ?, ?)",
+            (inline["feed_url"], inline["entry_id"], inline["webhook_url"], json.dumps(inline)),
+        )
+        # Roll the database back to before the preview columns existed.
+        connection.execute("ALTER TABLE sent_webhooks DROP COLUMN content_preview")
+        connection.execute("ALTER TABLE sent_webhooks DROP COLUMN embed_count")
+        connection.execute("PRAGMA user_version = 9")
+    db.close()
+
+    reopened = StateDatabase(tmp_path / "state.sqlite")
+    summaries = {record["entry_id"]: record for record in SentWebhookStore(reopened).get_page().records}
+    reopened.close()
+
+    assert (summaries["stored"]["content_preview"], summaries["stored"]["embed_count"]) == ("Stored", 2)
+    assert (summaries["inline"]["content_preview"], summaries["inline"]["embed_count"]) == ("Inline", 0)
+
+
+def test_get_edit_deferred_until_applies_debounce_and_hourly_budget() -> None:
+    now = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+    limits = EditLimits(debounce_minutes=10, max_edits_per_hour=3)
+
+    def minutes_ago(minutes: int) -> str:
+        return (now - timedelta(minutes=minutes)).isoformat()
+
+    assert get_edit_deferred_until(_record("new"), limits, now=now) is None
+    assert get_edit_deferred_until(_record("quiet", last_updated_at=minutes_ago(11)), limits, now=now) is None
+    assert get_edit_deferred_until(
+        _record("recent", last_updated_at=minutes_ago(4)), limits, now=now
+    ) == now + timedelta(minutes=6)
+
+    # The fourth edit within an hour waits until the oldest of the last three edits is an hour old.
+    recent_edit_times = [minutes_ago(70), minutes_ago(50), minutes_ago(35), minutes_ago(20)]
+    busy = _record("busy", last_updated_at=minutes_ago(20), recent_edit_times=recent_edit_times)
+    assert get_edit_deferred_until(busy, limits, now=now) == now + timedelta(minutes=10)
+
+
+def test_due_edits_are_listed_by_entry_and_cleared(store: SentWebhookStore) -> None:
+    now = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+    store.save([
+        _record("due", edit_deferred_until=(now - timedelta(minutes=1)).isoformat()),
+        _record("due", webhook_url="https://discord.com/api/webhooks/2/b", edit_deferred_until=now.isoformat()),
+        _record("later", edit_deferred_until=(now + timedelta(minutes=1)).isoformat()),
+        _record("none", edit_deferred_until=""),
+    ])
+
+    assert store.get_due_edits(now=now) == [("https://example.com/feed.xml", "due")]
+    assert store.clear_due_edits(now=now) == 2
+    assert store.get_due_edits(now=now + timedelta(minutes=5)) == [("https://example.com/feed.xml", "later")]
+    assert not store.get("https://example.com/feed.xml", "due", "https://discord.com/api/webhooks/1/a")[
+        "edit_deferred_until"
+    ]
+
+
+def test_get_page_is_keyset_paginated_newest_first(store: SentWebhookStore) -> None:
+    store.save(_record(f"entry-{index}", last_sent_at="2026-03-01T00:00:00+00:00") for index in range(5))
+    store.save([_record("edited", last_updated_at="2026-03-02T00:00:00+00:00", payload={"content": "x" * 600})])
+
+    first = store.get_page(limit=4)
+    assert [record["entry_id"] for record in first.records] == ["edited", "entry-4", "entry-3", "entry-2"]
+    assert first.records[0]["content_preview"] == "x" * 500
+    assert "payload" not in first.records[0]
+
+    # A message sent after the first page was loaded does not shift the next page.
+    store.save([_record("newest", last_sent_at="2026-03-03T00:00:00+00:00")])
+    second = store.get_page(starting_after=first.next_cursor, limit=4)
+    assert [record["entry_id"] for record in second.records] == ["entry-1", "entry-0"]
+    assert not second.next_cursor
+
+
+def test_get_page_filters_by_feed_webhook_status_and_date(store: SentWebhookStore) -> None:
+    other_webhook = "https://discord.com/api/webhooks/2/b"
+    store.save([
+        _record("sent", last_sent_at="2026-03-01T10:00:00+00:00", last_status_code=200, last_error=""),
+        _record("failed", last_sent_at="2026-03-02T10:00:00+00:00", last_status_code=200, last_error="x"),
+        _record("other", webhook_url=other_webhook, last_sent_at="2026-03-02T11:00:00+00:00", last_status_code=404),
+        _record("deferred", last_sent_at="2026-03-03T10:00:00+00:00", edit_deferred_until="2026-03-03T10:10:00+00:00"),
+        {**_record("elsewhere"), "feed_url": "https://example.com/other.xml", "feed_title": "Other"},
+    ])
+
+    def entry_ids(**filters: str) -> list[JsonValue]:
+        page = store.get_page(SentWebhookFilter(**filters))
+        assert store.count(SentWebhookFilter(**filters)) == len(page.records)
+        return [record["entry_id"] for record in page.records]
+
+    assert entry_ids(status="sent") == ["sent"]
+    assert entry_ids(status="failed", feed_url="https://example.com/feed.xml") == ["deferred", "other", "failed"]
+    assert entry_ids(status="deferred") == ["deferred"]
+    assert entry_ids(webhook_url=other_webhook) == ["other"]
+    assert entry_ids(since="2026-03-02", until="2026-03-03") == ["other", "failed"]
+    assert store.get_feed_titles() == {
+        "https://example.com/feed.xml": "https://example.com/feed.xml",
+        "https://example.com/other.xml": "Other",
+    }
+
+
+@pytest.mark.slow
+def test_benchmark_modified_entry_lookup_does_not_scan_history(tmp_path: Path) -> None:
+    modified_count = 1_000
+    feed_url = "https://example.com/feed.xml"
+    reader = MagicMock()
+    # Every record is looked up and its entry fetched; stop there so only the lookup is measured.
+    reader.get_tag.return_value = False
+
+    def run(history_size: int) -> float:
+        db = StateDatabase(tmp_path / f"state-{history_size}.sqlite")
+        store = SentWebhookStore(db)
+        store.save(_record(f"entry-{index}", payload={"content": "x" * 200}) for index in range(history_size))
+        modified = [(feed_url, f"entry-{index}") for index in range(0, history_size, history_size // modified_count)]
+
+        with patch("discord_rss_bot.feeds.get_sent_webhook_store", return_value=store):
+            started = time.perf_counter()
+            feeds.update_sent_webhooks_for_modified_entries(reader, modified)
+            elapsed = time.perf_counter() - started
+        db.close()
+
+        assert reader.get_entry.call_count == modified_count
+        reader.get_entry.reset_mock()
+        print(f"{modified_count} modified of {history_size} records: {elapsed * 1000:.1f}ms")  # ruff:ignore[print]
+        return elapsed
+
+    small = run(modified_count)
+    large = run(100_000)
+
+    # A scan of every record per modified entry would be ~100x slower; an indexed lookup barely changes.
+    assert large < small * 10